@@ -0,0 +1,42 @@
+"""add breakfast mail sync state
+
+Revision ID: 0026_add_breakfast_mail_sync_state
+Revises: 0025_add_smtp_from_email
+Create Date: 2026-04-02 00:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0026_add_breakfast_mail_sync_state"
+down_revision: str | Sequence[str] | None = "0025_add_smtp_from_email"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "breakfast_mail_sync_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("mailbox", sa.String(length=255), nullable=False),
+        sa.Column("uid_validity", sa.BigInteger(), nullable=True),
+        sa.Column("last_seen_uid", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_breakfast_mail_sync_state_id"), "breakfast_mail_sync_state", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_breakfast_mail_sync_state_mailbox"),
+        "breakfast_mail_sync_state",
+        ["mailbox"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_breakfast_mail_sync_state_mailbox"), table_name="breakfast_mail_sync_state")
+    op.drop_index(op.f("ix_breakfast_mail_sync_state_id"), table_name="breakfast_mail_sync_state")
+    op.drop_table("breakfast_mail_sync_state")
@@ -0,0 +1,64 @@
+"""add inventory document sequences
+
+Revision ID: 0027_add_inventory_document_sequences
+Revises: 0026_add_breakfast_mail_sync_state
+Create Date: 2026-04-06 00:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0027_add_inventory_document_sequences"
+down_revision: str | Sequence[str] | None = "0026_add_breakfast_mail_sync_state"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _split_document_number(value: str | None) -> tuple[str, int, int] | None:
+    parts = (value or "").split("-")
+    if len(parts) != 3 or not parts[1].isdigit() or not parts[2].isdigit():
+        return None
+    return parts[0], int(parts[1]), int(parts[2])
+
+
+def upgrade() -> None:
+    sequences = op.create_table(
+        "inventory_document_sequences",
+        sa.Column("prefix", sa.String(length=8), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("last_value", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("prefix", "year"),
+    )
+
+    bind = op.get_bind()
+    numbers = bind.execute(
+        sa.text(
+            """
+            SELECT document_number FROM inventory_movements WHERE document_number IS NOT NULL
+            UNION
+            SELECT number FROM inventory_cards
+            """
+        )
+    ).scalars()
+    last_values: dict[tuple[str, int], int] = {}
+    for number in numbers:
+        parsed = _split_document_number(number)
+        if parsed is None:
+            continue
+        prefix, year, value = parsed
+        last_values[(prefix, year)] = max(value, last_values.get((prefix, year), 0))
+    if last_values:
+        op.bulk_insert(
+            sequences,
+            [
+                {"prefix": prefix, "year": year, "last_value": value}
+                for (prefix, year), value in sorted(last_values.items())
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("inventory_document_sequences")
@@ -0,0 +1,40 @@
+"""add inventory stock snapshots
+
+Revision ID: 0028_add_inventory_stock_snapshots
+Revises: 0027_add_inventory_document_sequences
+Create Date: 2026-04-09 00:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0028_add_inventory_stock_snapshots"
+down_revision: str | Sequence[str] | None = "0027_add_inventory_document_sequences"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_stock_snapshots",
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("snapshot_date", sa.Date(), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["item_id"], ["inventory_items.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("item_id", "snapshot_date"),
+    )
+    op.create_index(
+        op.f("ix_inventory_stock_snapshots_snapshot_date"),
+        "inventory_stock_snapshots",
+        ["snapshot_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_inventory_stock_snapshots_snapshot_date"), table_name="inventory_stock_snapshots")
+    op.drop_table("inventory_stock_snapshots")
@@ -0,0 +1,37 @@
+"""add media blobs
+
+Revision ID: 0029_add_media_blobs
+Revises: 0028_add_inventory_stock_snapshots
+Create Date: 2026-04-16 00:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0029_add_media_blobs"
+down_revision: str | Sequence[str] | None = "0028_add_inventory_stock_snapshots"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("file_path", sa.String(length=512), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("released_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("sha256"),
+        sa.UniqueConstraint("file_path"),
+    )
+    op.create_index(op.f("ix_media_blobs_released_at"), "media_blobs", ["released_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_media_blobs_released_at"), table_name="media_blobs")
+    op.drop_table("media_blobs")
@@ -0,0 +1,24 @@
+"""index auth unlock tokens used_at
+
+Revision ID: 0030_index_auth_unlock_tokens_used_at
+Revises: 0029_add_media_blobs
+Create Date: 2026-04-17 00:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+
+revision: str = "0030_index_auth_unlock_tokens_used_at"
+down_revision: str | Sequence[str] | None = "0029_add_media_blobs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_auth_unlock_tokens_used_at"), "auth_unlock_tokens", ["used_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_auth_unlock_tokens_used_at"), table_name="auth_unlock_tokens")
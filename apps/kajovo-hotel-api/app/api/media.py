@@ -0,0 +1,180 @@
+"""File responses for stored photos and pictograms.
+
+Every media endpoint accepts ``thumb`` (the list rendition), ``detail``, ``full`` and
+``original``. Renditions are rendered in the background after upload, so until one
+exists (or when the upload could not be decoded) the original file is served instead.
+
+Responses carry a strong ETag (the content hash for content-addressed originals),
+answer conditional requests with 304 and support byte ranges. With
+``KAJOVO_API_MEDIA_ACCEL_REDIRECT_PREFIX`` set, the API only authorizes and looks up
+the file and hands the transfer to nginx through ``X-Accel-Redirect``.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+from collections.abc import Sequence
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import PurePosixPath
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response, UploadFile, status
+from fastapi.responses import FileResponse
+
+from app.config import get_settings
+from app.media.storage import (
+    BLOB_DIR,
+    MediaStorage,
+    MediaStorageError,
+    MediaTooLargeError,
+    StoredMedia,
+    media_storage,
+)
+from app.media.thumbnails import sibling_rendition
+
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+MEDIA_KINDS = {"thumb", "detail", "full", "original"}
+IMMUTABLE_CACHE = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE = "private, no-cache"
+
+
+def _rendition_relpath(thumb_relpath: str | None, kind: str) -> str | None:
+    if not thumb_relpath:
+        return None
+    if kind == "thumb":
+        return thumb_relpath
+    return sibling_rendition(thumb_relpath, kind)
+
+
+def get_media_storage() -> MediaStorage:
+    return media_storage(get_settings().media_root)
+
+
+def store_uploads(uploads: Sequence[UploadFile]) -> list[StoredMedia]:
+    """Stage every uploaded image, enforcing the per-file size limit while copying.
+
+    Each staged file is published by ``retain_blob``. Files staged before a later one is
+    rejected are never published and are removed by the media garbage collector.
+    """
+    storage = get_media_storage()
+    max_bytes = get_settings().media_upload_max_file_bytes
+    stored: list[StoredMedia] = []
+    for upload in uploads:
+        try:
+            stored.append(storage.store_image(src_file=upload.file, max_bytes=max_bytes))
+        except MediaTooLargeError as exc:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large") from exc
+        except MediaStorageError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return stored
+
+
+def _etag(relpath: str, stat_result: os.stat_result, *, accel: bool = False) -> str:
+    if accel:
+        # nginx validates conditional requests for the files it sends with its own ETag.
+        return f'"{int(stat_result.st_mtime):x}-{stat_result.st_size:x}"'
+    name = PurePosixPath(relpath).name
+    if relpath.startswith(f"{BLOB_DIR}/") and "_" not in name:
+        # Content-addressed original: the name is the SHA-256 of the bytes.
+        return f'"{name.split(".", 1)[0]}"'
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(request: Request, etag: str, stat_result: os.stat_result) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(stat_result.st_mtime) <= since.timestamp()
+    return False
+
+
+def _file_response(
+    request: Request,
+    storage: MediaStorage,
+    relpath: str,
+    *,
+    media_type: str,
+    cache_control: str,
+) -> Response | None:
+    path = storage.resolve(relpath)
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
+        return None
+    accel_prefix = get_settings().media_accel_redirect_prefix
+    etag = _etag(relpath, stat_result, accel=bool(accel_prefix))
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _not_modified(request, etag, stat_result):
+        headers["Last-Modified"] = formatdate(stat_result.st_mtime, usegmt=True)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if accel_prefix:
+        # nginx sends the file (sendfile, ranges, validators); it keeps Content-Type and
+        # Cache-Control from this response and drops the rest.
+        return Response(
+            media_type=media_type,
+            headers={
+                "X-Accel-Redirect": accel_prefix.rstrip("/") + "/" + quote(relpath),
+                "Cache-Control": cache_control,
+            },
+        )
+    # FileResponse answers Range / If-Range requests itself, using the ETag set here.
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
+
+
+def media_file_response(
+    request: Request,
+    *,
+    original_relpath: str | None,
+    thumb_relpath: str | None,
+    kind: str,
+    media_type: str | None = None,
+    immutable: bool = False,
+) -> Response:
+    """Serve one kind of a stored image with validators and cache headers.
+
+    ``immutable`` is for URLs whose file never changes (photos); those are cached for a
+    year. Pictogram URLs keep their address when the pictogram is replaced, so clients
+    revalidate them with the ETag instead. The original served in place of a missing
+    rendition is never cached for long, since the rendition will replace it.
+    """
+    if kind not in MEDIA_KINDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported kind")
+    storage = get_media_storage()
+    if kind != "original":
+        rel = _rendition_relpath(thumb_relpath, kind)
+        if rel:
+            response = _file_response(
+                request,
+                storage,
+                rel,
+                media_type=mimetypes.guess_type(rel)[0] or "image/jpeg",
+                cache_control=IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE,
+            )
+            if response is not None:
+                return response
+    if not original_relpath:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
+    response = _file_response(
+        request,
+        storage,
+        original_relpath,
+        media_type=media_type or mimetypes.guess_type(original_relpath)[0] or "image/jpeg",
+        cache_control=IMMUTABLE_CACHE if immutable and kind == "original" else REVALIDATE_CACHE,
+    )
+    if response is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
+    return response
@@ -0,0 +1,162 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+List endpoints keep returning plain JSON arrays so existing clients are unaffected.
+Passing ``limit`` (and then ``cursor``) switches an endpoint to keyset paging over its
+ORDER BY columns; when more rows exist the opaque cursor for the next page is returned
+in the ``X-Next-Cursor`` response header.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select, String, and_, case, func, literal, or_, type_coerce
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 500
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    limit: int | None = None
+    cursor: str | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+
+def page_request(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: str | None = Query(default=None, max_length=512),
+) -> PageRequest:
+    return PageRequest(limit=limit, cursor=cursor)
+
+
+@dataclass(frozen=True)
+class SortKey:
+    column: InstrumentedAttribute[Any]
+    descending: bool = False
+    nullable: bool = False
+
+    def order_clause(self) -> ColumnElement[Any]:
+        clause = self.column.desc() if self.descending else self.column.asc()
+        # Pin NULL placement so SQLite and Postgres page the same way.
+        return clause.nulls_last() if self.nullable else clause
+
+    def comparable(self, dialect_name: str) -> ColumnElement[Any]:
+        column: ColumnElement[Any] = self.column
+        if dialect_name == "sqlite" and _python_type(self) is datetime:
+            # SQLite keeps timestamps as text; rows from CURRENT_TIMESTAMP lack the
+            # fractional part that bound datetimes always carry. Pad them so a cursor
+            # value compares equal to the row it was taken from.
+            text_value = type_coerce(column, String)
+            padded = case((func.length(text_value) == 19, text_value + ".000000"), else_=text_value)
+            column = type_coerce(padded, self.column.type)
+        return column
+
+    def after(self, column: ColumnElement[Any], anchor: ColumnElement[Any]) -> ColumnElement[bool]:
+        beyond = column < anchor if self.descending else column > anchor
+        if not self.nullable:
+            return beyond
+        # NULLs sort last, so nothing but the tie-breakers can follow a NULL anchor.
+        return and_(anchor.is_not(None), or_(beyond, column.is_(None)))
+
+    def equals(self, column: ColumnElement[Any], anchor: ColumnElement[Any]) -> ColumnElement[bool]:
+        if not self.nullable:
+            return column == anchor
+        return or_(column == anchor, and_(column.is_(None), anchor.is_(None)))
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _python_type(key: SortKey) -> type | None:
+    try:
+        return key.column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _anchor_value(key: SortKey, value: Any) -> Any:
+    if value is None:
+        if not key.nullable:
+            raise ValueError("unexpected null")
+        return None
+    python_type = _python_type(key)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is int and type(value) is not int:
+        raise ValueError("expected an integer")
+    if python_type is str and not isinstance(value, str):
+        raise ValueError("expected a string")
+    return value
+
+
+def encode_cursor(keys: Sequence[SortKey], row: Any) -> str:
+    values = [_cursor_value(getattr(row, key.column.key)) for key in keys]
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(keys: Sequence[SortKey], cursor: str) -> list[Any]:
+    """Return the sort values of the last row of the previous page."""
+    try:
+        raw = base64.urlsafe_b64decode((cursor + "=" * (-len(cursor) % 4)).encode("ascii"))
+        values = json.loads(raw.decode("utf-8"))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("wrong number of values")
+        return [_anchor_value(key, value) for key, value in zip(keys, values, strict=True)]
+    except (TypeError, ValueError, UnicodeError, binascii.Error) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _after_cursor(keys: Sequence[SortKey], values: Sequence[Any], dialect_name: str) -> ColumnElement[bool]:
+    # The cursor carries the anchor row's own sort values, so paging continues from the
+    # same position even if that row is edited or deleted in the meantime.
+    columns = [key.comparable(dialect_name) for key in keys]
+    anchors = [literal(value, type_=key.column.type) for key, value in zip(keys, values, strict=True)]
+    # (k1 after a1) OR (k1 = a1 AND k2 after a2) OR ... -- works for mixed directions.
+    clauses = []
+    for index, key in enumerate(keys):
+        prefix = [keys[i].equals(columns[i], anchors[i]) for i in range(index)]
+        clauses.append(and_(*prefix, key.after(columns[index], anchors[index])))
+    return or_(*clauses)
+
+
+def paginate(
+    db: Session,
+    query: Select[Any],
+    keys: Sequence[SortKey],
+    page: PageRequest,
+    response: Response,
+) -> list[Any]:
+    """Run ``query`` ordered by ``keys``; the last key must be the unique row id."""
+    query = query.order_by(*(key.order_clause() for key in keys))
+    if not page.enabled:
+        return list(db.scalars(query))
+
+    limit = page.limit or DEFAULT_PAGE_LIMIT
+    if page.cursor:
+        values = decode_cursor(keys, page.cursor)
+        query = query.where(_after_cursor(keys, values, db.get_bind().dialect.name))
+    rows = list(db.scalars(query.limit(limit + 1)))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(keys, rows[-1])
+    return rows
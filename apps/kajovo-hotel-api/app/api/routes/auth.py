@@ -1,12 +1,13 @@
 import hashlib
 import json
+import logging
 import secrets
 from datetime import datetime, timedelta, timezone
 from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
-from sqlalchemy import inspect, select, text
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.schemas import (
@@ -42,20 +43,21 @@ from app.security.auth import (
     revoke_sessions_for_portal_user,
     set_active_role,
 )
-from app.security.passwords import hash_password, verify_password
+from app.security.passwords import hash_password, needs_rehash, verify_password
 from app.security.rbac import normalize_role
 from app.services.admin_credentials import ensure_admin_profile
 from app.services.mail import (
     SmtpDeliveryError,
     SmtpNotConfiguredError,
-    StoredSmtpConfig,
     build_email_service,
     send_admin_password_hint,
     send_admin_unlock_link,
     send_user_unlock_link,
 )
+from app.services.smtp_config import load_stored_smtp_config
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
+logger = logging.getLogger("kajovo.api.auth")
 LOCKOUT_THRESHOLD = 3
 LOCKOUT_WINDOW = timedelta(hours=1)
 PORTAL_LOCKOUT_DURATION = timedelta(hours=1)
@@ -157,40 +159,6 @@ def _record_failed_login(
     return (not was_locked) and _is_locked(state, now)
 
 
-def _stored_smtp_config(db: Session) -> StoredSmtpConfig | None:
-    bind = db.get_bind()
-    inspector = inspect(bind)
-    try:
-        columns = {str(column["name"]) for column in inspector.get_columns("portal_smtp_settings")}
-    except Exception:
-        db.rollback()
-        return None
-    if not columns:
-        return None
-    selected_columns = [
-        column
-        for column in ["from_email", "host", "port", "username", "password_encrypted", "use_tls", "use_ssl"]
-        if column in columns
-    ]
-    if not selected_columns:
-        return None
-    row = db.execute(
-        text(f"SELECT {', '.join(selected_columns)} FROM portal_smtp_settings WHERE id = :id"),
-        {"id": 1},
-    ).mappings().first()
-    if row is None:
-        return None
-    return StoredSmtpConfig(
-        from_email=str(row.get("from_email") or "").strip().lower(),
-        host=str(row.get("host") or ""),
-        port=int(row.get("port") or 587),
-        username=str(row.get("username") or ""),
-        use_tls=bool(True if row.get("use_tls") is None else row.get("use_tls")),
-        use_ssl=bool(False if row.get("use_ssl") is None else row.get("use_ssl")),
-        password_encrypted=str(row.get("password_encrypted") or ""),
-    )
-
-
 def _issue_unlock_token(
     db: Session,
     *,
@@ -237,7 +205,7 @@ def _send_unlock_email(
     )
     unlock_link = _build_unlock_link(request=request, token=token, actor_type=actor_type)
     try:
-        service = build_email_service(settings, _stored_smtp_config(db))
+        service = build_email_service(settings, load_stored_smtp_config(db))
         if actor_type == "admin":
             send_admin_unlock_link(service=service, recipient=principal, unlock_link=unlock_link)
         else:
@@ -255,6 +223,26 @@ def _portal_roles_for_user(user: PortalUser) -> list[str]:
     return [normalize_role(role.role) for role in user.roles if normalize_role(role.role) != "admin"]
 
 
+def _release_connection(db: Session) -> None:
+    # Password checks can queue behind the hashing pool; end the transaction first so the
+    # pooled DB connection is not held while this request waits.
+    db.commit()
+
+
+def _rehash_on_login(stored_hash: str | None, password: str, *, principal: str) -> str | None:
+    """Hash a verified password at the current cost when ``stored_hash`` uses another one.
+
+    Best effort: a saturated hashing pool skips the upgrade instead of failing the login.
+    """
+    if stored_hash is None or not needs_rehash(stored_hash):
+        return None
+    try:
+        return hash_password(password)
+    except HTTPException:
+        logger.warning("auth.password_rehash_skipped", extra={"context": {"principal": principal}})
+        return None
+
+
 def _find_admin_user(db: Session, email: str) -> PortalUser | None:
     user = db.execute(select(PortalUser).where(PortalUser.email == email)).scalar_one_or_none()
     if user is None or not user.is_active or not _is_admin_user(user):
@@ -299,15 +287,20 @@ def admin_login(
     principal = provided_email or admin_profile.email.strip().lower()
     state = _get_lockout_state(db, actor_type="admin", principal=principal)
     admin_user = _find_admin_user(db, provided_email)
+    admin_user_hash = admin_user.password_hash if admin_user is not None else None
+    admin_profile_email = admin_profile.email.strip().lower()
+    admin_profile_hash = admin_profile.password_hash
+    _release_connection(db)
+    # Check the portal admin first: the env profile is only hashed when that fails.
+    valid_portal_admin_login = admin_user_hash is not None and verify_password(payload.password, admin_user_hash)
     valid_env_login = (
-        provided_email == admin_profile.email.strip().lower()
-        and verify_password(payload.password, admin_profile.password_hash)
-    )
-    valid_portal_admin_login = admin_user is not None and verify_password(
-        payload.password,
-        admin_user.password_hash,
+        not valid_portal_admin_login
+        and provided_email == admin_profile_email
+        and verify_password(payload.password, admin_profile_hash)
     )
     valid = valid_env_login or valid_portal_admin_login
+    verified_hash = admin_user_hash if valid_portal_admin_login else admin_profile_hash
+    new_hash = _rehash_on_login(verified_hash if valid else None, payload.password, principal=principal)
     if valid:
         _reset_lock_state(state)
     elif _is_locked(state, now):
@@ -329,7 +322,12 @@ def admin_login(
     portal_user_id = admin_user.id if valid_portal_admin_login and admin_user is not None else None
     if admin_user is not None and portal_user_id is not None:
         admin_user.last_login_at = now
+        if new_hash:
+            admin_user.password_hash = new_hash
         db.add(admin_user)
+    elif new_hash:
+        admin_profile.password_hash = new_hash
+        db.add(admin_profile)
     session_record = create_session_record(
         db,
         principal=principal,
@@ -420,7 +418,7 @@ def admin_hint(
         )
 
     try:
-        service = build_email_service(get_settings(), _stored_smtp_config(db))
+        service = build_email_service(get_settings(), load_stored_smtp_config(db))
         result = send_admin_password_hint(service=service, recipient=principal)
     except SmtpNotConfiguredError as exc:
         raise HTTPException(
@@ -461,12 +459,12 @@ def portal_login(
     now = _utc_now()
     state = _get_lockout_state(db, actor_type="portal", principal=email)
     user = db.execute(select(PortalUser).where(PortalUser.email == email)).scalar_one_or_none()
-    is_valid = (
-        not _is_locked(state, now)
-        and user is not None
-        and user.is_active
-        and verify_password(payload.password, user.password_hash)
+    password_hash = (
+        user.password_hash if not _is_locked(state, now) and user is not None and user.is_active else None
     )
+    _release_connection(db)
+    is_valid = password_hash is not None and verify_password(payload.password, password_hash)
+    new_hash = _rehash_on_login(password_hash if is_valid else None, payload.password, principal=email)
     if not is_valid:
         became_locked = _record_failed_login(
             state,
@@ -481,6 +479,8 @@ def portal_login(
 
     _reset_lock_state(state)
     user.last_login_at = now
+    if new_hash:
+        user.password_hash = new_hash
     db.add(user)
     db.add(state)
     roles = _portal_roles_for_user(user)
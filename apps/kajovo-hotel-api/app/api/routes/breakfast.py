@@ -1,8 +1,8 @@
+import asyncio
 import json
-import os
 import re
+from collections.abc import AsyncIterator, Iterable
 from datetime import date
-from io import BytesIO
 
 from fastapi import (
     APIRouter,
@@ -12,16 +12,22 @@ from fastapi import (
     HTTPException,
     Query,
     Request,
+    Response,
     UploadFile,
     status,
 )
 from fastapi.responses import StreamingResponse
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.api.pagination import PageRequest, SortKey, page_request, paginate
 from app.api.schemas import (
+    BreakfastBulkStatusUpdate,
     BreakfastDailySummary,
     BreakfastImportItem,
+    BreakfastImportJobRead,
+    BreakfastImportJobStatus,
     BreakfastImportResponse,
     BreakfastOrderCreate,
     BreakfastOrderRead,
@@ -30,10 +36,18 @@ from app.api.schemas import (
 )
 from app.config import get_settings
 from app.db.models import BreakfastOrder
-from app.db.session import get_db
-from app.security.rbac import module_access_dependency, parse_identity
-from app.services.breakfast.parser import parse_breakfast_pdf
-from app.services.pdf.breakfast import build_breakfast_schedule_pdf
+from app.db.session import SessionLocal, get_db
+from app.security.rbac import module_access_dependency, resolve_identity
+from app.services.breakfast.events import BreakfastEvent, BreakfastSubscription, breakfast_events
+from app.services.breakfast.import_jobs import (
+    BreakfastImportJob,
+    archive_import_pdf,
+    breakfast_import_jobs,
+    imported_items,
+    replace_breakfast_day,
+)
+from app.services.breakfast.summary import BreakfastSummaryCounts, breakfast_summary_cache
+from app.services.pdf.breakfast import iter_breakfast_schedules_pdf
 
 router = APIRouter(
     prefix="/api/v1/breakfast",
@@ -58,21 +72,34 @@ def _visible_breakfast_orders(orders: list[BreakfastOrder]) -> list[BreakfastOrd
     )
 
 
-def _build_daily_summary(service_date: date, orders: list[BreakfastOrder]) -> BreakfastDailySummary:
-    counts = {status: 0 for status in BreakfastStatus}
-    for order in orders:
-        counts[BreakfastStatus(order.status)] += 1
-
+def _build_daily_summary(summary: BreakfastSummaryCounts) -> BreakfastDailySummary:
     return BreakfastDailySummary(
-        service_date=service_date,
-        total_orders=len(orders),
-        total_guests=sum(order.guest_count for order in orders),
-        status_counts=counts,
+        service_date=summary.service_date,
+        total_orders=summary.total_orders,
+        total_guests=summary.total_guests,
+        status_counts=dict(summary.status_counts),
+    )
+
+
+def _serialize_orders(orders: Iterable[BreakfastOrder]) -> list[dict[str, object]]:
+    return [BreakfastOrderRead.model_validate(order).model_dump(mode="json") for order in orders]
+
+
+def _publish_change(db: Session, event: str, service_date: date, **data: object) -> None:
+    if not breakfast_events.has_subscribers(service_date):
+        return
+    summary = _build_daily_summary(breakfast_summary_cache.get(db, service_date))
+    breakfast_events.publish(
+        BreakfastEvent(
+            event=event,
+            service_date=service_date,
+            data={**data, "summary": summary.model_dump(mode="json")},
+        )
     )
 
 
 def _actor_role(request: Request) -> str:
-    return getattr(request.state, "actor_role", None) or parse_identity(request)[2]
+    return resolve_identity(request).role
 
 
 def _is_breakfast_manager(actor_role: str) -> bool:
@@ -109,15 +136,22 @@ def _parse_diet_overrides(raw: str | None) -> dict[str, dict[str, bool]]:
     return overrides
 
 
+BREAKFAST_SORT = (
+    SortKey(BreakfastOrder.service_date, descending=True),
+    SortKey(BreakfastOrder.id, descending=True),
+)
+
+
 @router.get("", response_model=list[BreakfastOrderRead])
 def list_breakfast_orders(
+    response: Response,
     service_date: date | None = Query(default=None),
     status_filter: BreakfastStatus | None = Query(default=None, alias="status"),
+    page: PageRequest = Depends(page_request),
     db: Session = Depends(get_db),
 ) -> list[BreakfastOrder]:
-    query = select(BreakfastOrder).order_by(
-        BreakfastOrder.service_date.desc(), BreakfastOrder.id.desc()
-    )
+    # Orders without guests are hidden; filter them in SQL so pages stay full.
+    query = select(BreakfastOrder).where(BreakfastOrder.guest_count > 0)
 
     if service_date:
         query = query.where(BreakfastOrder.service_date == service_date)
@@ -125,8 +159,8 @@ def list_breakfast_orders(
     if status_filter:
         query = query.where(BreakfastOrder.status == status_filter.value)
 
-    result = db.scalars(query)
-    return _visible_breakfast_orders(list(result))
+    # Pages are cut newest service date first; each page is ordered by date and room for display.
+    return _visible_breakfast_orders(paginate(db, query, BREAKFAST_SORT, page, response))
 
 
 @router.get("/daily-summary", response_model=BreakfastDailySummary)
@@ -134,14 +168,65 @@ def get_daily_summary(
     service_date: date = Query(...),
     db: Session = Depends(get_db),
 ) -> BreakfastDailySummary:
-    orders = _visible_breakfast_orders(list(
-        db.scalars(
-            select(BreakfastOrder)
-            .where(BreakfastOrder.service_date == service_date)
-            .order_by(BreakfastOrder.id.desc())
+    return _build_daily_summary(breakfast_summary_cache.get(db, service_date))
+
+
+def _board_snapshot(service_date: date) -> dict[str, object]:
+    with SessionLocal() as db:
+        orders = _visible_breakfast_orders(
+            list(db.scalars(select(BreakfastOrder).where(BreakfastOrder.service_date == service_date)))
         )
-    ))
-    return _build_daily_summary(service_date, orders)
+        summary = _build_daily_summary(breakfast_summary_cache.get(db, service_date))
+        return {"orders": _serialize_orders(orders), "summary": summary.model_dump(mode="json")}
+
+
+def _sse(event: str, data: dict[str, object]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _board_events(
+    subscription: BreakfastSubscription, snapshot: dict[str, object]
+) -> AsyncIterator[str]:
+    service_date = subscription.service_date.isoformat()
+    heartbeat = get_settings().breakfast_stream_heartbeat_seconds
+    try:
+        yield _sse("snapshot", {"service_date": service_date, **snapshot})
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if subscription.overflowed:
+                # Too far behind to apply deltas; tell the client to reload the day.
+                subscription.overflowed = False
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                yield _sse("resync", {"service_date": service_date})
+                continue
+            data = event.data
+            if not data:
+                # Day-wide changes (imports, bulk deletes) carry no payload; send a fresh snapshot.
+                data = await run_in_threadpool(_board_snapshot, subscription.service_date)
+            yield _sse(event.event, {"service_date": service_date, **data})
+    finally:
+        breakfast_events.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_breakfast_board(service_date: date = Query(...)) -> StreamingResponse:
+    # Subscribe before taking the snapshot so no change between the two is lost.
+    subscription = breakfast_events.subscribe(service_date)
+    try:
+        snapshot = await run_in_threadpool(_board_snapshot, service_date)
+    except BaseException:
+        breakfast_events.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        _board_events(subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{order_id}", response_model=BreakfastOrderRead)
@@ -173,7 +258,9 @@ def create_breakfast_order(
     order = BreakfastOrder(**payload_data)
     db.add(order)
     db.commit()
+    breakfast_summary_cache.invalidate(order.service_date)
     db.refresh(order)
+    _publish_change(db, "order.created", order.service_date, orders=_serialize_orders([order]))
     return order
 
 
@@ -228,15 +315,78 @@ def update_breakfast_order(
             )
         updates["status"] = next_status
 
+    previous_date = order.service_date
     for key, value in updates.items():
         setattr(order, key, value)
 
     db.add(order)
     db.commit()
     db.refresh(order)
+    breakfast_summary_cache.invalidate(previous_date, order.service_date)
+    if previous_date != order.service_date:
+        _publish_change(db, "order.deleted", previous_date, order_id=order.id)
+    _publish_change(db, "order.updated", order.service_date, orders=_serialize_orders([order]))
     return order
 
 
+@router.patch("/bulk", response_model=list[BreakfastOrderRead])
+def bulk_update_breakfast_status(
+    payload: BreakfastBulkStatusUpdate,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> list[BreakfastOrder]:
+    # Later entries win, so an offline tap queue can be replayed in recorded order.
+    desired = {item.id: item.status.value for item in payload.items}
+    if not _is_breakfast_manager(_actor_role(request)) and any(
+        value != BreakfastStatus.SERVED.value for value in desired.values()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Breakfast role can only mark orders as served",
+        )
+
+    # Unknown ids (e.g. orders deleted while a tablet was offline) are skipped.
+    groups: dict[str, list[int]] = {}
+    service_dates: set[date] = set()
+    for order_id, current_status, service_date in db.execute(
+        select(BreakfastOrder.id, BreakfastOrder.status, BreakfastOrder.service_date).where(
+            BreakfastOrder.id.in_(desired)
+        )
+    ):
+        if current_status != desired[order_id]:
+            groups.setdefault(desired[order_id], []).append(order_id)
+            service_dates.add(service_date)
+    if not groups:
+        return []
+
+    for next_status, order_ids in groups.items():
+        db.execute(
+            update(BreakfastOrder)
+            .where(BreakfastOrder.id.in_(order_ids))
+            .values(status=next_status)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    breakfast_summary_cache.invalidate(*service_dates)
+
+    changed_ids = [order_id for order_ids in groups.values() for order_id in order_ids]
+    changed = list(
+        db.scalars(
+            select(BreakfastOrder)
+            .where(BreakfastOrder.id.in_(changed_ids))
+            .order_by(BreakfastOrder.service_date.asc(), BreakfastOrder.id.asc())
+        )
+    )
+    for service_date in sorted(service_dates):
+        _publish_change(
+            db,
+            "order.updated",
+            service_date,
+            orders=_serialize_orders(order for order in changed if order.service_date == service_date),
+        )
+    return changed
+
+
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_breakfast_order(order_id: int, request: Request, db: Session = Depends(get_db)) -> None:
     actor_role = _actor_role(request)
@@ -253,8 +403,11 @@ def delete_breakfast_order(order_id: int, request: Request, db: Session = Depend
             detail="Breakfast order not found",
         )
 
+    service_date = order.service_date
     db.delete(order)
     db.commit()
+    breakfast_summary_cache.invalidate(service_date)
+    _publish_change(db, "order.deleted", service_date, order_id=order_id)
 
 
 @router.post("/reactivate-all", status_code=status.HTTP_204_NO_CONTENT)
@@ -270,11 +423,23 @@ def reactivate_all_breakfast_orders(
             detail="Breakfast reactivation requires recepce/admin role",
         )
 
+    served_ids = list(
+        db.scalars(
+            select(BreakfastOrder.id).where(
+                BreakfastOrder.service_date == service_date,
+                BreakfastOrder.status == BreakfastStatus.SERVED.value,
+            )
+        )
+    )
     db.query(BreakfastOrder).filter(
         BreakfastOrder.service_date == service_date,
         BreakfastOrder.status == BreakfastStatus.SERVED.value,
     ).update({BreakfastOrder.status: BreakfastStatus.PENDING.value})
     db.commit()
+    breakfast_summary_cache.invalidate(service_date)
+    if served_ids:
+        reactivated = db.scalars(select(BreakfastOrder).where(BreakfastOrder.id.in_(served_ids)))
+        _publish_change(db, "orders.reactivated", service_date, orders=_serialize_orders(reactivated))
 
 
 @router.delete("/day/delete", status_code=status.HTTP_204_NO_CONTENT)
@@ -294,6 +459,8 @@ def delete_breakfast_orders_for_day(
         synchronize_session=False
     )
     db.commit()
+    breakfast_summary_cache.invalidate(service_date)
+    breakfast_events.publish(BreakfastEvent(event="day.replaced", service_date=service_date))
 
 
 @router.delete("/period/delete", status_code=status.HTTP_204_NO_CONTENT)
@@ -320,6 +487,10 @@ def delete_breakfast_orders_for_period(
         BreakfastOrder.service_date <= date_to,
     ).delete(synchronize_session=False)
     db.commit()
+    breakfast_summary_cache.invalidate()
+    for service_date in breakfast_events.subscribed_dates():
+        if date_from <= service_date <= date_to:
+            breakfast_events.publish(BreakfastEvent(event="day.replaced", service_date=service_date))
 
 
 @router.get("/export/daily")
@@ -343,25 +514,16 @@ def export_breakfast_daily_pdf(
         )
     ))
 
-    pdf_bytes = build_breakfast_schedule_pdf(orders, service_date=service_date)
     filename = f"breakfast-{service_date.isoformat()}.pdf"
     return StreamingResponse(
-        BytesIO(pdf_bytes),
+        iter_breakfast_schedules_pdf([(service_date, orders)]),
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
-@router.post("/import", response_model=BreakfastImportResponse)
-def import_breakfast_pdf(
-    request: Request,
-    save: bool = Form(False),
-    overrides: str | None = Form(None),
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-) -> BreakfastImportResponse:
-    actor_role = _actor_role(request)
-    if not _is_breakfast_manager(actor_role):
+def _read_import_upload(request: Request, file: UploadFile) -> bytes:
+    if not _is_breakfast_manager(_actor_role(request)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Breakfast import requires recepce/admin role",
@@ -374,53 +536,46 @@ def import_breakfast_pdf(
     pdf_bytes = file.file.read()
     if not pdf_bytes:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="PDF is empty")
+    return pdf_bytes
+
+
+def _import_job_read(job: BreakfastImportJob) -> BreakfastImportJobRead:
+    return BreakfastImportJobRead(
+        job_id=job.job_id,
+        status=BreakfastImportJobStatus(job.status),
+        progress=job.progress,
+        save=job.save,
+        saved=job.saved,
+        filename=job.filename,
+        date=job.service_date,
+        items=[BreakfastImportItem.model_validate(item) for item in job.items],
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+@router.post("/import", response_model=BreakfastImportResponse)
+def import_breakfast_pdf(
+    request: Request,
+    save: bool = Form(False),
+    overrides: str | None = Form(None),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+) -> BreakfastImportResponse:
+    pdf_bytes = _read_import_upload(request, file)
 
     try:
-        parsed_day, rows = parse_breakfast_pdf(pdf_bytes)
+        parsed_day, rows = breakfast_import_jobs.parse(pdf_bytes)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     diet_overrides = _parse_diet_overrides(overrides)
-    items = []
-    for row in rows:
-        override = diet_overrides.get(str(row.room), {})
-        items.append(
-            BreakfastImportItem(
-                room=int(row.room),
-                count=int(row.breakfast_count),
-                guest_name=row.guest_name,
-                diet_no_gluten=bool(override.get("diet_no_gluten", False)),
-                diet_no_milk=bool(override.get("diet_no_milk", False)),
-                diet_no_pork=bool(override.get("diet_no_pork", False)),
-            )
-        )
+    items = [BreakfastImportItem.model_validate(item) for item in imported_items(rows, diet_overrides)]
 
     if save:
-        db.query(BreakfastOrder).filter(BreakfastOrder.service_date == parsed_day).delete(
-            synchronize_session=False
-        )
-        for row in rows:
-            override = diet_overrides.get(str(row.room), {})
-            db.add(
-                BreakfastOrder(
-                    service_date=parsed_day,
-                    room_number=row.room,
-                    guest_name=row.guest_name or f"Pokoj {row.room}",
-                    guest_count=max(1, int(row.breakfast_count)),
-                    status=BreakfastStatus.PENDING.value,
-                    note="Import PDF",
-                    diet_no_gluten=bool(override.get("diet_no_gluten", False)),
-                    diet_no_milk=bool(override.get("diet_no_milk", False)),
-                    diet_no_pork=bool(override.get("diet_no_pork", False)),
-                )
-            )
-        db.commit()
-
-        settings = get_settings()
-        archive_dir = f"{settings.media_root}/breakfast/imports"
-        os.makedirs(archive_dir, exist_ok=True)
-        with open(f"{archive_dir}/{parsed_day.isoformat()}.pdf", "wb") as handle:
-            handle.write(pdf_bytes)
+        replace_breakfast_day(db, parsed_day, rows, note="Import PDF", diet_overrides=diet_overrides)
+        archive_import_pdf(get_settings(), pdf_bytes, f"{parsed_day.isoformat()}.pdf")
 
     return BreakfastImportResponse(
         date=parsed_day,
@@ -428,3 +583,37 @@ def import_breakfast_pdf(
         saved=save,
         items=items,
     )
+
+
+@router.post(
+    "/import/jobs",
+    response_model=BreakfastImportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_breakfast_import_job(
+    request: Request,
+    save: bool = Form(False),
+    overrides: str | None = Form(None),
+    file: UploadFile = File(...),
+) -> BreakfastImportJobRead:
+    pdf_bytes = _read_import_upload(request, file)
+    job = breakfast_import_jobs.submit(
+        pdf_bytes,
+        filename=file.filename,
+        save=save,
+        diet_overrides=_parse_diet_overrides(overrides),
+    )
+    return _import_job_read(job)
+
+
+@router.get("/import/{job_id}", response_model=BreakfastImportJobRead)
+def get_breakfast_import_job(job_id: str, request: Request) -> BreakfastImportJobRead:
+    if not _is_breakfast_manager(_actor_role(request)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Breakfast import requires recepce/admin role",
+        )
+    job = breakfast_import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Breakfast import job not found")
+    return _import_job_read(job)
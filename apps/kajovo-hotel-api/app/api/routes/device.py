@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.api.schemas import (
@@ -22,6 +22,7 @@ from app.api.schemas import (
 from app.config import get_settings
 from app.db.models import DeviceAccessToken, DeviceChallenge, DeviceRegistration
 from app.db.session import get_db
+from app.security.device_tokens import DeviceTokenGrant, device_token_cache, last_seen_due
 
 router = APIRouter(prefix="/api/v1/device", tags=["device"])
 DEVICE_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9._:-]{2,127}$")
@@ -67,10 +68,7 @@ def _require_device_by_secret(
     return device
 
 
-def _resolve_device_from_bearer(
-    db: Session,
-    authorization: str | None,
-) -> tuple[DeviceRegistration, DeviceAccessToken | None]:
+def _resolve_device_from_bearer(db: Session, authorization: str | None) -> DeviceTokenGrant:
     if not authorization:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
     prefix = "bearer "
@@ -82,21 +80,58 @@ def _resolve_device_from_bearer(
 
     now = _utc_now()
     token_hash = _sha256(raw_token)
-    token = db.scalar(
-        select(DeviceAccessToken).where(
+    cached = device_token_cache.get(token_hash, now)
+    if cached is not None:
+        return cached
+
+    row = db.execute(
+        select(DeviceAccessToken, DeviceRegistration)
+        .outerjoin(DeviceRegistration, DeviceRegistration.device_id == DeviceAccessToken.device_id)
+        .where(
             DeviceAccessToken.token_hash == token_hash,
             DeviceAccessToken.revoked_at.is_(None),
         )
-    )
-    if token is None or (_as_utc(token.expires_at) or now) <= now:
+    ).first()
+    token_expires_at = _as_utc(row[0].expires_at) if row is not None else None
+    if row is None or token_expires_at is None or token_expires_at <= now:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Bearer token expired or invalid")
 
-    device = db.scalar(
-        select(DeviceRegistration).where(DeviceRegistration.device_id == token.device_id)
-    )
+    token, device = row
     if device is None or device.status != "active":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Device is not active")
-    return device, token
+    grant = DeviceTokenGrant(
+        token_hash=token_hash,
+        device_id=device.device_id,
+        display_name=device.display_name,
+        status=device.status,
+        registered_at=device.registered_at,
+        last_seen_at=_as_utc(device.last_seen_at),
+        token_expires_at=token_expires_at,
+    )
+    device_token_cache.put(grant, now=now)
+    return grant
+
+
+def _record_bearer_use(db: Session, grant: DeviceTokenGrant, now: datetime) -> datetime | None:
+    """Write ``last_used_at`` / ``last_seen_at`` at most once per interval per token.
+
+    Returns the ``last_seen_at`` now stored for the device.
+    """
+    if not last_seen_due(grant.last_seen_at, now):
+        return grant.last_seen_at
+    db.execute(
+        update(DeviceAccessToken)
+        .where(DeviceAccessToken.token_hash == grant.token_hash)
+        .values(last_used_at=now)
+    )
+    db.execute(
+        update(DeviceRegistration)
+        .where(DeviceRegistration.device_id == grant.device_id)
+        .values(last_seen_at=now)
+    )
+    db.commit()
+    device_token_cache.mark_seen(grant.token_hash, now)
+    return now
 
 
 @router.post("/register", response_model=DeviceRegisterResponse)
@@ -142,6 +177,7 @@ def register_device(
         {DeviceAccessToken.revoked_at: now}
     )
     db.commit()
+    device_token_cache.invalidate_device(device_id)
 
     request.state.audit_detail_override = json.dumps(
         {"device_id": device_id, "action": "register"},
@@ -164,19 +200,21 @@ def device_status(
     x_device_secret: str | None = Header(default=None),
 ) -> DeviceStatusResponse:
     now = _utc_now()
-    token_expiry: datetime | None = None
 
     if authorization:
-        device, token = _resolve_device_from_bearer(db, authorization)
-        if token is not None:
-            token.last_used_at = now
-            token_expiry = token.expires_at
-            db.add(token)
-    else:
-        if not device_id or not x_device_secret:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing device credentials")
-        device = _require_device_by_secret(db, device_id=device_id, device_secret=x_device_secret)
+        grant = _resolve_device_from_bearer(db, authorization)
+        return DeviceStatusResponse(
+            device_id=grant.device_id,
+            display_name=grant.display_name,
+            status=grant.status,
+            registered_at=grant.registered_at,
+            last_seen_at=_record_bearer_use(db, grant, now),
+            token_expires_at=grant.token_expires_at,
+        )
 
+    if not device_id or not x_device_secret:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing device credentials")
+    device = _require_device_by_secret(db, device_id=device_id, device_secret=x_device_secret)
     device.last_seen_at = now
     db.add(device)
     db.commit()
@@ -186,7 +224,7 @@ def device_status(
         status=device.status,
         registered_at=device.registered_at,
         last_seen_at=device.last_seen_at,
-        token_expires_at=token_expiry,
+        token_expires_at=None,
     )
 
 
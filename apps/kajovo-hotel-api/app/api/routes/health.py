@@ -2,7 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.audit_writer import audit_writer
+from app.db.session import get_db, pool_status
+from app.security.passwords import password_hasher
+from app.services.auth_reaper import auth_row_reaper
 
 router = APIRouter(tags=["health"])
 
@@ -23,3 +26,23 @@ def ready(request: Request, db: Session = Depends(get_db)) -> dict[str, str | No
             detail="database not ready",
         ) from exc
     return {"status": "ready", "request_id": getattr(request.state, "request_id", None)}
+
+
+@router.get("/ready/pool")
+def ready_pool(request: Request) -> dict[str, object]:
+    return {"pool": pool_status(), "request_id": getattr(request.state, "request_id", None)}
+
+
+@router.get("/ready/audit")
+def ready_audit(request: Request) -> dict[str, object]:
+    return {"audit": audit_writer.stats(), "request_id": getattr(request.state, "request_id", None)}
+
+
+@router.get("/ready/passwords")
+def ready_passwords(request: Request) -> dict[str, object]:
+    return {"passwords": password_hasher.stats(), "request_id": getattr(request.state, "request_id", None)}
+
+
+@router.get("/ready/reaper")
+def ready_reaper(request: Request) -> dict[str, object]:
+    return {"reaper": auth_row_reaper.stats(), "request_id": getattr(request.state, "request_id", None)}
@@ -1,12 +1,23 @@
-import mimetypes
 from datetime import date
-from io import BytesIO
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
-from fastapi.responses import FileResponse, StreamingResponse
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, selectinload
 
+from app.api.media import get_media_storage, media_file_response, store_uploads
+from app.api.pagination import PageRequest, SortKey, page_request, paginate
 from app.api.schemas import (
     InventoryAuditLogRead,
     InventoryCardCreate,
@@ -22,19 +33,28 @@ from app.api.schemas import (
     InventoryMovementCreate,
     InventoryMovementRead,
     InventoryMovementType,
+    InventoryStockAtRead,
+    InventoryStockDriftRead,
 )
-from app.config import get_settings
 from app.db.models import (
     InventoryAuditLog,
     InventoryCard,
     InventoryCardItem,
+    InventoryDocumentSequence,
     InventoryItem,
     InventoryMovement,
 )
 from app.db.session import get_db
-from app.media.storage import InventoryMediaStorage
+from app.media.blobs import release_blobs, retain_blob
 from app.security.rbac import module_access_dependency, require_role
-from app.services.pdf.inventory import build_inventory_stocktake_pdf
+from app.services.inventory.ledger import (
+    find_stock_drift,
+    movement_effective_date,
+    shift_stock_snapshots,
+    signed_quantity,
+    stock_at,
+)
+from app.services.pdf.inventory import iter_inventory_stocktake_pdf
 
 router = APIRouter(
     prefix="/api/v1/inventory",
@@ -62,21 +82,45 @@ def _movement_prefix(movement_type: str) -> str:
     return "VY"
 
 
-def _next_document_number(db: Session, prefix: str, doc_date: date) -> str:
-    year = doc_date.year
+def _document_sequence_seed(db: Session, prefix: str, year: int) -> int:
+    # Only used the first time a prefix/year is numbered; migrated databases are backfilled.
     like = f"{prefix}-{year}-%"
-    last = db.execute(
-        select(InventoryMovement.document_number)
-        .where(InventoryMovement.document_number.like(like))
-        .order_by(InventoryMovement.document_number.desc())
-        .limit(1)
-    ).scalar_one_or_none()
     seq = 0
-    if last:
-        parts = last.split("-")
+    for column in (InventoryMovement.document_number, InventoryCard.number):
+        last = db.execute(select(column).where(column.like(like)).order_by(column.desc()).limit(1)).scalar_one_or_none()
+        parts = (last or "").split("-")
         if len(parts) >= 3 and parts[-1].isdigit():
-            seq = int(parts[-1])
-    return f"{prefix}-{year}-{seq + 1:04d}"
+            seq = max(seq, int(parts[-1]))
+    return seq
+
+
+def _next_document_number(db: Session, prefix: str, doc_date: date) -> str:
+    """Allocate the next number from the per-prefix, per-year counter row.
+
+    The UPDATE locks the counter row until the surrounding transaction ends, so
+    concurrent writers queue instead of colliding, and a rolled-back write releases
+    its number again (no gaps).
+    """
+    year = doc_date.year
+    bump = (
+        update(InventoryDocumentSequence)
+        .where(InventoryDocumentSequence.prefix == prefix, InventoryDocumentSequence.year == year)
+        .values(last_value=InventoryDocumentSequence.last_value + 1)
+        .returning(InventoryDocumentSequence.last_value)
+    )
+    seq = db.execute(bump).scalar_one_or_none()
+    if seq is None:
+        seed = _document_sequence_seed(db, prefix, year)
+        try:
+            with db.begin_nested():
+                db.execute(
+                    insert(InventoryDocumentSequence).values(prefix=prefix, year=year, last_value=seed + 1)
+                )
+            seq = seed + 1
+        except IntegrityError:
+            # Another writer created the counter first; take the next value from it.
+            seq = db.execute(bump).scalar_one()
+    return f"{prefix}-{year}-{seq:04d}"
 
 
 def _load_item_or_404(db: Session, item_id: int) -> InventoryItem:
@@ -167,49 +211,110 @@ def _load_item_detail(db: Session, item_id: int) -> InventoryItem:
     return item
 
 
+ITEM_SORT = (SortKey(InventoryItem.name), SortKey(InventoryItem.id))
+MOVEMENT_SORT = (
+    SortKey(InventoryMovement.document_date, descending=True, nullable=True),
+    SortKey(InventoryMovement.created_at, descending=True),
+    SortKey(InventoryMovement.id, descending=True),
+)
+CARD_SORT = (SortKey(InventoryCard.card_date, descending=True), SortKey(InventoryCard.id, descending=True))
+
+
 @router.get("", response_model=list[InventoryItemRead])
 @router.get("/ingredients", response_model=list[InventoryItemRead])
 def list_items(
-    low_stock: bool = Query(default=False), db: Session = Depends(get_db)
+    response: Response,
+    low_stock: bool = Query(default=False),
+    page: PageRequest = Depends(page_request),
+    db: Session = Depends(get_db),
 ) -> list[InventoryItem]:
-    query = select(InventoryItem).order_by(InventoryItem.name.asc(), InventoryItem.id.asc())
+    query = select(InventoryItem)
     if low_stock:
         query = query.where(InventoryItem.current_stock <= InventoryItem.min_stock)
-    return list(db.scalars(query))
+    return paginate(db, query, ITEM_SORT, page, response)
 
 
 @router.get("/movements", response_model=list[InventoryMovementRead])
-def list_movements(db: Session = Depends(get_db)) -> list[InventoryMovementRead]:
-    movements = list(
-        db.scalars(
-            select(InventoryMovement)
-            .options(selectinload(InventoryMovement.item), selectinload(InventoryMovement.card))
-            .order_by(
-                InventoryMovement.document_date.desc(),
-                InventoryMovement.created_at.desc(),
-                InventoryMovement.id.desc(),
-            )
-        )
+def list_movements(
+    response: Response,
+    item_id: int | None = Query(default=None),
+    movement_type: InventoryMovementType | None = Query(default=None),
+    date_from: date | None = Query(default=None),
+    date_to: date | None = Query(default=None),
+    page: PageRequest = Depends(page_request),
+    db: Session = Depends(get_db),
+) -> list[InventoryMovementRead]:
+    query = select(InventoryMovement).options(
+        selectinload(InventoryMovement.item), selectinload(InventoryMovement.card)
     )
+    if item_id is not None:
+        query = query.where(InventoryMovement.item_id == item_id)
+    if movement_type:
+        query = query.where(InventoryMovement.movement_type == movement_type.value)
+    if date_from:
+        query = query.where(InventoryMovement.document_date >= date_from)
+    if date_to:
+        query = query.where(InventoryMovement.document_date <= date_to)
+    movements = paginate(db, query, MOVEMENT_SORT, page, response)
     return [_serialize_movement(movement) for movement in movements]
 
 
 @router.get("/cards", response_model=list[InventoryCardRead])
-def list_cards(db: Session = Depends(get_db)) -> list[InventoryCard]:
-    return list(
-        db.scalars(
-            select(InventoryCard)
-            .order_by(InventoryCard.card_date.desc(), InventoryCard.id.desc())
+def list_cards(
+    response: Response,
+    card_type: InventoryCardType | None = Query(default=None),
+    page: PageRequest = Depends(page_request),
+    db: Session = Depends(get_db),
+) -> list[InventoryCard]:
+    query = select(InventoryCard)
+    if card_type:
+        query = query.where(InventoryCard.card_type == card_type.value)
+    return paginate(db, query, CARD_SORT, page, response)
+
+
+@router.get("/stock-at", response_model=list[InventoryStockAtRead])
+def get_stock_at(
+    on: date = Query(alias="date"),
+    item_id: int | None = Query(default=None, ge=1),
+    db: Session = Depends(get_db),
+) -> list[InventoryStockAtRead]:
+    rows = stock_at(db, on, [item_id] if item_id is not None else None)
+    return [
+        InventoryStockAtRead(item_id=row.item_id, name=row.name, unit=row.unit, stock_date=on, stock=row.stock)
+        for row in rows
+    ]
+
+
+@router.get("/stock-drift", response_model=list[InventoryStockDriftRead])
+def get_stock_drift(
+    db: Session = Depends(get_db),
+    _admin: None = Depends(require_role("admin")),
+) -> list[InventoryStockDriftRead]:
+    return [
+        InventoryStockDriftRead(
+            item_id=row.item_id,
+            name=row.name,
+            current_stock=row.current_stock,
+            ledger_stock=row.ledger_stock,
+            drift=row.drift,
+            snapshot_date=row.snapshot_date,
         )
-    )
+        for row in find_stock_drift(db)
+    ]
 
 
 @router.post("/cards", response_model=InventoryCardDetailRead, status_code=status.HTTP_201_CREATED)
 def create_card(payload: InventoryCardCreate, db: Session = Depends(get_db)) -> InventoryCardDetailRead:
     ingredient_ids = sorted({item.ingredient_id for item in payload.items})
+    # Lock the ingredients (in id order) so the stock check below holds until commit.
     ingredients = {
         item.id: item
-        for item in db.scalars(select(InventoryItem).where(InventoryItem.id.in_(ingredient_ids)))
+        for item in db.scalars(
+            select(InventoryItem)
+            .where(InventoryItem.id.in_(ingredient_ids))
+            .order_by(InventoryItem.id)
+            .with_for_update()
+        )
     }
     missing_ids = [ingredient_id for ingredient_id in ingredient_ids if ingredient_id not in ingredients]
     if missing_ids:
@@ -218,69 +323,124 @@ def create_card(payload: InventoryCardCreate, db: Session = Depends(get_db)) ->
             detail=f"Inventory ingredient not found: {missing_ids[0]}",
         )
 
+    totals: dict[int, int] = {}
+    for line in payload.items:
+        totals[line.ingredient_id] = totals.get(line.ingredient_id, 0) + line.quantity_base
     if payload.card_type in {InventoryCardType.OUT, InventoryCardType.ADJUST}:
-        for line in payload.items:
-            item = ingredients[line.ingredient_id]
-            if line.quantity_base > item.current_stock:
+        for ingredient_id, quantity in totals.items():
+            item = ingredients[ingredient_id]
+            if quantity > item.current_stock:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Insufficient stock for ingredient '{item.name}'",
                 )
-
-    card = InventoryCard(
-        card_type=payload.card_type.value,
-        number=_next_document_number(db, _movement_prefix(payload.card_type.value), payload.card_date),
-        card_date=payload.card_date,
-        supplier=payload.supplier,
-        reference=payload.reference,
-        note=payload.note,
-    )
-    db.add(card)
-    db.flush()
-
-    for line in payload.items:
-        ingredient = ingredients[line.ingredient_id]
-        card_item = InventoryCardItem(
-            card_id=card.id,
-            ingredient_id=ingredient.id,
-            quantity_base=line.quantity_base,
-            quantity_pieces=line.quantity_pieces,
-            note=line.note,
-        )
-        db.add(card_item)
-        db.flush()
-
-        if payload.card_type == InventoryCardType.IN:
-            ingredient.current_stock += line.quantity_base
-        else:
-            ingredient.current_stock -= line.quantity_base
-        db.add(ingredient)
-
-        movement = InventoryMovement(
-            item_id=ingredient.id,
-            card_id=card.id,
-            card_item_id=card_item.id,
-            movement_type=payload.card_type.value,
-            document_number=card.number,
-            document_reference=payload.reference,
-            document_date=payload.card_date,
-            quantity=line.quantity_base,
-            quantity_pieces=line.quantity_pieces,
-            note=line.note or payload.note,
-        )
-        db.add(movement)
-        _log_audit(
-            db,
-            "item",
-            ingredient.id,
-            "card",
-            f"Card {card.number} ({payload.card_type.value}) changed stock by {line.quantity_base}.",
+        deltas = {ingredient_id: -quantity for ingredient_id, quantity in totals.items()}
+    else:
+        deltas = totals
+
+    card_type = payload.card_type.value
+    number = _next_document_number(db, _movement_prefix(card_type), payload.card_date)
+    card_row = db.execute(
+        insert(InventoryCard)
+        .values(
+            card_type=card_type,
+            number=number,
+            card_date=payload.card_date,
+            supplier=payload.supplier,
+            reference=payload.reference,
+            note=payload.note,
         )
-
-    _log_audit(db, "card", card.id, "create", f"Created inventory card {card.number}.")
+        .returning(InventoryCard.id, InventoryCard.created_at, InventoryCard.updated_at)
+    ).one()
+    line_rows = db.execute(
+        insert(InventoryCardItem).returning(
+            InventoryCardItem.id, InventoryCardItem.created_at, sort_by_parameter_order=True
+        ),
+        [
+            {
+                "card_id": card_row.id,
+                "ingredient_id": line.ingredient_id,
+                "quantity_base": line.quantity_base,
+                "quantity_pieces": line.quantity_pieces,
+                "note": line.note,
+            }
+            for line in payload.items
+        ],
+    ).all()
+    db.execute(
+        insert(InventoryMovement),
+        [
+            {
+                "item_id": line.ingredient_id,
+                "card_id": card_row.id,
+                "card_item_id": line_row.id,
+                "movement_type": card_type,
+                "document_number": number,
+                "document_reference": payload.reference,
+                "document_date": payload.card_date,
+                "quantity": line.quantity_base,
+                "quantity_pieces": line.quantity_pieces,
+                "note": line.note or payload.note,
+            }
+            for line, line_row in zip(payload.items, line_rows, strict=True)
+        ],
+    )
+    db.execute(
+        update(InventoryItem)
+        .where(InventoryItem.id.in_(deltas))
+        .values(current_stock=InventoryItem.current_stock + case(deltas, value=InventoryItem.id, else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    shift_stock_snapshots(db, deltas, payload.card_date)
+    audit_rows = [
+        {
+            "entity": "item",
+            "resource_id": line.ingredient_id,
+            "action": "card",
+            "detail": f"Card {number} ({card_type}) changed stock by {line.quantity_base}.",
+        }
+        for line in payload.items
+    ]
+    audit_rows.append(
+        {
+            "entity": "card",
+            "resource_id": card_row.id,
+            "action": "create",
+            "detail": f"Created inventory card {number}.",
+        }
+    )
+    db.execute(insert(InventoryAuditLog), audit_rows)
+    # Read before commit, which expires the loaded ingredients.
+    labels = {item.id: (item.name, item.unit) for item in ingredients.values()}
     db.commit()
-    db.refresh(card)
-    return _serialize_card(_load_card_or_404(db, card.id))
+
+    return InventoryCardDetailRead.model_validate(
+        {
+            "id": card_row.id,
+            "card_type": card_type,
+            "number": number,
+            "card_date": payload.card_date,
+            "supplier": payload.supplier,
+            "reference": payload.reference,
+            "note": payload.note,
+            "created_at": card_row.created_at,
+            "updated_at": card_row.updated_at,
+            "items": [
+                {
+                    "id": line_row.id,
+                    "card_id": card_row.id,
+                    "ingredient_id": line.ingredient_id,
+                    "ingredient_name": labels[line.ingredient_id][0],
+                    "unit": labels[line.ingredient_id][1],
+                    "quantity_base": line.quantity_base,
+                    "quantity_pieces": line.quantity_pieces,
+                    "note": line.note,
+                    "created_at": line_row.created_at,
+                }
+                for line, line_row in zip(payload.items, line_rows, strict=True)
+            ],
+        }
+    )
 
 
 @router.get("/cards/{card_id}", response_model=InventoryCardDetailRead)
@@ -295,7 +455,12 @@ def delete_card(
     _admin: None = Depends(require_role("admin")),
 ) -> None:
     card = _load_card_or_404(db, card_id)
+    reverts: dict[date, dict[int, int]] = {}
     for movement in card.movements:
+        effective = reverts.setdefault(movement_effective_date(movement), {})
+        effective[movement.item_id] = effective.get(movement.item_id, 0) - signed_quantity(
+            movement.movement_type, movement.quantity
+        )
         item = movement.item or _load_item_or_404(db, movement.item_id)
         if movement.movement_type == InventoryMovementType.IN.value:
             if movement.quantity > item.current_stock:
@@ -308,6 +473,8 @@ def delete_card(
             item.current_stock += movement.quantity
         db.add(item)
 
+    for effective_date, deltas in reverts.items():
+        shift_stock_snapshots(db, deltas, effective_date)
     for movement in list(card.movements):
         db.delete(movement)
     for item in list(card.items):
@@ -420,6 +587,9 @@ def add_movement(
 
     db.add(movement)
     db.add(item)
+    shift_stock_snapshots(
+        db, {item.id: signed_quantity(payload.movement_type.value, payload.quantity)}, doc_date
+    )
     _log_audit(
         db,
         "item",
@@ -451,6 +621,7 @@ def delete_item(
         )
 
     _log_audit(db, "item", item.id, "delete", f"Deleted inventory item '{item.name}'.")
+    release_blobs(db, [item.pictogram_path])
     db.delete(item)
     db.commit()
 
@@ -485,6 +656,11 @@ def delete_movement(
     else:
         item.current_stock += movement.quantity
     db.add(item)
+    shift_stock_snapshots(
+        db,
+        {item.id: -signed_quantity(movement.movement_type, movement.quantity)},
+        movement_effective_date(movement),
+    )
     _log_audit(
         db,
         "item",
@@ -504,12 +680,9 @@ def upload_item_pictogram(
 ) -> InventoryItem:
     item = _load_item_or_404(db, item_id)
 
-    storage = InventoryMediaStorage(get_settings().media_root)
-    stored = storage.store_pictogram(
-        ingredient_id=item.id,
-        src_file=file.file,
-        src_filename=file.filename or "pictogram.jpg",
-    )
+    [stored] = store_uploads([file])
+    retain_blob(db, stored, get_media_storage())
+    release_blobs(db, [item.pictogram_path])
     item.pictogram_path = stored.original_relpath
     item.pictogram_thumb_path = stored.thumb_relpath
     db.add(item)
@@ -519,19 +692,21 @@ def upload_item_pictogram(
 
 
 @router.get("/{item_id}/pictogram/{kind}")
-def get_item_pictogram(item_id: int, kind: str, db: Session = Depends(get_db)):
+def get_item_pictogram(
+    item_id: int,
+    kind: str,
+    request: Request,
+    db: Session = Depends(get_db),
+):
     item = _load_item_or_404(db, item_id)
-    if kind not in {"thumb", "original"}:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported kind")
-    rel = item.pictogram_thumb_path if kind == "thumb" else item.pictogram_path
-    if not rel:
+    if not item.pictogram_path:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pictogram not found")
-    storage = InventoryMediaStorage(get_settings().media_root)
-    path = storage.resolve(rel)
-    if not path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
-    media_type = "image/jpeg" if kind == "thumb" else (mimetypes.guess_type(path.name)[0] or "image/jpeg")
-    return FileResponse(path, media_type=media_type)
+    return media_file_response(
+        request,
+        original_relpath=item.pictogram_path,
+        thumb_relpath=item.pictogram_thumb_path,
+        kind=kind,
+    )
 
 
 @router.get("/stocktake/pdf")
@@ -542,9 +717,8 @@ def export_stocktake_pdf(
     items = list(
         db.scalars(select(InventoryItem).order_by(InventoryItem.name.asc(), InventoryItem.id.asc()))
     )
-    pdf_bytes = build_inventory_stocktake_pdf(items, stock_date=date.today())
     return StreamingResponse(
-        BytesIO(pdf_bytes),
+        iter_inventory_stocktake_pdf(items, stock_date=date.today()),
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=inventory-stocktake.pdf"},
     )
@@ -1,10 +1,21 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
+from app.api.media import get_media_storage, media_file_response, store_uploads
+from app.api.pagination import PageRequest, SortKey, page_request, paginate
 from app.api.schemas import (
     IssueCreate,
     IssuePriority,
@@ -13,15 +24,14 @@ from app.api.schemas import (
     IssueUpdate,
     MediaPhotoRead,
 )
-from app.config import get_settings
 from app.db.models import Issue, IssuePhoto
 from app.db.session import get_db
-from app.media.storage import MediaStorage
+from app.media.blobs import release_blobs, retain_blob
 from app.security.rbac import (
     module_access_dependency,
     normalize_role,
-    parse_identity,
     require_actor_type,
+    resolve_identity,
 )
 
 router = APIRouter(
@@ -36,7 +46,7 @@ MAINTENANCE_ROLE = normalize_role("udrzba")
 
 
 def _actor_role(request: Request) -> str:
-    return normalize_role(getattr(request.state, "actor_role", None))
+    return resolve_identity(request).role
 
 
 def _is_admin(role: str) -> bool:
@@ -98,21 +108,22 @@ def _guard_issue_update(actor_role: str, issue: Issue, updates: dict[str, object
     )
 
 
+ISSUE_SORT = (SortKey(Issue.created_at, descending=True), SortKey(Issue.id, descending=True))
+
+
 @router.get("", response_model=list[IssueRead])
 def list_issues(
     request: Request,
+    response: Response,
     priority: IssuePriority | None = Query(default=None),
     status_filter: IssueStatus | None = Query(default=None, alias="status"),
     location: str | None = Query(default=None),
     room_number: str | None = Query(default=None),
+    page: PageRequest = Depends(page_request),
     db: Session = Depends(get_db),
 ) -> list[Issue]:
-    query = (
-        select(Issue)
-        .options(selectinload(Issue.photos))
-        .order_by(Issue.created_at.desc(), Issue.id.desc())
-    )
-    actor_role = getattr(request.state, "actor_role", "") or parse_identity(request)[2]
+    query = select(Issue).options(selectinload(Issue.photos))
+    actor_role = _actor_role(request)
     if actor_role == "údržba" and status_filter is None:
         query = query.where(
             Issue.status.in_(
@@ -129,7 +140,7 @@ def list_issues(
     if room_number:
         query = query.where(Issue.room_number == room_number)
 
-    return list(db.scalars(query))
+    return paginate(db, query, ISSUE_SORT, page, response)
 
 
 @router.get("/{issue_id}", response_model=IssueRead)
@@ -206,6 +217,7 @@ def delete_issue(
     if not issue:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Issue not found")
 
+    release_blobs(db, [photo.file_path for photo in issue.photos])
     db.delete(issue)
     db.commit()
 
@@ -234,15 +246,10 @@ def upload_issue_photos(
     if len(issue.photos) + len(photos) > 3:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Maximum 3 photos")
 
-    storage = MediaStorage(get_settings().media_root)
+    stored_files = store_uploads(photos)
     start_idx = len(issue.photos)
-    for offset, upload in enumerate(photos):
-        stored = storage.store_image(
-            category="issues",
-            resource_id=issue.id,
-            src_file=upload.file,
-            src_filename=upload.filename or f"photo-{offset + 1}.jpg",
-        )
+    for offset, (upload, stored) in enumerate(zip(photos, stored_files, strict=True)):
+        retain_blob(db, stored, get_media_storage())
         db.add(
             IssuePhoto(
                 issue_id=issue.id,
@@ -266,16 +273,17 @@ def get_issue_photo(
     issue_id: int,
     photo_id: int,
     kind: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     photo = db.scalar(select(IssuePhoto).where(IssuePhoto.id == photo_id, IssuePhoto.issue_id == issue_id))
     if not photo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
-    if kind not in {"thumb", "original"}:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported kind")
-    rel = photo.thumb_path if kind == "thumb" else photo.file_path
-    storage = MediaStorage(get_settings().media_root)
-    path = storage.resolve(rel)
-    if not path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
-    return FileResponse(path, media_type=photo.mime_type)
+    return media_file_response(
+        request,
+        original_relpath=photo.file_path,
+        thumb_relpath=photo.thumb_path,
+        kind=kind,
+        media_type=photo.mime_type,
+        immutable=True,
+    )
@@ -1,8 +1,19 @@
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
+from app.api.media import get_media_storage, media_file_response, store_uploads
+from app.api.pagination import PageRequest, SortKey, page_request, paginate
 from app.api.schemas import (
     LostFoundItemCreate,
     LostFoundItemRead,
@@ -11,12 +22,11 @@ from app.api.schemas import (
     LostFoundStatus,
     MediaPhotoRead,
 )
-from app.config import get_settings
 from app.db.models import LostFoundItem, LostFoundPhoto
 from app.db.session import get_db
-from app.media.storage import MediaStorage
+from app.media.blobs import release_blobs, retain_blob
 from app.security.auth import SESSION_COOKIE_NAME, read_session_cookie
-from app.security.rbac import module_access_dependency, parse_identity, require_actor_type
+from app.security.rbac import module_access_dependency, require_actor_type, resolve_identity
 from app.time_utils import utc_now
 
 router = APIRouter(
@@ -26,19 +36,20 @@ router = APIRouter(
 )
 
 
+LOST_FOUND_SORT = (SortKey(LostFoundItem.event_at, descending=True), SortKey(LostFoundItem.id, descending=True))
+
+
 @router.get("", response_model=list[LostFoundItemRead])
 def list_lost_found_items(
     request: Request,
+    response: Response,
     item_type: LostFoundItemType | None = Query(default=None, alias="type"),
     status_filter: LostFoundStatus | None = Query(default=None, alias="status"),
     category: str | None = Query(default=None),
+    page: PageRequest = Depends(page_request),
     db: Session = Depends(get_db),
 ) -> list[LostFoundItem]:
-    query = (
-        select(LostFoundItem)
-        .options(selectinload(LostFoundItem.photos))
-        .order_by(LostFoundItem.event_at.desc(), LostFoundItem.id.desc())
-    )
+    query = select(LostFoundItem).options(selectinload(LostFoundItem.photos))
     session = read_session_cookie(request.cookies.get(SESSION_COOKIE_NAME))
     actor_type = str((session or {}).get("actor_type") or ("portal" if session else ""))
 
@@ -52,7 +63,7 @@ def list_lost_found_items(
     if category:
         query = query.where(LostFoundItem.category == category)
 
-    return list(db.scalars(query))
+    return paginate(db, query, LOST_FOUND_SORT, page, response)
 
 
 @router.get("/{item_id}", response_model=LostFoundItemRead)
@@ -100,7 +111,7 @@ def update_lost_found_item(
         )
 
     updates = payload.model_dump(exclude_unset=True)
-    actor_role = getattr(request.state, "actor_role", "") or parse_identity(request)[2]
+    actor_role = resolve_identity(request).role
     if actor_role == "recepce":
         allowed_fields = {"status"}
         if set(updates) - allowed_fields:
@@ -145,6 +156,7 @@ def delete_lost_found_item(item_id: int, db: Session = Depends(get_db), _admin:
             detail="Lost & found item not found",
         )
 
+    release_blobs(db, [photo.file_path for photo in item.photos])
     db.delete(item)
     db.commit()
 
@@ -171,15 +183,10 @@ def upload_lost_found_photos(
     if len(photos) > 3:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Maximum 3 photos")
 
-    storage = MediaStorage(get_settings().media_root)
+    stored_files = store_uploads(photos)
     start_idx = len(item.photos)
-    for offset, upload in enumerate(photos):
-        stored = storage.store_image(
-            category="lost-found",
-            resource_id=item.id,
-            src_file=upload.file,
-            src_filename=upload.filename or f"photo-{offset + 1}.jpg",
-        )
+    for offset, (upload, stored) in enumerate(zip(photos, stored_files, strict=True)):
+        retain_blob(db, stored, get_media_storage())
         db.add(
             LostFoundPhoto(
                 item_id=item.id,
@@ -205,6 +212,7 @@ def get_lost_found_photo(
     item_id: int,
     photo_id: int,
     kind: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     photo = db.scalar(
@@ -212,11 +220,11 @@ def get_lost_found_photo(
     )
     if not photo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
-    if kind not in {"thumb", "original"}:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported kind")
-    rel = photo.thumb_path if kind == "thumb" else photo.file_path
-    storage = MediaStorage(get_settings().media_root)
-    path = storage.resolve(rel)
-    if not path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
-    return FileResponse(path, media_type=photo.mime_type)
+    return media_file_response(
+        request,
+        original_relpath=photo.file_path,
+        thumb_relpath=photo.thumb_path,
+        kind=kind,
+        media_type=photo.mime_type,
+        immutable=True,
+    )
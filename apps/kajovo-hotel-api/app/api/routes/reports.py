@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
+from app.api.media import get_media_storage, media_file_response, store_uploads
+from app.api.pagination import PageRequest, SortKey, page_request, paginate
 from app.api.schemas import MediaPhotoRead, ReportCreate, ReportRead, ReportUpdate
-from app.config import get_settings
 from app.db.models import Report, ReportPhoto
 from app.db.session import get_db
-from app.media.storage import MediaStorage
+from app.media.blobs import release_blobs, retain_blob
 from app.security.rbac import module_access_dependency
 
 router = APIRouter(
@@ -17,16 +27,20 @@ router = APIRouter(
 )
 
 
+REPORT_SORT = (SortKey(Report.id, descending=True),)
+
+
 @router.get("", response_model=list[ReportRead])
 def list_reports(
+    response: Response,
     status_filter: str | None = Query(default=None, alias="status"),
+    page: PageRequest = Depends(page_request),
     db: Session = Depends(get_db),
 ) -> list[Report]:
-    query = select(Report).options(selectinload(Report.photos)).order_by(Report.id.desc())
+    query = select(Report).options(selectinload(Report.photos))
     if status_filter:
         query = query.where(Report.status == status_filter)
-    result = db.scalars(query)
-    return list(result)
+    return paginate(db, query, REPORT_SORT, page, response)
 
 
 @router.get("/{report_id}", response_model=ReportRead)
@@ -69,6 +83,7 @@ def delete_report(report_id: int, db: Session = Depends(get_db)) -> None:
     if not report:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
 
+    release_blobs(db, [photo.file_path for photo in report.photos])
     db.delete(report)
     db.commit()
 
@@ -93,15 +108,10 @@ def upload_report_photos(
     if len(photos) > 3:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Maximum 3 photos")
 
-    storage = MediaStorage(get_settings().media_root)
+    stored_files = store_uploads(photos)
     start_idx = len(report.photos)
-    for offset, upload in enumerate(photos):
-        stored = storage.store_image(
-            category="reports",
-            resource_id=report.id,
-            src_file=upload.file,
-            src_filename=upload.filename or f"photo-{offset + 1}.jpg",
-        )
+    for offset, (upload, stored) in enumerate(zip(photos, stored_files, strict=True)):
+        retain_blob(db, stored, get_media_storage())
         db.add(
             ReportPhoto(
                 report_id=report.id,
@@ -127,6 +137,7 @@ def get_report_photo(
     report_id: int,
     photo_id: int,
     kind: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     photo = db.scalar(
@@ -134,11 +145,11 @@ def get_report_photo(
     )
     if not photo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
-    if kind not in {"thumb", "original"}:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported kind")
-    rel = photo.thumb_path if kind == "thumb" else photo.file_path
-    storage = MediaStorage(get_settings().media_root)
-    path = storage.resolve(rel)
-    if not path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
-    return FileResponse(path, media_type=photo.mime_type)
+    return media_file_response(
+        request,
+        original_relpath=photo.file_path,
+        thumb_relpath=photo.thumb_path,
+        kind=kind,
+        media_type=photo.mime_type,
+        immutable=True,
+    )
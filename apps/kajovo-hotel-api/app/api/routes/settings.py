@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from types import SimpleNamespace
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import inspect, text
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.api.schemas import (
@@ -28,6 +28,11 @@ from app.services.mail import (
     to_stored_config,
     validate_smtp_security_mode,
 )
+from app.services.smtp_config import (
+    invalidate_smtp_config,
+    smtp_config_cache,
+    stored_smtp_config_from_row,
+)
 
 router = APIRouter(
     prefix="/api/v1/admin/settings",
@@ -80,14 +85,8 @@ def _default_smtp_settings_read() -> SmtpSettingsRead:
     )
 
 
-def _smtp_table_columns(db: Session) -> set[str]:
-    bind = db.get_bind()
-    inspector = inspect(bind)
-    try:
-        return {str(column["name"]) for column in inspector.get_columns("portal_smtp_settings")}
-    except Exception:
-        logger.exception("smtp.settings.inspect_failed")
-        return set()
+def _smtp_table_columns(db: Session) -> frozenset[str]:
+    return smtp_config_cache.columns(db)
 
 
 def _safe_load_smtp_row(db: Session) -> dict[str, object] | None:
@@ -161,6 +160,7 @@ def _upsert_smtp_row(db: Session, stored: StoredSmtpConfig) -> None:
             {column: values[column] for column in writable_columns},
         )
     db.commit()
+    invalidate_smtp_config()
 
 
 def _safe_load_smtp_record(db: Session) -> PortalSmtpSettings | None:
@@ -219,15 +219,7 @@ def get_smtp_settings(db: Session = Depends(get_db)) -> SmtpSettingsRead:
     if row is None:
         return _default_smtp_settings_read()
     try:
-        stored = StoredSmtpConfig(
-            from_email=str(row.get("from_email") or "").strip().lower(),
-            host=str(row.get("host") or ""),
-            port=int(row.get("port") or 587),
-            username=str(row.get("username") or ""),
-            use_tls=bool(True if row.get("use_tls") is None else row.get("use_tls")),
-            use_ssl=bool(False if row.get("use_ssl") is None else row.get("use_ssl")),
-            password_encrypted=str(row.get("password_encrypted") or ""),
-        )
+        stored = stored_smtp_config_from_row(row)
         read_model = to_read_model(stored, settings.smtp_encryption_key)
         return SmtpSettingsRead(**read_model.__dict__)
     except Exception:
@@ -337,15 +329,7 @@ def test_smtp_email(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="SMTP is disabled in this environment",
         )
-    stored = StoredSmtpConfig(
-        from_email=str(row.get("from_email") or "").strip().lower(),
-        host=str(row.get("host") or ""),
-        port=int(row.get("port") or 587),
-        username=str(row.get("username") or ""),
-        use_tls=bool(True if row.get("use_tls") is None else row.get("use_tls")),
-        use_ssl=bool(False if row.get("use_ssl") is None else row.get("use_ssl")),
-        password_encrypted=str(row.get("password_encrypted") or ""),
-    )
+    stored = stored_smtp_config_from_row(row)
     try:
         service = build_email_service(settings, stored)
         result = service.send(
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta, timezone
 from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import func, inspect, select, text
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.api.schemas import (
@@ -23,22 +23,25 @@ from app.db.models import (
     PortalUserRole,
 )
 from app.db.session import get_db
-from app.security.auth import revoke_sessions_for_portal_user
+from app.security.auth import (
+    forget_cached_sessions_for_portal_user,
+    revoke_sessions_for_portal_user,
+)
 from app.security.passwords import hash_password
 from app.security.rbac import (
     module_access_dependency,
     normalize_role,
-    parse_identity,
     require_actor_type,
+    resolve_identity,
 )
 from app.services.mail import (
     SmtpDeliveryError,
     SmtpNotConfiguredError,
-    StoredSmtpConfig,
     build_email_service,
     send_portal_onboarding,
     send_user_password_reset_link,
 )
+from app.services.smtp_config import load_stored_smtp_config
 from app.time_utils import utc_now
 
 router = APIRouter(
@@ -65,40 +68,6 @@ def _is_locked_until(value: datetime | None) -> bool:
     return locked_until is not None and locked_until > utc_now()
 
 
-def _stored_smtp_config(db: Session) -> StoredSmtpConfig | None:
-    bind = db.get_bind()
-    inspector = inspect(bind)
-    try:
-        columns = {str(column["name"]) for column in inspector.get_columns("portal_smtp_settings")}
-    except Exception:
-        db.rollback()
-        return None
-    if not columns:
-        return None
-    selected_columns = [
-        column
-        for column in ["from_email", "host", "port", "username", "password_encrypted", "use_tls", "use_ssl"]
-        if column in columns
-    ]
-    if not selected_columns:
-        return None
-    row = db.execute(
-        text(f"SELECT {', '.join(selected_columns)} FROM portal_smtp_settings WHERE id = :id"),
-        {"id": 1},
-    ).mappings().first()
-    if row is None:
-        return None
-    return StoredSmtpConfig(
-        from_email=str(row.get("from_email") or "").strip().lower(),
-        host=str(row.get("host") or ""),
-        port=int(row.get("port") or 587),
-        username=str(row.get("username") or ""),
-        use_tls=bool(True if row.get("use_tls") is None else row.get("use_tls")),
-        use_ssl=bool(False if row.get("use_ssl") is None else row.get("use_ssl")),
-        password_encrypted=str(row.get("password_encrypted") or ""),
-    )
-
-
 def _lockout_map_for_users(db: Session, emails: list[str]) -> dict[tuple[str, str], datetime | None]:
     principals = [_normalize_email(email) for email in emails if email.strip()]
     if not principals:
@@ -239,7 +208,7 @@ def create_user(payload: PortalUserCreate, db: Session = Depends(get_db)) -> Por
     response_model = _to_read_model(user, _lockout_map_for_user(db, user.email))
     settings = get_settings()
     try:
-        service = build_email_service(settings, _stored_smtp_config(db))
+        service = build_email_service(settings, load_stored_smtp_config(db))
         send_portal_onboarding(service=service, recipient=user.email)
     except Exception:
         # CRUD uzivatele nesmi spadnout na volitelnem onboarding e-mailu.
@@ -279,6 +248,9 @@ def update_user(
     if payload.password is not None:
         user.password_hash = hash_password(payload.password)
         revoke_sessions_for_portal_user(db, user.id)
+    else:
+        # Role or e-mail changes invalidate sessions on next validation; drop cached copies.
+        forget_cached_sessions_for_portal_user(user.id)
     user.updated_at = utc_now()
     db.add(user)
     db.commit()
@@ -331,7 +303,7 @@ def send_user_reset_link(
         f"{urlencode({'token': token})}"
     )
     try:
-        service = build_email_service(settings, _stored_smtp_config(db))
+        service = build_email_service(settings, load_stored_smtp_config(db))
         result = send_user_password_reset_link(service=service, recipient=user.email, reset_link=reset_link)
         db.commit()
         return UserPasswordResetLinkResponse(
@@ -395,7 +367,7 @@ def delete_user(
     user = db.get(PortalUser, user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    actor_email, _, _ = parse_identity(request)
+    actor_email = resolve_identity(request).actor_id
     target_email = user.email.strip().lower()
 
     if actor_email and actor_email.strip().lower() == target_email:
@@ -94,6 +94,15 @@ class BreakfastOrderUpdate(BaseModel):
     diet_no_pork: bool | None = None
 
 
+class BreakfastBulkStatusItem(BaseModel):
+    id: int = Field(ge=1)
+    status: BreakfastStatus
+
+
+class BreakfastBulkStatusUpdate(BaseModel):
+    items: list[BreakfastBulkStatusItem] = Field(min_length=1, max_length=500)
+
+
 class BreakfastOrderRead(BreakfastOrderBase):
     model_config = ConfigDict(from_attributes=True)
 
@@ -126,6 +135,28 @@ class BreakfastImportResponse(BaseModel):
     items: list[BreakfastImportItem]
 
 
+class BreakfastImportJobStatus(StrEnum):
+    QUEUED = "queued"
+    PARSING = "parsing"
+    SAVING = "saving"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BreakfastImportJobRead(BaseModel):
+    job_id: str
+    status: BreakfastImportJobStatus
+    progress: int
+    save: bool
+    saved: bool = False
+    filename: str | None
+    date: date | None
+    items: list[BreakfastImportItem] = Field(default_factory=list)
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class LostFoundItemType(StrEnum):
     LOST = "lost"
     FOUND = "found"
@@ -433,6 +464,23 @@ class InventoryItemDetailRead(InventoryItemRead):
     movements: list[InventoryMovementRead]
 
 
+class InventoryStockAtRead(BaseModel):
+    item_id: int
+    name: str
+    unit: str
+    stock_date: date
+    stock: int
+
+
+class InventoryStockDriftRead(BaseModel):
+    item_id: int
+    name: str
+    current_stock: int
+    ledger_stock: int
+    drift: int
+    snapshot_date: date
+
+
 class InventoryItemWithAuditRead(InventoryItemDetailRead):
     audit_logs: list[InventoryAuditLogRead]
 
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import Settings, get_settings
+from app.db.models import AuditTrail
+
+logger = logging.getLogger("kajovo.api.audit")
+
+# Errors caused by the content of a row, as opposed to the database being unavailable.
+ROW_LEVEL_ERRORS = (IntegrityError, DataError)
+
+
+class AuditTrailWriter:
+    """Buffers audit rows in a bounded queue and bulk-inserts them off the event loop."""
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Session] | None = None,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 1.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_seconds = max(0.0, float(flush_interval_seconds))
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._pending: list[dict[str, Any]] = []
+        self._inflight: asyncio.Future[int] | None = None
+        # Counters are updated on the event loop and in writer threads.
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AuditTrailWriter:
+        return cls(
+            max_queue_size=settings.audit_queue_max_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval_seconds=settings.audit_flush_interval_seconds,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> dict[str, int | bool]:
+        with self._lock:
+            counters = {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_max_size": self.max_queue_size,
+            **counters,
+        }
+
+    def _new_session(self) -> Session:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _count_failed(self, rows: list[dict[str, Any]], exc: SQLAlchemyError) -> None:
+        with self._lock:
+            self.failed += len(rows)
+        logger.warning(
+            "audit.write_failed",
+            extra={
+                "context": {
+                    "rows": len(rows),
+                    "request_ids": [row.get("request_id") for row in rows[:10]],
+                    "error": type(exc).__name__,
+                }
+            },
+        )
+
+    def _write_rows_one_by_one(self, db: Session, rows: list[dict[str, Any]]) -> int:
+        """Insert ``rows`` one per transaction so a single bad row does not lose the rest.
+
+        Rows rejected for their content are skipped; any other error (the database went
+        away) fails the remaining rows at once instead of retrying each of them.
+        """
+        written = 0
+        rejected: list[dict[str, Any]] = []
+        for index, row in enumerate(rows):
+            try:
+                db.execute(insert(AuditTrail), [row])
+                db.commit()
+            except ROW_LEVEL_ERRORS:
+                db.rollback()
+                rejected.append(row)
+                continue
+            except SQLAlchemyError as exc:
+                db.rollback()
+                self._count_failed(rows[index:], exc)
+                break
+            written += 1
+        if rejected:
+            with self._lock:
+                self.failed += len(rejected)
+            logger.warning(
+                "audit.rows_rejected",
+                extra={"context": {"rows": len(rejected), "request_ids": [row.get("request_id") for row in rejected[:10]]}},
+            )
+        return written
+
+    def write_batch(self, rows: list[dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        db = self._new_session()
+        try:
+            try:
+                db.execute(insert(AuditTrail), rows)
+                db.commit()
+                written = len(rows)
+            except ROW_LEVEL_ERRORS:
+                # Some row is invalid; find it without losing the rest of the batch.
+                db.rollback()
+                written = self._write_rows_one_by_one(db, rows)
+            except SQLAlchemyError as exc:
+                # Connection-level failure: retrying row by row would only hammer the database.
+                db.rollback()
+                self._count_failed(rows, exc)
+                written = 0
+        finally:
+            db.close()
+        if written:
+            with self._lock:
+                self.written += written
+                self.batches += 1
+        return written
+
+    async def submit(self, row: dict[str, Any]) -> None:
+        if not self.running or self._queue is None:
+            # Writer is not started (e.g. app used without lifespan): keep the row, off-loop.
+            await asyncio.to_thread(self.write_batch, [row])
+            return
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            logger.warning(
+                "audit.queue_full",
+                extra={"context": {"request_id": row.get("request_id"), "dropped": dropped}},
+            )
+            return
+        with self._lock:
+            self.enqueued += 1
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task = self._task
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        self._task = None
+        if self._inflight is not None:
+            with contextlib.suppress(Exception):
+                await self._inflight
+            self._inflight = None
+        remaining, self._pending = self._pending + self._drain(), []
+        await asyncio.to_thread(self.write_batch, remaining)
+        self._queue = None
+
+    def _drain(self, limit: int | None = None) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        if self._queue is None:
+            return rows
+        while limit is None or len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return rows
+
+    async def _collect_batch(self) -> None:
+        # Rows are gathered into self._pending so a cancelled wait does not lose them.
+        assert self._queue is not None
+        self._pending.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval_seconds
+        while len(self._pending) < self.batch_size:
+            self._pending.extend(self._drain(self.batch_size - len(self._pending)))
+            remaining = deadline - loop.time()
+            if len(self._pending) >= self.batch_size or remaining <= 0:
+                break
+            try:
+                self._pending.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self) -> None:
+        while True:
+            await self._collect_batch()
+            batch, self._pending = self._pending, []
+            self._inflight = asyncio.ensure_future(asyncio.to_thread(self.write_batch, batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+
+audit_writer = AuditTrailWriter.from_settings(get_settings())
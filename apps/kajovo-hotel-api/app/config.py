@@ -9,6 +9,11 @@ class Settings(BaseSettings):
     app_version: str = "0.1.0"
     environment: str = "development"
     database_url: str = "sqlite:///./kajovo_hotel.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: int = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
     admin_email: str = Field(
         default="admin@kajovohotel.local",
         validation_alias=AliasChoices("KAJOVO_API_ADMIN_EMAIL", "HOTEL_ADMIN_EMAIL"),
@@ -17,11 +22,41 @@ class Settings(BaseSettings):
         default="admin123",
         validation_alias=AliasChoices("KAJOVO_API_ADMIN_PASSWORD", "HOTEL_ADMIN_PASSWORD"),
     )
+    password_scrypt_n: int = 2**14
+    password_scrypt_r: int = 8
+    password_scrypt_p: int = 1
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 4
+    auth_reaper_enabled: bool = True
+    auth_reaper_interval_seconds: int = 3600
+    auth_reaper_retention_seconds: int = 7 * 86400
+    auth_reaper_batch_size: int = 500
+    audit_queue_max_size: int = 10000
+    audit_batch_size: int = 200
+    audit_flush_interval_seconds: float = 1.0
+    audit_body_capture_bytes: int = 16384
     smtp_enabled: bool = False
     smtp_from_email: str = "noreply@kajovohotel.local"
     smtp_encryption_key: str = "dev-only-smtp-key-change-in-production"
     smtp_capture_path: str = ""
+    smtp_config_cache_ttl_seconds: float = 30.0
     media_root: str = "/app/data/media"
+    media_upload_max_file_bytes: int = 20 * 1024 * 1024
+    upload_max_request_bytes: int = 64 * 1024 * 1024
+    media_thumbnail_workers: int = 2
+    media_thumbnail_format: str = "webp"
+    media_thumbnail_quality: int = 80
+    media_gc_enabled: bool = True
+    media_gc_interval_seconds: int = 3600
+    media_gc_grace_seconds: int = 86400
+    media_accel_redirect_prefix: str = ""
+    pdf_font_path: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+    inventory_ledger_scheduler_enabled: bool = True
+    inventory_ledger_interval_seconds: int = 3600
+    breakfast_summary_cache_ttl_seconds: float = 5.0
+    breakfast_stream_heartbeat_seconds: float = 15.0
+    breakfast_import_process_workers: int = 2
+    breakfast_import_job_retention_seconds: int = 3600
     breakfast_scheduler_enabled: bool = False
     breakfast_scheduler_interval_seconds: int = 300
     breakfast_scheduler_retry_seconds: int = 30
@@ -60,9 +95,13 @@ class Settings(BaseSettings):
         ]
     )
     session_max_age_seconds: int = 3600
+    session_cache_ttl_seconds: int = 30
+    session_last_seen_interval_seconds: int = 60
     session_remember_me_max_age_seconds: int = 2592000
     device_token_pepper: str = ""
     device_challenge_max_age_seconds: int = 300
+    device_token_cache_ttl_seconds: int = 30
+    device_last_seen_interval_seconds: int = 60
     content_security_policy: str = (
         "default-src 'self'; "
         "img-src 'self' data:; "
@@ -10,7 +10,7 @@ except ImportError:  # pragma: no cover
         pass
 
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -75,6 +75,20 @@ class BreakfastOrder(Base):
     )
 
 
+class BreakfastMailSyncState(Base):
+    __tablename__ = "breakfast_mail_sync_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    mailbox: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+    uid_validity: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_seen_uid: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
 class LostFoundItemType(StrEnum):
     LOST = "lost"
     FOUND = "found"
@@ -236,6 +250,11 @@ class InventoryItem(Base):
         cascade="all, delete-orphan",
         order_by="InventoryCardItem.id.asc()",
     )
+    stock_snapshots: Mapped[list["InventoryStockSnapshot"]] = relationship(
+        "InventoryStockSnapshot",
+        cascade="all, delete-orphan",
+        order_by="InventoryStockSnapshot.snapshot_date.asc()",
+    )
 
 
 class InventoryCard(Base):
@@ -333,6 +352,19 @@ class InventoryMovement(Base):
     card_item: Mapped["InventoryCardItem | None"] = relationship("InventoryCardItem", back_populates="movements")
 
 
+class InventoryStockSnapshot(Base):
+    """Stock of an item at the end of ``snapshot_date`` (movements dated on or before it)."""
+
+    __tablename__ = "inventory_stock_snapshots"
+
+    item_id: Mapped[int] = mapped_column(
+        ForeignKey("inventory_items.id", ondelete="CASCADE"), primary_key=True
+    )
+    snapshot_date: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    stock: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class IssuePhoto(Base):
     __tablename__ = "issue_photos"
 
@@ -390,6 +422,33 @@ class LostFoundPhoto(Base):
     item: Mapped[LostFoundItem] = relationship(back_populates="photos")
 
 
+class MediaBlob(Base):
+    """A stored file, named by the SHA-256 of its content and shared by every row that uses it.
+
+    ``ref_count`` counts the photo rows and pictograms pointing at ``file_path``; blobs
+    released to zero are removed by the media garbage collector after a grace period.
+    """
+
+    __tablename__ = "media_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    file_path: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    released_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+
+
+class InventoryDocumentSequence(Base):
+    """Last issued ``PREFIX-YEAR-NNNN`` document number per prefix and year."""
+
+    __tablename__ = "inventory_document_sequences"
+
+    prefix: Mapped[str] = mapped_column(String(8), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class InventoryAuditLog(Base):
     __tablename__ = "inventory_audit_logs"
 
@@ -618,5 +677,5 @@ class AuthUnlockToken(Base):
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, index=True
     )
-    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,14 +1,35 @@
 from collections.abc import Generator
+from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 from app.db.models import Base
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "future": True,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if make_url(settings.database_url).get_backend_name() == "sqlite":
+        # SQLite picks its own pool class (SingletonThreadPool for :memory:),
+        # which does not accept the QueuePool sizing arguments.
+        return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    return options
+
+
+engine = create_engine(settings.database_url, **engine_options(settings))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=Session)
 
 
@@ -16,6 +37,27 @@ def initialize_database() -> None:
     Base.metadata.create_all(bind=engine)
 
 
+def pool_status() -> dict[str, int | str | None]:
+    pool = engine.pool
+
+    def _metric(name: str) -> int | None:
+        method = getattr(pool, name, None)
+        if method is None:
+            return None
+        try:
+            return int(method())
+        except (TypeError, ValueError):
+            return None
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": _metric("size"),
+        "checked_in": _metric("checkedin"),
+        "checked_out": _metric("checkedout"),
+        "overflow": _metric("overflow"),
+    }
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
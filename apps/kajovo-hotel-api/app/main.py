@@ -7,6 +7,7 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from app.android_release import get_android_release_manifest
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.routes.app_meta import router as app_meta_router
 from app.api.routes.auth import router as auth_router
 from app.api.routes.breakfast import router as breakfast_router
@@ -19,12 +20,20 @@ from app.api.routes.profile import router as profile_router
 from app.api.routes.reports import router as reports_router
 from app.api.routes.settings import router as settings_router
 from app.api.routes.users import router as users_router
+from app.audit_writer import audit_writer
 from app.config import get_settings
 from app.db.session import SessionLocal, initialize_database
+from app.media.scheduler import media_gc_loop
+from app.media.thumbnails import thumbnail_pipeline
 from app.observability import RequestContextMiddleware, configure_logging
+from app.request_limits import RequestBodyLimitMiddleware
 from app.security.auth import ensure_csrf
+from app.security.passwords import password_hasher
 from app.services.admin_credentials import ensure_admin_profile
+from app.services.auth_reaper import auth_reaper_loop
+from app.services.breakfast.import_jobs import breakfast_import_jobs
 from app.services.breakfast.scheduler import breakfast_scheduler_loop
+from app.services.inventory.scheduler import inventory_ledger_loop
 
 settings = get_settings()
 
@@ -32,7 +41,8 @@ settings = get_settings()
 def create_app() -> FastAPI:
     configure_logging()
     app = FastAPI(title=settings.app_name, version=settings.app_version)
-    app.add_middleware(RequestContextMiddleware)
+    app.add_middleware(RequestBodyLimitMiddleware, max_bytes=settings.upload_max_request_bytes)
+    app.add_middleware(RequestContextMiddleware, max_body_capture_bytes=settings.audit_body_capture_bytes)
 
     if settings.trusted_hosts:
         app.add_middleware(
@@ -47,6 +57,7 @@ def create_app() -> FastAPI:
             allow_credentials=True,
             allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
             allow_headers=["*"],
+            expose_headers=[NEXT_CURSOR_HEADER],
         )
 
     @app.middleware("http")
@@ -88,16 +99,33 @@ def create_app() -> FastAPI:
         initialize_database()
         with SessionLocal() as db:
             ensure_admin_profile(db, settings, sync_from_env=True)
+        audit_writer.start()
         if settings.breakfast_scheduler_enabled:
             app.state.breakfast_scheduler_task = asyncio.create_task(breakfast_scheduler_loop())
+        if settings.auth_reaper_enabled:
+            app.state.auth_reaper_task = asyncio.create_task(auth_reaper_loop())
+        if settings.inventory_ledger_scheduler_enabled:
+            app.state.inventory_ledger_task = asyncio.create_task(inventory_ledger_loop())
+        if settings.media_gc_enabled:
+            app.state.media_gc_task = asyncio.create_task(media_gc_loop())
 
     @app.on_event("shutdown")
     async def shutdown_scheduler() -> None:
-        task = getattr(app.state, "breakfast_scheduler_task", None)
-        if task is not None:
-            task.cancel()
-            with contextlib.suppress(Exception):
-                await task
+        for name in (
+            "breakfast_scheduler_task",
+            "auth_reaper_task",
+            "inventory_ledger_task",
+            "media_gc_task",
+        ):
+            task = getattr(app.state, name, None)
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(Exception, asyncio.CancelledError):
+                    await task
+        await asyncio.to_thread(breakfast_import_jobs.shutdown)
+        await asyncio.to_thread(thumbnail_pipeline.shutdown)
+        await asyncio.to_thread(password_hasher.shutdown)
+        await audit_writer.stop()
 
     return app
 
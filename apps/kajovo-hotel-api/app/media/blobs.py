@@ -0,0 +1,239 @@
+"""Reference counting and garbage collection for content-addressed media blobs.
+
+Upload routes call ``retain_blob`` for every row that starts pointing at a blob and
+``release_blobs`` before rows (or pictograms) stop pointing at one, in the same
+transaction. ``collect_media_garbage`` first recounts references from the tables
+themselves, so a missed release only delays collection, then deletes blobs that have
+been unreferenced for longer than the grace period, plus stray files in the blob
+directory that no row knows about (uploads whose transaction never committed).
+
+The collector unlinks a blob's files before committing the DELETE of its row, so the
+row lock is held while the files go away. ``retain_blob`` takes the same lock before
+it publishes the staged upload, so an upload of the same content either waits for the
+collector and writes the file back, or retains the row first and the collector skips it.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models import InventoryItem, IssuePhoto, LostFoundPhoto, MediaBlob, ReportPhoto
+from app.media.storage import BLOB_DIR, INCOMING_DIR, MediaStorage, StoredMedia
+from app.time_utils import utc_now
+
+log = logging.getLogger("kajovo.media.blobs")
+
+
+@dataclass(frozen=True)
+class MediaGcResult:
+    recounted_blobs: int
+    deleted_blobs: int
+    deleted_files: int
+    freed_bytes: int
+
+
+def _retain_row(db: Session, stored: StoredMedia) -> None:
+    retain = (
+        update(MediaBlob)
+        .where(MediaBlob.sha256 == stored.sha256)
+        .values(ref_count=MediaBlob.ref_count + 1, released_at=None)
+    )
+    if db.execute(retain).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(
+                insert(MediaBlob).values(
+                    sha256=stored.sha256,
+                    file_path=stored.original_relpath,
+                    size_bytes=stored.bytes,
+                    ref_count=1,
+                )
+            )
+    except IntegrityError:
+        # A concurrent upload of the same content registered the blob first.
+        db.execute(retain)
+
+
+def retain_blob(db: Session, stored: StoredMedia, storage: MediaStorage) -> None:
+    """Count one more reference to the blob of ``stored`` (registering it if new).
+
+    The staged upload is published only once the row is locked by this transaction, so
+    a collector that deleted the blob meanwhile cannot unlink the file afterwards.
+    """
+    _retain_row(db, stored)
+    storage.publish(stored)
+
+
+def release_blobs(db: Session, file_paths: Iterable[str | None]) -> None:
+    """Drop one reference per path; paths outside the blob store are ignored."""
+    counts = Counter(path for path in file_paths if path and path.startswith(f"{BLOB_DIR}/"))
+    if not counts:
+        return
+    paths = list(counts)
+    db.execute(
+        update(MediaBlob)
+        .where(MediaBlob.file_path.in_(paths))
+        .values(ref_count=MediaBlob.ref_count - case(counts, value=MediaBlob.file_path, else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(MediaBlob)
+        .where(MediaBlob.file_path.in_(paths), MediaBlob.ref_count <= 0, MediaBlob.released_at.is_(None))
+        .values(released_at=utc_now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _references():
+    refs = union_all(
+        select(IssuePhoto.file_path.label("file_path")),
+        select(ReportPhoto.file_path),
+        select(LostFoundPhoto.file_path),
+        select(InventoryItem.pictogram_path).where(InventoryItem.pictogram_path.is_not(None)),
+    ).subquery()
+    return (
+        select(refs.c.file_path, func.count().label("refs"))
+        .where(refs.c.file_path.like(f"{BLOB_DIR}/%"))
+        .group_by(refs.c.file_path)
+        .subquery()
+    )
+
+
+def recount_blob_references(db: Session) -> int:
+    """Set every ``ref_count`` to the number of rows actually using the blob."""
+    refs = _references()
+    actual = func.coalesce(refs.c.refs, literal(0))
+    rows = db.execute(
+        select(MediaBlob.sha256, MediaBlob.ref_count, actual.label("actual"))
+        .outerjoin(refs, refs.c.file_path == MediaBlob.file_path)
+        .where(MediaBlob.ref_count != actual)
+    ).all()
+    now = utc_now()
+    for row in rows:
+        released_at = (
+            case((MediaBlob.released_at.is_(None), now), else_=MediaBlob.released_at) if row.actual == 0 else None
+        )
+        log.warning(
+            "media.blob_refcount_drift",
+            extra={"context": {"sha256": row.sha256, "ref_count": row.ref_count, "actual": row.actual}},
+        )
+        db.execute(
+            update(MediaBlob)
+            .where(MediaBlob.sha256 == row.sha256)
+            .values(ref_count=row.actual, released_at=released_at)
+        )
+    db.commit()
+    return len(rows)
+
+
+def _sweep_stale(path: Path, trash_dir: Path, file_cutoff: float) -> int | None:
+    """Remove a stray ``path`` last written before ``file_cutoff``; return its size.
+
+    The file is first moved aside, so an upload published to the same path after the
+    age check is put back instead of being deleted.
+    """
+    trash = trash_dir / f".gc-{uuid.uuid4().hex}"
+    try:
+        os.replace(path, trash)
+    except FileNotFoundError:
+        return None
+    stat_result = trash.stat()
+    if stat_result.st_mtime >= file_cutoff:
+        try:
+            os.link(trash, path)
+        except FileExistsError:
+            pass
+        trash.unlink()
+        return None
+    trash.unlink()
+    return stat_result.st_size
+
+
+def _unlink(path: Path) -> int | None:
+    """Remove ``path`` and return its size, or None when it was already gone."""
+    try:
+        size = path.stat().st_size
+        path.unlink()
+    except FileNotFoundError:
+        return None
+    return size
+
+
+def collect_media_garbage(
+    db: Session,
+    storage: MediaStorage,
+    *,
+    grace: timedelta,
+    now: datetime | None = None,
+) -> MediaGcResult:
+    now = now or utc_now()
+    cutoff = now - grace
+    recounted = recount_blob_references(db)
+
+    deleted_blobs = deleted_files = freed = 0
+    candidates = db.scalars(
+        select(MediaBlob).where(MediaBlob.ref_count <= 0, MediaBlob.released_at < cutoff)
+    ).all()
+    for blob in candidates:
+        sha256, file_path = blob.sha256, blob.file_path
+        # Re-check in the DELETE itself: an upload may have retained the blob meanwhile.
+        # The row stays locked until the commit below, so the files are unlinked before
+        # a concurrent retain of the same content can publish them again.
+        try:
+            removed = db.execute(
+                delete(MediaBlob).where(MediaBlob.sha256 == sha256, MediaBlob.ref_count <= 0)
+            ).rowcount
+            if removed:
+                original = storage.resolve(file_path)
+                for path in [original, *original.parent.glob(f"{sha256}_*")]:
+                    size = _unlink(path)
+                    if size is not None:
+                        deleted_files += 1
+                        freed += size
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        deleted_blobs += removed
+
+    known = set(db.scalars(select(MediaBlob.sha256)))
+    blob_root = storage.root / BLOB_DIR
+    trash_dir = blob_root / INCOMING_DIR
+    trash_dir.mkdir(parents=True, exist_ok=True)
+    file_cutoff = cutoff.timestamp()
+    for dirpath, _dirnames, filenames in os.walk(blob_root):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            sha256 = filename.split(".", 1)[0].split("_", 1)[0]
+            if sha256 in known and not filename.startswith("."):
+                continue
+            try:
+                if path.stat().st_mtime >= file_cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            size = _sweep_stale(path, trash_dir, file_cutoff)
+            if size is not None:
+                deleted_files += 1
+                freed += size
+
+    result = MediaGcResult(
+        recounted_blobs=recounted,
+        deleted_blobs=deleted_blobs,
+        deleted_files=deleted_files,
+        freed_bytes=freed,
+    )
+    log.info("media.gc_completed", extra={"context": {**result.__dict__}})
+    return result
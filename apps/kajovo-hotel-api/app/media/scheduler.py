@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.media.blobs import MediaGcResult, collect_media_garbage
+from app.media.storage import media_storage
+
+log = logging.getLogger("kajovo.media.blobs")
+
+
+def run_media_gc_iteration() -> MediaGcResult:
+    settings = get_settings()
+    with SessionLocal() as db:
+        return collect_media_garbage(
+            db,
+            media_storage(settings.media_root),
+            grace=timedelta(seconds=max(0, settings.media_gc_grace_seconds)),
+        )
+
+
+async def media_gc_loop() -> None:
+    interval = max(60, int(get_settings().media_gc_interval_seconds))
+    while True:
+        try:
+            await asyncio.to_thread(run_media_gc_iteration)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Media garbage collection failed")
+        await asyncio.sleep(interval)
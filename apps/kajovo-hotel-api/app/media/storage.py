@@ -1,32 +1,51 @@
 from __future__ import annotations
 
-import io
-import shutil
-import uuid
-from dataclasses import dataclass
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import BinaryIO
 
-try:
-    from PIL import Image
-except Exception:  # pragma: no cover
-    Image = None
+from app.media.thumbnails import THUMB_RENDITION, ThumbnailPipeline, thumbnail_pipeline
+
+COPY_CHUNK_SIZE = 1024 * 1024
+BLOB_DIR = 'blobs'
+INCOMING_DIR = '.incoming'
 
 
 class MediaStorageError(RuntimeError):
     pass
 
 
+class MediaTooLargeError(MediaStorageError):
+    pass
+
+
 @dataclass(frozen=True)
 class StoredMedia:
     original_relpath: str
     thumb_relpath: str
     bytes: int
+    sha256: str
+    # Upload written by ``store_image`` and not yet moved to ``original_relpath``.
+    staged_path: Path | None = field(default=None, compare=False, repr=False)
+
+
+def _sniff_extension(head: bytes) -> str:
+    """File extension from the content, so equal bytes always map to the same blob path."""
+    if head.startswith(b'\x89PNG'):
+        return '.png'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    return '.jpg'
 
 
 class MediaStorage:
-    def __init__(self, media_root: str):
+    def __init__(self, media_root: str, thumbnails: ThumbnailPipeline | None = None):
         self.root = Path(media_root).resolve()
+        self.thumbnails = thumbnails or thumbnail_pipeline
         self.root.mkdir(parents=True, exist_ok=True)
 
     def _safe_rel(self, relpath: str) -> Path:
@@ -41,60 +60,78 @@ class MediaStorage:
     def resolve(self, relpath: str) -> Path:
         return self._safe_rel(relpath)
 
-    def store_image(
-        self,
-        *,
-        category: str,
-        resource_id: int,
-        src_file: BinaryIO,
-        src_filename: str,
-    ) -> StoredMedia:
-        ext = Path(src_filename or '').suffix.lower()
-        if ext not in {'.jpg', '.jpeg', '.png', '.webp'}:
-            ext = '.jpg'
-
-        token = uuid.uuid4().hex
-        base_rel = Path(category) / str(resource_id)
-        orig_rel = str((base_rel / f'{token}{ext}').as_posix())
-        thumb_rel = str((base_rel / f'{token}_thumb.jpg').as_posix())
-
-        orig_path = self._safe_rel(orig_rel)
-        thumb_path = self._safe_rel(thumb_rel)
-        orig_path.parent.mkdir(parents=True, exist_ok=True)
-        thumb_path.parent.mkdir(parents=True, exist_ok=True)
-
+    def blob_relpath(self, sha256: str, ext: str) -> str:
+        return f'{BLOB_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}'
+
+    def store_image(self, *, src_file: BinaryIO, max_bytes: int | None = None) -> StoredMedia:
+        """Stage an upload under the SHA-256 of its content.
+
+        The upload is hashed while it is streamed to a temporary file. ``publish`` then
+        atomically replaces the blob path with it, once the blob row has been retained
+        (see ``app.media.blobs.retain_blob``). Identical uploads therefore land on the
+        same file (rewriting it also repairs a damaged copy). ``max_bytes`` is checked
+        while copying, so an oversized upload never reaches the blob store. The multipart
+        parser has already spooled the whole part by then; only the request body limit
+        (``RequestBodyLimitMiddleware``) bounds that.
+        """
+        incoming = self.root / BLOB_DIR / INCOMING_DIR
+        incoming.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        head = b''
+        size = 0
         src_file.seek(0)
-        data = src_file.read()
-        if not data:
+        with tempfile.NamedTemporaryFile(dir=incoming, delete=False) as fh:
+            tmp_path = Path(fh.name)
+            try:
+                while chunk := src_file.read(COPY_CHUNK_SIZE):
+                    if not head:
+                        head = chunk[:16]
+                    digest.update(chunk)
+                    fh.write(chunk)
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise MediaTooLargeError('File too large')
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+        if not size:
+            tmp_path.unlink(missing_ok=True)
             raise MediaStorageError('Empty file')
 
-        with orig_path.open('wb') as fh:
-            fh.write(data)
-
-        # Thumbnail: prefer PIL. If unavailable, keep a safe copy fallback.
-        try:
-            if Image is not None:
-                with Image.open(io.BytesIO(data)) as img:
-                    work = img.convert('RGB')
-                    work.thumbnail((480, 480))
-                    work.save(thumb_path, format='JPEG', quality=82)
-            else:
-                shutil.copyfile(orig_path, thumb_path)
-        except Exception:
-            shutil.copyfile(orig_path, thumb_path)
-
+        sha256 = digest.hexdigest()
+        orig_rel = self.blob_relpath(sha256, _sniff_extension(head))
         return StoredMedia(
             original_relpath=orig_rel,
-            thumb_relpath=thumb_rel,
-            bytes=len(data),
+            thumb_relpath=self.thumbnails.rendition_paths(orig_rel)[THUMB_RENDITION],
+            bytes=size,
+            sha256=sha256,
+            staged_path=tmp_path,
         )
 
-
-class InventoryMediaStorage(MediaStorage):
-    def store_pictogram(self, *, ingredient_id: int, src_file: BinaryIO, src_filename: str) -> StoredMedia:
-        return self.store_image(
-            category='inventory/ingredients',
-            resource_id=ingredient_id,
-            src_file=src_file,
-            src_filename=src_filename,
-        )
+    def publish(self, stored: StoredMedia) -> None:
+        """Move a staged upload to its blob path and queue renditions it does not have yet."""
+        if stored.staged_path is None:
+            return
+        orig_path = self._safe_rel(stored.original_relpath)
+        orig_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(stored.staged_path, orig_path)
+        except FileNotFoundError:
+            # Already published (the same upload retained twice).
+            if not orig_path.exists():
+                raise
+            return
+
+        rendition_rels = self.thumbnails.rendition_paths(stored.original_relpath)
+        if not self._safe_rel(rendition_rels[THUMB_RENDITION]).exists():
+            # Renditions are rendered off-request; the original is served until they exist.
+            self.thumbnails.submit(
+                orig_path,
+                {name: self._safe_rel(rel) for name, rel in rendition_rels.items()},
+            )
+
+
+@lru_cache(maxsize=4)
+def media_storage(media_root: str) -> MediaStorage:
+    """Shared storage per media root, so requests do not re-create the directory."""
+    return MediaStorage(media_root)
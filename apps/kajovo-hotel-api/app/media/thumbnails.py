@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from app.config import Settings, get_settings
+
+try:
+    from PIL import Image, ImageOps, features
+except Exception:  # pragma: no cover
+    Image = None
+
+log = logging.getLogger("kajovo.media.thumbnails")
+
+# Longest edge in pixels: admin/app lists, detail views, full-screen viewer.
+RENDITIONS: dict[str, int] = {"list": 320, "detail": 1024, "full": 2048}
+THUMB_RENDITION = "list"
+FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+
+
+def rendition_relpath(original_relpath: str, rendition: str, extension: str) -> str:
+    path = PurePosixPath(original_relpath)
+    return str(path.with_name(f"{path.stem}_{rendition}.{extension}"))
+
+
+def sibling_rendition(thumb_relpath: str, rendition: str) -> str | None:
+    """Path of another rendition next to a stored list thumbnail (None for legacy thumbs)."""
+    path = PurePosixPath(thumb_relpath)
+    suffix = f"_{THUMB_RENDITION}"
+    if not path.stem.endswith(suffix):
+        return None
+    return str(path.with_name(f"{path.stem[: -len(suffix)]}_{rendition}{path.suffix}"))
+
+
+def render_renditions(source: Path, targets: dict[str, Path], image_format: str, quality: int) -> None:
+    """Decode ``source`` once and write every rendition in ``targets`` (largest first)."""
+    if Image is None:
+        raise RuntimeError("Pillow is not installed")
+    with Image.open(source) as img:
+        largest = max(RENDITIONS[name] for name in targets)
+        # JPEG can decode at a reduced scale, which is much cheaper for large photos.
+        img.draft("RGB", (largest, largest))
+        work = ImageOps.exif_transpose(img)
+        work = work.convert("RGBA" if "A" in work.getbands() else "RGB")
+        for name in sorted(targets, key=RENDITIONS.__getitem__, reverse=True):
+            size = RENDITIONS[name]
+            work.thumbnail((size, size), Image.Resampling.LANCZOS)
+            target = targets[name]
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+            work.save(partial, format=FORMATS[image_format], quality=quality)
+            os.replace(partial, target)
+
+
+class ThumbnailPipeline:
+    """Renders image renditions on a small thread pool, off the request path.
+
+    Pillow releases the GIL while decoding and resampling, so threads parallelise well
+    here. Until a rendition exists the media endpoints serve the original.
+    """
+
+    def __init__(self, *, workers: int = 2, image_format: str = "webp", quality: int = 80) -> None:
+        self.workers = max(1, int(workers))
+        self.image_format = self._supported_format(image_format)
+        self.quality = max(1, min(100, int(quality)))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> ThumbnailPipeline:
+        return cls(
+            workers=settings.media_thumbnail_workers,
+            image_format=settings.media_thumbnail_format,
+            quality=settings.media_thumbnail_quality,
+        )
+
+    @staticmethod
+    def _supported_format(image_format: str) -> str:
+        image_format = image_format.strip().lower()
+        if image_format not in FORMATS:
+            raise ValueError(f"Unsupported thumbnail format: {image_format}")
+        if Image is not None and not features.check(image_format):
+            log.warning("media.thumbnail_format_unavailable", extra={"context": {"format": image_format}})
+            return "webp"
+        return image_format
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def rendition_paths(self, original_relpath: str) -> dict[str, str]:
+        return {name: rendition_relpath(original_relpath, name, self.image_format) for name in RENDITIONS}
+
+    def submit(self, source: Path, targets: dict[str, Path]) -> Future[None]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="media-thumbs")
+            self._pending += 1
+            return self._executor.submit(self._render, source, targets)
+
+    def _render(self, source: Path, targets: dict[str, Path]) -> None:
+        try:
+            render_renditions(source, targets, self.image_format, self.quality)
+        except Exception as exc:
+            # Not an image Pillow can read: the original keeps being served instead.
+            log.warning(
+                "media.thumbnail_failed",
+                extra={"context": {"source": source.name, "error": str(exc)}},
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+thumbnail_pipeline = ThumbnailPipeline.from_settings(get_settings())
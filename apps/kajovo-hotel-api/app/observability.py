@@ -5,13 +5,12 @@ import uuid
 from typing import Any
 
 from fastapi import HTTPException, Request
-from sqlalchemy.exc import SQLAlchemyError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.audit_utils import sanitize_for_audit
-from app.db.models import AuditTrail
-from app.db.session import SessionLocal
-from app.security.rbac import parse_identity, role_for_audit
+from app.audit_writer import audit_writer
+from app.security.rbac import resolve_identity, role_for_audit
 from app.time_utils import utc_now
 
 logger = logging.getLogger("kajovo.api")
@@ -62,10 +61,14 @@ def _module_from_path(path: str) -> str:
     return "system"
 
 
-def _should_audit(request: Request, status_code: int) -> bool:
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+AUDIT_DETAIL_MAX_CHARS = 2000
+
+
+def _should_audit(method: str, path: str, status_code: int) -> bool:
     return (
-        request.method in {"POST", "PUT", "PATCH", "DELETE"}
-        and (request.url.path.startswith("/api/v1/") or request.url.path in AUTH_AUDIT_PATHS)
+        method in WRITE_METHODS
+        and (path.startswith("/api/v1/") or path in AUTH_AUDIT_PATHS)
         and status_code < 500
     )
 
@@ -77,35 +80,106 @@ def _audit_detail(request: Request, default: str | None) -> str | None:
     return getattr(request.state, "audit_detail_override", default)
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):  # type: ignore[override]
+def _is_json_content_type(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+def _audit_body(body: bytes, truncated: bool) -> str | None:
+    if not body:
+        return None
+    raw_body = body.decode("utf-8", errors="ignore")
+    try:
+        parsed = json.loads(raw_body)
+    except json.JSONDecodeError:
+        # A cut-off document cannot be sanitized, so it is not stored at all.
+        return None if truncated else raw_body[:AUDIT_DETAIL_MAX_CHARS]
+    return json.dumps(sanitize_for_audit(parsed), ensure_ascii=False)[:AUDIT_DETAIL_MAX_CHARS]
+
+
+class _BodyTee:
+    """Wraps ASGI ``receive`` and keeps a copy of the first ``limit`` body bytes."""
+
+    def __init__(self, receive: Receive, limit: int) -> None:
+        self._receive = receive
+        self._limit = limit
+        self._chunks: list[bytes] = []
+        self._captured = 0
+        self.truncated = False
+
+    async def __call__(self) -> Message:
+        message = await self._receive()
+        if message["type"] == "http.request":
+            chunk = message.get("body", b"")
+            room = self._limit - self._captured
+            if len(chunk) > room:
+                self.truncated = True
+            if room > 0 and chunk:
+                self._chunks.append(chunk[:room])
+                self._captured += min(len(chunk), room)
+        return message
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware: request ids, access log and audit capture.
+
+    Request bodies are never buffered. Only JSON bodies of write requests are
+    teed (up to ``max_body_capture_bytes``) for the audit detail; multipart
+    uploads and other payloads stream straight through to the route.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_capture_bytes: int = 16384) -> None:
+        self.app = app
+        self.max_body_capture_bytes = max(0, int(max_body_capture_bytes))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start = time.perf_counter()
+        request = Request(scope)
+        method = request.method
+        path = request.url.path
         request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
-        module = _module_from_path(request.url.path)
+        module = _module_from_path(path)
+        request.state.request_id = request_id
         try:
-            actor_id, actor_name, actor_role = parse_identity(request)
+            identity = resolve_identity(request)
+            actor_id, actor_name, actor_role = identity.actor_id, identity.actor_name, identity.role
         except HTTPException:
             actor_id, actor_name, actor_role = "", "", "unauthenticated"
+            request.state.actor_id = actor_id
+            request.state.actor_role = actor_role
         actor_role_audit = role_for_audit(actor_role)
-        request.state.request_id = request_id
         request.state.actor = actor_name
-        request.state.actor_id = actor_id
-        request.state.actor_role = actor_role
-
-        request_body: str | None = None
-        if request.method in {"POST", "PUT", "PATCH", "DELETE"}:
-            body_bytes = await request.body()
-            if body_bytes:
-                raw_body = body_bytes.decode("utf-8", errors="ignore")
-                try:
-                    parsed = json.loads(raw_body)
-                    request_body = json.dumps(sanitize_for_audit(parsed), ensure_ascii=False)[:2000]
-                except json.JSONDecodeError:
-                    request_body = raw_body[:2000]
-
-        response = await call_next(request)
+
+        tee: _BodyTee | None = None
+        if (
+            method in WRITE_METHODS
+            and self.max_body_capture_bytes > 0
+            and _is_json_content_type(request.headers.get("content-type"))
+        ):
+            tee = _BodyTee(receive, self.max_body_capture_bytes)
+            receive = tee
+
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["x-request-id"] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
         latency_ms = round((time.perf_counter() - start) * 1000, 2)
-        response.headers["x-request-id"] = request_id
 
         log_context = {
             "request_id": request_id,
@@ -113,37 +187,26 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             "user_id": actor_id,
             "role": actor_role_audit,
             "module": module,
-            "method": request.method,
-            "path": request.url.path,
-            "status": response.status_code,
+            "method": method,
+            "path": path,
+            "status": status_code,
             "latency_ms": latency_ms,
         }
         logger.info("request.completed", extra={"context": log_context})
 
-        if _should_audit(request, response.status_code):
-            db = SessionLocal()
-            try:
-                db.add(
-                    AuditTrail(
-                        request_id=request_id,
-                        actor=actor_name,
-                        actor_id=actor_id,
-                        actor_role=actor_role_audit,
-                        module=module,
-                        action=request.method,
-                        resource=request.url.path,
-                        status_code=response.status_code,
-                        detail=_audit_detail(request, request_body),
-                    )
-                )
-                db.commit()
-            except SQLAlchemyError:
-                db.rollback()
-                logger.exception(
-                    "audit.write_failed",
-                    extra={"context": {"request_id": request_id, "module": module}},
-                )
-            finally:
-                db.close()
-
-        return response
+        if _should_audit(method, path, status_code):
+            request_body = _audit_body(tee.body, tee.truncated) if tee is not None else None
+            await audit_writer.submit(
+                {
+                    "request_id": request_id,
+                    "actor": actor_name,
+                    "actor_id": actor_id,
+                    "actor_role": actor_role_audit,
+                    "module": module,
+                    "action": method,
+                    "resource": path,
+                    "status_code": status_code,
+                    "detail": _audit_detail(request, request_body),
+                    "created_at": utc_now(),
+                }
+            )
@@ -4,10 +4,14 @@ import hmac
 import json
 import os
 import secrets
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, Request, status
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
@@ -22,6 +26,8 @@ CSRF_HEADER_NAME = "x-csrf-token"
 WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 SESSION_STATE_KEY = "_kajovo_auth_session"
 
+SerializedSession = dict[str, str | list[str] | int | None]
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -88,7 +94,7 @@ def read_session_cookie(cookie_value: str | None) -> dict[str, str] | None:
     return {"session_id": session_id}
 
 
-def _serialize_session(record: AuthSession) -> dict[str, str | list[str] | int | None]:
+def _serialize_session(record: AuthSession) -> SerializedSession:
     return {
         "session_id": record.session_id,
         "email": record.principal,
@@ -100,6 +106,115 @@ def _serialize_session(record: AuthSession) -> dict[str, str | list[str] | int |
     }
 
 
+@dataclass
+class _CachedSession:
+    session: SerializedSession
+    expires_at: datetime
+    cached_until: datetime
+    last_seen_at: datetime
+
+
+class SessionCache:
+    """Per-process TTL cache of validated sessions keyed by session id.
+
+    Invalidation drops matching entries and keeps them out of the cache for one TTL
+    window, so a request racing the revoking transaction cannot re-cache a stale row.
+    Changes made by other workers become visible once ``ttl_seconds`` elapses.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self._entries: dict[str, _CachedSession] = {}
+        self._blocked: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def _block(self, key: tuple[str, str]) -> None:
+        self._blocked[key] = time.monotonic() + self.ttl_seconds
+
+    def _is_blocked(self, session: SerializedSession) -> bool:
+        keys = (
+            ("sid", str(session.get("session_id"))),
+            ("user", str(session.get("portal_user_id"))),
+            ("principal", f"{session.get('actor_type')}:{session.get('email')}"),
+        )
+        now = time.monotonic()
+        for key, until in list(self._blocked.items()):
+            if until <= now:
+                del self._blocked[key]
+        return any(key in self._blocked for key in keys)
+
+    def get(self, session_id: str, now: datetime) -> _CachedSession | None:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            if entry.cached_until <= now or entry.expires_at <= now:
+                del self._entries[session_id]
+                return None
+            return entry
+
+    def put(self, session: SerializedSession, *, expires_at: datetime, last_seen_at: datetime, now: datetime) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry = _CachedSession(
+            session=session,
+            expires_at=expires_at,
+            cached_until=now + timedelta(seconds=self.ttl_seconds),
+            last_seen_at=last_seen_at,
+        )
+        with self._lock:
+            if self._is_blocked(session):
+                return
+            self._entries[str(session["session_id"])] = entry
+
+    def _invalidate_where(self, key: tuple[str, str], matches: Callable[[SerializedSession], bool]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._block(key)
+            for session_id in [sid for sid, entry in self._entries.items() if matches(entry.session)]:
+                del self._entries[session_id]
+
+    def invalidate(self, session_id: str) -> None:
+        self._invalidate_where(("sid", session_id), lambda session: session.get("session_id") == session_id)
+
+    def invalidate_portal_user(self, portal_user_id: int) -> None:
+        self._invalidate_where(
+            ("user", str(portal_user_id)),
+            lambda session: session.get("portal_user_id") == portal_user_id,
+        )
+
+    def invalidate_principal(self, actor_type: str, principal: str) -> None:
+        self._invalidate_where(
+            ("principal", f"{actor_type}:{principal}"),
+            lambda session: session.get("actor_type") == actor_type and session.get("email") == principal,
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._blocked.clear()
+
+
+session_cache = SessionCache(get_settings().session_cache_ttl_seconds)
+
+
+def forget_cached_sessions_for_portal_user(user_id: int) -> None:
+    session_cache.invalidate_portal_user(user_id)
+
+
+def _copy_session(session: SerializedSession) -> SerializedSession:
+    roles = session.get("roles")
+    return {**session, "roles": list(roles) if isinstance(roles, list) else roles}
+
+
+def _last_seen_due(last_seen_at: datetime | None, now: datetime) -> bool:
+    if last_seen_at is None:
+        return True
+    interval = timedelta(seconds=get_settings().session_last_seen_interval_seconds)
+    return now - last_seen_at >= interval
+
+
 def _revoke_session_record(db: Session, record: AuthSession, *, now: datetime | None = None) -> None:
     if record.revoked_at is not None:
         return
@@ -134,18 +249,31 @@ def _validate_portal_session(db: Session, record: AuthSession) -> bool:
     return True
 
 
-def _load_session(request: Request, db: Session) -> dict[str, str | list[str] | int | None] | None:
+def _load_session(request: Request, db: Session) -> SerializedSession | None:
     parsed = read_session_cookie(request.cookies.get(SESSION_COOKIE_NAME))
     if not parsed:
         return None
 
+    session_id = parsed["session_id"]
+    now = _utc_now()
+    cached = session_cache.get(session_id, now)
+    if cached is not None:
+        if _last_seen_due(cached.last_seen_at, now):
+            db.execute(
+                update(AuthSession)
+                .where(AuthSession.session_id == session_id, AuthSession.revoked_at.is_(None))
+                .values(last_seen_at=now)
+            )
+            db.commit()
+            cached.last_seen_at = now
+        return _copy_session(cached.session)
+
     record = db.execute(
-        select(AuthSession).where(AuthSession.session_id == parsed["session_id"])
+        select(AuthSession).where(AuthSession.session_id == session_id)
     ).scalar_one_or_none()
     if record is None:
         return None
 
-    now = _utc_now()
     expires_at = _as_utc(record.expires_at) or now
     revoked_at = _as_utc(record.revoked_at)
     if revoked_at is not None or expires_at <= now:
@@ -157,11 +285,15 @@ def _load_session(request: Request, db: Session) -> dict[str, str | list[str] |
         _revoke_session_record(db, record, now=now)
         return None
 
-    record.last_seen_at = now
-    db.add(record)
-    db.commit()
-    db.refresh(record)
-    return _serialize_session(record)
+    session = _serialize_session(record)
+    last_seen_at = _as_utc(record.last_seen_at)
+    if _last_seen_due(last_seen_at, now):
+        record.last_seen_at = now
+        last_seen_at = now
+        db.add(record)
+        db.commit()
+    session_cache.put(session, expires_at=expires_at, last_seen_at=last_seen_at or now, now=now)
+    return _copy_session(session)
 
 
 def create_session_record(
@@ -196,7 +328,7 @@ def create_session_record(
 def require_session(
     request: Request,
     db: Session | None = None,
-) -> dict[str, str | list[str] | int | None]:
+) -> SerializedSession:
     cached = getattr(request.state, SESSION_STATE_KEY, None)
     if isinstance(cached, dict):
         return cached
@@ -225,12 +357,14 @@ def revoke_session_by_id(db: Session, session_id: str | None) -> None:
     record = db.execute(
         select(AuthSession).where(AuthSession.session_id == session_id)
     ).scalar_one_or_none()
+    session_cache.invalidate(session_id)
     if record is None:
         return
     _revoke_session_record(db, record)
 
 
 def revoke_sessions_for_portal_user(db: Session, user_id: int) -> None:
+    session_cache.invalidate_portal_user(user_id)
     records = db.scalars(
         select(AuthSession).where(
             AuthSession.portal_user_id == user_id,
@@ -248,6 +382,7 @@ def revoke_sessions_for_portal_user(db: Session, user_id: int) -> None:
 
 
 def revoke_sessions_for_principal(db: Session, actor_type: str, principal: str) -> None:
+    session_cache.invalidate_principal(actor_type, principal.strip().lower())
     records = db.scalars(
         select(AuthSession).where(
             AuthSession.actor_type == actor_type,
@@ -266,6 +401,7 @@ def revoke_sessions_for_principal(db: Session, actor_type: str, principal: str)
 
 
 def set_active_role(db: Session, session_id: str, active_role: str | None) -> AuthSession | None:
+    session_cache.invalidate(session_id)
     record = db.execute(
         select(AuthSession).where(AuthSession.session_id == session_id)
     ).scalar_one_or_none()
@@ -0,0 +1,112 @@
+"""Cache of verified device bearer tokens.
+
+Device requests authenticate with a bearer token whose hash is looked up together with
+the device row. ``device_token_cache`` keeps the verified pair for
+``KAJOVO_API_DEVICE_TOKEN_CACHE_TTL_SECONDS`` so repeated requests skip that lookup, and
+``last_seen_due`` limits ``last_seen_at`` writes to one per
+``KAJOVO_API_DEVICE_LAST_SEEN_INTERVAL_SECONDS``.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+
+from app.config import get_settings
+
+
+@dataclass(frozen=True)
+class DeviceTokenGrant:
+    """An active device and the bearer token it authenticated with."""
+
+    token_hash: str
+    device_id: str
+    display_name: str
+    status: str
+    registered_at: datetime
+    last_seen_at: datetime | None
+    token_expires_at: datetime
+
+
+@dataclass(frozen=True)
+class _CachedGrant:
+    grant: DeviceTokenGrant
+    cached_until: datetime
+
+
+class DeviceTokenCache:
+    """Per-process TTL cache of verified device bearer tokens keyed by token hash.
+
+    Entries never outlive the token itself. Invalidating a device drops its entries and
+    keeps it out of the cache for one TTL window, so a request racing the revoking
+    transaction cannot re-cache a revoked token. Other workers notice a revocation once
+    ``ttl_seconds`` elapses.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self._entries: dict[str, _CachedGrant] = {}
+        self._blocked: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _is_blocked(self, device_id: str) -> bool:
+        now = time.monotonic()
+        for key, until in list(self._blocked.items()):
+            if until <= now:
+                del self._blocked[key]
+        return device_id in self._blocked
+
+    def _evict_expired(self, now: datetime) -> None:
+        for key, entry in list(self._entries.items()):
+            if entry.cached_until <= now or entry.grant.token_expires_at <= now:
+                del self._entries[key]
+
+    def get(self, token_hash: str, now: datetime) -> DeviceTokenGrant | None:
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            if entry.cached_until <= now or entry.grant.token_expires_at <= now:
+                del self._entries[token_hash]
+                return None
+            return entry.grant
+
+    def put(self, grant: DeviceTokenGrant, *, now: datetime) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry = _CachedGrant(grant=grant, cached_until=now + timedelta(seconds=self.ttl_seconds))
+        with self._lock:
+            # Tokens that are never presented again would otherwise stay cached forever.
+            self._evict_expired(now)
+            if self._is_blocked(grant.device_id):
+                return
+            self._entries[grant.token_hash] = entry
+
+    def mark_seen(self, token_hash: str, seen_at: datetime) -> None:
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is not None:
+                self._entries[token_hash] = replace(entry, grant=replace(entry.grant, last_seen_at=seen_at))
+
+    def invalidate_device(self, device_id: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._blocked[device_id] = time.monotonic() + self.ttl_seconds
+            for token_hash in [key for key, entry in self._entries.items() if entry.grant.device_id == device_id]:
+                del self._entries[token_hash]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._blocked.clear()
+
+
+device_token_cache = DeviceTokenCache(get_settings().device_token_cache_ttl_seconds)
+
+
+def last_seen_due(last_seen_at: datetime | None, now: datetime) -> bool:
+    if last_seen_at is None:
+        return True
+    interval = timedelta(seconds=get_settings().device_last_seen_interval_seconds)
+    return now - last_seen_at >= interval
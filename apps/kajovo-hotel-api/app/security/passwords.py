@@ -1,22 +1,173 @@
+"""scrypt password hashes.
+
+Hashes are stored as ``scrypt$n$r$p$salt$digest`` so the cost can be raised later
+(``KAJOVO_API_PASSWORD_SCRYPT_*``); logins rehash passwords whose stored cost differs
+from the configured one. The original ``scrypt$salt$digest`` form is read as
+n=2**14, r=8, p=1.
+
+Key derivation is deliberately slow, so it runs on a small dedicated thread pool
+(``hashlib.scrypt`` releases the GIL), which caps how many derivations use CPU at once.
+The calling request thread still waits for the result, so at most ``max_pending``
+checks may be queued or running; beyond that new ones are refused with 503 rather than
+tying up request threads behind a login burst. Keep ``max_pending`` well below the
+request threadpool and DB pool sizes; the login routes end their DB transaction before
+waiting.
+"""
+
+from __future__ import annotations
+
 import hashlib
+import logging
 import secrets
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TypeVar
 
+from fastapi import HTTPException, status
 
-def verify_password(password: str, stored_hash: str) -> bool:
-    if not stored_hash.startswith("scrypt$"):
-        return False
-    _, salt_hex, digest_hex = stored_hash.split("$", 2)
-    calc = hashlib.scrypt(
+from app.config import Settings, get_settings
+
+log = logging.getLogger("kajovo.security.passwords")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ScryptParams:
+    n: int
+    r: int
+    p: int
+
+    @property
+    def maxmem(self) -> int:
+        # scrypt needs 128 * r * (n + p) bytes; hashlib's default cap is 32 MiB.
+        return 128 * self.r * (self.n + self.p) + 1024 * 1024
+
+
+LEGACY_PARAMS = ScryptParams(n=2**14, r=8, p=1)
+
+
+@dataclass(frozen=True)
+class _StoredHash:
+    params: ScryptParams
+    salt: bytes
+    digest: str
+    legacy: bool = False
+
+
+def _parse(stored_hash: str) -> _StoredHash | None:
+    parts = stored_hash.split("$")
+    try:
+        if len(parts) == 3 and parts[0] == "scrypt":
+            return _StoredHash(LEGACY_PARAMS, bytes.fromhex(parts[1]), parts[2], legacy=True)
+        if len(parts) == 6 and parts[0] == "scrypt":
+            params = ScryptParams(n=int(parts[1]), r=int(parts[2]), p=int(parts[3]))
+            return _StoredHash(params, bytes.fromhex(parts[4]), parts[5])
+    except ValueError:
+        return None
+    return None
+
+
+def _derive(password: str, salt: bytes, params: ScryptParams) -> str:
+    return hashlib.scrypt(
         password.encode("utf-8"),
-        salt=bytes.fromhex(salt_hex),
-        n=2**14,
-        r=8,
-        p=1,
-    )
-    return secrets.compare_digest(calc.hex(), digest_hex)
+        salt=salt,
+        n=params.n,
+        r=params.r,
+        p=params.p,
+        maxmem=params.maxmem,
+    ).hex()
+
+
+class PasswordHasher:
+    def __init__(self, *, params: ScryptParams, workers: int = 2, max_pending: int = 4) -> None:
+        self.params = params
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> PasswordHasher:
+        return cls(
+            params=ScryptParams(
+                n=settings.password_scrypt_n,
+                r=settings.password_scrypt_r,
+                p=settings.password_scrypt_p,
+            ),
+            workers=settings.password_hash_workers,
+            max_pending=settings.password_hash_max_pending,
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def _run(self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                log.warning("auth.password_pool_saturated", extra={"context": self.stats()})
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent password checks",
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="passwords")
+            self._pending += 1
+            future = self._executor.submit(fn, *args)
+        try:
+            return future.result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+
+    def hash(self, password: str) -> str:
+        params = self.params
+        salt = secrets.token_bytes(16)
+        digest = self._run(_derive, password, salt, params)
+        return f"scrypt${params.n}${params.r}${params.p}${salt.hex()}${digest}"
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        parsed = _parse(stored_hash)
+        if parsed is None:
+            return False
+        calc = self._run(_derive, password, parsed.salt, parsed.params)
+        return secrets.compare_digest(calc, parsed.digest)
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        parsed = _parse(stored_hash)
+        # Legacy hashes are rewritten even at the same cost, to record their parameters.
+        return parsed is None or parsed.legacy or parsed.params != self.params
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher.from_settings(get_settings())
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    return password_hasher.verify(password, stored_hash)
 
 
 def hash_password(password: str) -> str:
-    salt = secrets.token_bytes(16)
-    digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=2**14, r=8, p=1)
-    return f"scrypt${salt.hex()}${digest.hex()}"
+    return password_hasher.hash(password)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    return password_hasher.needs_rehash(stored_hash)
@@ -1,4 +1,6 @@
 from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
 
 from fastapi import Depends, HTTPException, Request, status
 
@@ -78,7 +80,18 @@ ROLE_AUDIT_EXPORT: dict[str, str] = {
     'sklad': 'warehouse',
 }
 
+# Every permission gets one bit; a role's permissions are precomputed into one mask.
+PERMISSION_BITS: dict[Permission, int] = {
+    permission: 1 << index
+    for index, permission in enumerate(sorted(set().union(*ROLE_PERMISSIONS.values())))
+}
+ROLE_PERMISSION_MASKS: dict[Role, int] = {
+    role: sum(PERMISSION_BITS[permission] for permission in permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
 WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+IDENTITY_STATE_KEY = 'identity'
 
 def _escaped_text(*codepoints: int) -> str:
     return ''.join(chr(codepoint) for codepoint in codepoints)
@@ -107,13 +120,18 @@ def _repair_text_encoding_drift(value: str) -> str:
     return value
 
 
-def parse_role(raw_role: str | None) -> str | None:
-    role = _repair_text_encoding_drift(raw_role or "").strip().lower()
+@lru_cache(maxsize=256)
+def _parse_role_text(raw_role: str) -> str | None:
+    role = _repair_text_encoding_drift(raw_role).strip().lower()
     if not role:
         return None
     return ROLE_ALIASES.get(role)
 
 
+def parse_role(raw_role: str | None) -> str | None:
+    return _parse_role_text(raw_role or "")
+
+
 def normalize_role(raw_role: str | None) -> str:
     role = parse_role(raw_role)
     if role is None:
@@ -128,50 +146,64 @@ def role_for_audit(raw_role: str | None) -> str:
     return ROLE_AUDIT_EXPORT.get(role, "unauthenticated")
 
 
-def parse_identity(request: Request) -> tuple[str, str, str]:
+@dataclass(frozen=True)
+class Identity:
+    actor_id: str
+    actor_name: str
+    role: Role
+    actor_type: str | None
+    role_selected: bool
+    permission_mask: int
+
+    def can(self, permission: Permission) -> bool:
+        return bool(self.permission_mask & PERMISSION_BITS.get(permission, 0))
+
+
+def resolve_identity(request: Request) -> Identity:
+    """Return the caller's identity, resolving it from the session once per request."""
+    identity = getattr(request.state, IDENTITY_STATE_KEY, None)
+    if isinstance(identity, Identity):
+        return identity
+
     from app.security.auth import require_session
 
     session = require_session(request)
-    actor_id = session['email']
-    actor_name = session['email']
     selected = session.get('active_role') or session.get('role')
     actor_role = parse_role(str(selected) if selected else None)
     if actor_role is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required",
+            detail='Authentication required',
         )
-    return actor_id, actor_name, actor_role
+    identity = Identity(
+        actor_id=session['email'],
+        actor_name=session['email'],
+        role=actor_role,
+        actor_type=session.get('actor_type'),
+        role_selected=bool(session.get('active_role')),
+        permission_mask=ROLE_PERMISSION_MASKS.get(actor_role, 0),
+    )
+    setattr(request.state, IDENTITY_STATE_KEY, identity)
+    request.state.actor_id = identity.actor_id
+    request.state.actor_role = identity.role
+    return identity
 
 
 def has_permission(role: str, permission: Permission) -> bool:
-    permissions = ROLE_PERMISSIONS.get(role, set())
-    return permission in permissions
+    return bool(ROLE_PERMISSION_MASKS.get(role, 0) & PERMISSION_BITS.get(permission, 0))
 
 
-def require_permission(module: str, action: str) -> Callable[[Request], None]:
-    required = f'{module}:{action}'
+def _permission_checker(required: Permission) -> Callable[[Request], None]:
+    required_bit = PERMISSION_BITS.get(required, 0)
 
     def _check_permission(request: Request) -> None:
-        from app.security.auth import require_session
-
-        session = require_session(request)
-        actor_id = session['email']
-        selected = session.get('active_role') or session.get('role')
-        actor_role = parse_role(str(selected) if selected else None)
-        if actor_role is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail='Authentication required',
-            )
-        request.state.actor_id = actor_id
-        request.state.actor_role = actor_role
-        if session.get('actor_type') == 'portal' and not session.get('active_role'):
+        identity = resolve_identity(request)
+        if identity.actor_type == 'portal' and not identity.role_selected:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail='Active role must be selected',
             )
-        if not has_permission(actor_role, required):
+        if not identity.permission_mask & required_bit:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f'Missing permission: {required}',
@@ -180,6 +212,10 @@ def require_permission(module: str, action: str) -> Callable[[Request], None]:
     return _check_permission
 
 
+def require_permission(module: str, action: str) -> Callable[[Request], None]:
+    return _permission_checker(f'{module}:{action}')
+
+
 def require_actor_type(expected_actor_type: str) -> Callable[[Request], None]:
     def _check_actor_type(request: Request) -> None:
         from app.security.auth import require_session
@@ -199,17 +235,7 @@ def require_role(expected_role: str) -> Callable[[Request], None]:
     normalized_expected_role = normalize_role(expected_role)
 
     def _check_role(request: Request) -> None:
-        from app.security.auth import require_session
-
-        session = require_session(request)
-        selected = session.get('active_role') or session.get('role')
-        actor_role = parse_role(str(selected) if selected else None)
-        if actor_role is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail='Authentication required',
-            )
-        if actor_role != normalized_expected_role:
+        if resolve_identity(request).role != normalized_expected_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f'Missing role: {normalized_expected_role}',
@@ -220,31 +246,24 @@ def require_role(expected_role: str) -> Callable[[Request], None]:
 
 def require_module_access(module: str, request: Request) -> None:
     action = 'write' if request.method in WRITE_METHODS else 'read'
-    checker = require_permission(module, action)
-    checker(request)
+    require_permission(module, action)(request)
 
 
 def module_access_dependency(module: str) -> Callable[[Request], None]:
+    check_read = _permission_checker(f'{module}:read')
+    check_write = _permission_checker(f'{module}:write')
+
     def _module_access(request: Request) -> None:
-        require_module_access(module, request)
+        if request.method in WRITE_METHODS:
+            check_write(request)
+        else:
+            check_read(request)
 
     return _module_access
 
 
 def inject_identity(request: Request) -> None:
-    from app.security.auth import require_session
-
-    session = require_session(request)
-    actor_id = session['email']
-    selected = session.get('active_role') or session.get('role')
-    actor_role = parse_role(str(selected) if selected else None)
-    if actor_role is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required",
-        )
-    request.state.actor_id = actor_id
-    request.state.actor_role = actor_role
+    resolve_identity(request)
 
 
 IdentityDependency = Depends(inject_identity)
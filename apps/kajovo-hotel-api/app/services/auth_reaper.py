@@ -0,0 +1,122 @@
+"""Periodic deletion of spent device challenges, device tokens, sessions and unlock tokens.
+
+Rows in these tables are only ever marked consumed, revoked or used, and they expire;
+lookups by hash or session id never match them again. Once a row has been expired (or
+consumed / revoked / used) for longer than the retention period it is deleted. Deletes
+go in batches of primary keys selected through the indexed timestamp columns, with a
+commit per batch, so a large backlog never holds one long write transaction.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.config import Settings, get_settings
+from app.db.models import AuthSession, AuthUnlockToken, DeviceAccessToken, DeviceChallenge
+from app.db.session import SessionLocal
+from app.time_utils import utc_now
+
+log = logging.getLogger("kajovo.security.reaper")
+
+
+@dataclass(frozen=True)
+class _ReapTarget:
+    model: type
+    spent_column: str
+
+
+REAP_TARGETS = (
+    _ReapTarget(DeviceChallenge, "consumed_at"),
+    _ReapTarget(DeviceAccessToken, "revoked_at"),
+    _ReapTarget(AuthSession, "revoked_at"),
+    _ReapTarget(AuthUnlockToken, "used_at"),
+)
+
+
+def _reap_table(db: Session, target: _ReapTarget, cutoff: datetime, batch_size: int) -> int:
+    model = target.model
+    spent_at = getattr(model, target.spent_column)
+    stale = select(model.id).where(or_(model.expires_at < cutoff, spent_at < cutoff)).limit(batch_size)
+    removed = 0
+    while True:
+        ids = list(db.scalars(stale))
+        if not ids:
+            return removed
+        removed += db.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if len(ids) < batch_size:
+            return removed
+
+
+class AuthRowReaper:
+    def __init__(self, *, retention: timedelta, batch_size: int = 500) -> None:
+        self.retention = retention
+        self.batch_size = max(1, int(batch_size))
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.last_run_at: datetime | None = None
+        self.last_removed: dict[str, int] = {}
+        self.removed_total: dict[str, int] = {target.model.__tablename__: 0 for target in REAP_TARGETS}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AuthRowReaper:
+        return cls(
+            retention=timedelta(seconds=max(0, settings.auth_reaper_retention_seconds)),
+            batch_size=settings.auth_reaper_batch_size,
+        )
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+                "last_removed": dict(self.last_removed),
+                "removed_total": dict(self.removed_total),
+                "retention_seconds": int(self.retention.total_seconds()),
+                "batch_size": self.batch_size,
+            }
+
+    def reap(self, db: Session, *, now: datetime | None = None) -> dict[str, int]:
+        """Delete rows spent or expired before ``now - retention``; return counts per table."""
+        now = now or utc_now()
+        cutoff = now - self.retention
+        removed = {
+            target.model.__tablename__: _reap_table(db, target, cutoff, self.batch_size) for target in REAP_TARGETS
+        }
+        with self._lock:
+            self.runs += 1
+            self.last_run_at = now
+            self.last_removed = removed
+            for table, count in removed.items():
+                self.removed_total[table] = self.removed_total.get(table, 0) + count
+        log.info("auth.reaper_completed", extra={"context": {"removed": removed, "cutoff": cutoff.isoformat()}})
+        return removed
+
+
+auth_row_reaper = AuthRowReaper.from_settings(get_settings())
+
+
+def run_auth_reaper_iteration() -> dict[str, int]:
+    with SessionLocal() as db:
+        return auth_row_reaper.reap(db)
+
+
+async def auth_reaper_loop() -> None:
+    interval = max(60, int(get_settings().auth_reaper_interval_seconds))
+    while True:
+        try:
+            await asyncio.to_thread(run_auth_reaper_iteration)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Auth row reaper iteration failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+log = logging.getLogger("kajovo.breakfast.events")
+
+
+@dataclass(frozen=True)
+class BreakfastEvent:
+    """A change to one service date; ``data`` may be empty for day-wide replacements."""
+
+    event: str
+    service_date: date
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(eq=False)
+class BreakfastSubscription:
+    service_date: date
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue[BreakfastEvent]
+    overflowed: bool = False
+
+
+class BreakfastEventBroker:
+    """In-process pub/sub fan-out of breakfast changes to live board streams.
+
+    ``publish`` is thread-safe so sync route handlers and the IMAP import can call it;
+    events are handed to each subscriber's event loop. A subscriber that falls
+    ``max_queue_size`` events behind is flagged ``overflowed`` and should resync.
+    """
+
+    def __init__(self, max_queue_size: int = 256) -> None:
+        self.max_queue_size = max(1, int(max_queue_size))
+        self._subscribers: set[BreakfastSubscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, service_date: date) -> BreakfastSubscription:
+        subscription = BreakfastSubscription(
+            service_date=service_date,
+            loop=asyncio.get_running_loop(),
+            queue=asyncio.Queue(maxsize=self.max_queue_size),
+        )
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: BreakfastSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def has_subscribers(self, service_date: date) -> bool:
+        with self._lock:
+            return any(item.service_date == service_date for item in self._subscribers)
+
+    def subscribed_dates(self) -> set[date]:
+        with self._lock:
+            return {item.service_date for item in self._subscribers}
+
+    def publish(self, event: BreakfastEvent) -> None:
+        with self._lock:
+            targets = [item for item in self._subscribers if item.service_date == event.service_date]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(self._offer, subscription, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; the stream is gone.
+                self.unsubscribe(subscription)
+
+    @staticmethod
+    def _offer(subscription: BreakfastSubscription, event: BreakfastEvent) -> None:
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            subscription.overflowed = True
+            log.warning(
+                "breakfast.stream_overflow",
+                extra={"context": {"service_date": subscription.service_date.isoformat()}},
+            )
+
+
+breakfast_events = BreakfastEventBroker()
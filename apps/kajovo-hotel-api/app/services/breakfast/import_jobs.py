@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from app.config import Settings, get_settings
+from app.db.models import BreakfastOrder, BreakfastStatus
+from app.services.breakfast.events import BreakfastEvent, breakfast_events
+from app.services.breakfast.parser import BreakfastRow, parse_breakfast_pdf
+from app.services.breakfast.summary import breakfast_summary_cache
+from app.time_utils import utc_now
+
+log = logging.getLogger("kajovo.breakfast.import")
+
+DietOverrides = dict[str, dict[str, bool]]
+
+JOB_PROGRESS = {
+    "queued": 0,
+    "parsing": 25,
+    "saving": 75,
+    "completed": 100,
+    "failed": 100,
+}
+
+
+def archive_import_pdf(settings: Settings, pdf_bytes: bytes, filename: str) -> None:
+    archive_dir = Path(settings.media_root) / "breakfast" / "imports"
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    (archive_dir / filename).write_bytes(pdf_bytes)
+
+
+def replace_breakfast_day(
+    db: Session,
+    service_date: date,
+    rows: list[BreakfastRow],
+    *,
+    note: str,
+    diet_overrides: DietOverrides | None = None,
+) -> None:
+    """Replace all orders of ``service_date`` with imported rows and notify readers."""
+    overrides = diet_overrides or {}
+    db.query(BreakfastOrder).filter(BreakfastOrder.service_date == service_date).delete(
+        synchronize_session=False
+    )
+    for row in rows:
+        override = overrides.get(str(row.room), {})
+        db.add(
+            BreakfastOrder(
+                service_date=service_date,
+                room_number=row.room,
+                guest_name=row.guest_name or f"Pokoj {row.room}",
+                guest_count=max(1, int(row.breakfast_count)),
+                status=BreakfastStatus.PENDING.value,
+                note=note,
+                diet_no_gluten=bool(override.get("diet_no_gluten", False)),
+                diet_no_milk=bool(override.get("diet_no_milk", False)),
+                diet_no_pork=bool(override.get("diet_no_pork", False)),
+            )
+        )
+    db.commit()
+    breakfast_summary_cache.invalidate(service_date)
+    breakfast_events.publish(BreakfastEvent(event="day.replaced", service_date=service_date))
+
+
+def imported_items(rows: list[BreakfastRow], diet_overrides: DietOverrides) -> list[dict[str, object]]:
+    items: list[dict[str, object]] = []
+    for row in rows:
+        override = diet_overrides.get(str(row.room), {})
+        items.append(
+            {
+                "room": int(row.room),
+                "count": int(row.breakfast_count),
+                "guest_name": row.guest_name,
+                "diet_no_gluten": bool(override.get("diet_no_gluten", False)),
+                "diet_no_milk": bool(override.get("diet_no_milk", False)),
+                "diet_no_pork": bool(override.get("diet_no_pork", False)),
+            }
+        )
+    return items
+
+
+@dataclass(frozen=True)
+class BreakfastImportJob:
+    job_id: str
+    status: str
+    save: bool
+    filename: str | None
+    created_at: datetime
+    updated_at: datetime
+    service_date: date | None = None
+    saved: bool = False
+    items: list[dict[str, object]] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def progress(self) -> int:
+        return JOB_PROGRESS.get(self.status, 0)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {"completed", "failed"}
+
+
+class BreakfastImportJobManager:
+    """Runs breakfast PDF imports in the background.
+
+    Parsing (pypdf text extraction and block collection) runs in a process pool so it
+    neither holds the GIL nor ties up request threads; a small thread pool sequences
+    each job and does the DB write and archive I/O. Jobs live in this process and are
+    forgotten ``retention_seconds`` after they finish.
+    """
+
+    def __init__(
+        self,
+        *,
+        process_workers: int = 2,
+        retention_seconds: int = 3600,
+        session_factory: Callable[[], Session] | None = None,
+    ) -> None:
+        self.process_workers = max(0, int(process_workers))
+        self.retention_seconds = max(0, int(retention_seconds))
+        self._session_factory = session_factory
+        self._jobs: dict[str, BreakfastImportJob] = {}
+        self._lock = threading.Lock()
+        self._parse_pool: Executor | None = None
+        self._runner: ThreadPoolExecutor | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> BreakfastImportJobManager:
+        return cls(
+            process_workers=settings.breakfast_import_process_workers,
+            retention_seconds=settings.breakfast_import_job_retention_seconds,
+        )
+
+    def _pools(self) -> tuple[Executor | None, ThreadPoolExecutor]:
+        with self._lock:
+            if self._runner is None:
+                self._runner = ThreadPoolExecutor(max_workers=2, thread_name_prefix="breakfast-import")
+            if self._parse_pool is None and self.process_workers > 0:
+                # spawn: forking a process that already runs server threads is unsafe.
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._parse_pool, self._runner
+
+    def parse(self, pdf_bytes: bytes) -> tuple[date, list[BreakfastRow]]:
+        parse_pool, _ = self._pools()
+        if parse_pool is None:
+            return parse_breakfast_pdf(pdf_bytes)
+        return parse_pool.submit(parse_breakfast_pdf, pdf_bytes).result()
+
+    def get(self, job_id: str) -> BreakfastImportJob | None:
+        with self._lock:
+            self._evict_finished()
+            return self._jobs.get(job_id)
+
+    def submit(
+        self,
+        pdf_bytes: bytes,
+        *,
+        filename: str | None,
+        save: bool,
+        diet_overrides: DietOverrides,
+    ) -> BreakfastImportJob:
+        now = utc_now()
+        job = BreakfastImportJob(
+            job_id=uuid.uuid4().hex,
+            status="queued",
+            save=save,
+            filename=filename,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._lock:
+            self._evict_finished()
+            self._jobs[job.job_id] = job
+        _, runner = self._pools()
+        runner.submit(self._run, job.job_id, pdf_bytes, diet_overrides)
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            parse_pool, runner = self._parse_pool, self._runner
+            self._parse_pool = None
+            self._runner = None
+        if runner is not None:
+            runner.shutdown(wait=True, cancel_futures=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=True, cancel_futures=True)
+
+    def _update(self, job_id: str, **changes: object) -> BreakfastImportJob:
+        with self._lock:
+            job = replace(self._jobs[job_id], updated_at=utc_now(), **changes)
+            self._jobs[job_id] = job
+            return job
+
+    def _evict_finished(self) -> None:
+        cutoff = utc_now() - timedelta(seconds=self.retention_seconds)
+        for job_id in [key for key, job in self._jobs.items() if job.finished and job.updated_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _new_session(self) -> Session:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _run(self, job_id: str, pdf_bytes: bytes, diet_overrides: DietOverrides) -> None:
+        job = self._update(job_id, status="parsing")
+        try:
+            parsed_day, rows = self.parse(pdf_bytes)
+        except ValueError as exc:
+            self._update(job_id, status="failed", error=str(exc))
+            return
+        except Exception:
+            log.exception("breakfast.import_failed", extra={"context": {"job_id": job_id}})
+            self._update(job_id, status="failed", error="Breakfast PDF could not be parsed")
+            return
+
+        items = imported_items(rows, diet_overrides)
+        if not job.save:
+            self._update(job_id, status="completed", service_date=parsed_day, items=items)
+            return
+
+        self._update(job_id, status="saving", service_date=parsed_day, items=items)
+        try:
+            with self._new_session() as db:
+                replace_breakfast_day(db, parsed_day, rows, note="Import PDF", diet_overrides=diet_overrides)
+            archive_import_pdf(get_settings(), pdf_bytes, f"{parsed_day.isoformat()}.pdf")
+        except Exception:
+            log.exception("breakfast.import_failed", extra={"context": {"job_id": job_id}})
+            self._update(job_id, status="failed", error="Breakfast import could not be saved")
+            return
+        self._update(job_id, status="completed", saved=True)
+
+
+breakfast_import_jobs = BreakfastImportJobManager.from_settings(get_settings())
@@ -3,15 +3,17 @@ from __future__ import annotations
 import email
 import imaplib
 import logging
-import os
+import re
 from datetime import date, timedelta
 from email.message import Message
-from pathlib import Path
+from email.parser import BytesHeaderParser
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.config import Settings
-from app.db.models import BreakfastOrder, BreakfastStatus
+from app.db.models import BreakfastMailSyncState
+from app.services.breakfast.import_jobs import archive_import_pdf, replace_breakfast_day
 from app.services.breakfast.parser import parse_breakfast_pdf
 
 log = logging.getLogger("kajovo.breakfast.mail_fetcher")
@@ -67,9 +69,57 @@ def _imap_date(value: date) -> str:
     return value.strftime("%d-%b-%Y")
 
 
+_FETCH_UID_RE = re.compile(rb"\bUID (\d+)")
+HEADER_PREFETCH = "(UID BODY.PEEK[HEADER.FIELDS (FROM SUBJECT)])"
+BODY_FETCH = "(UID BODY.PEEK[])"
+
+
+def _parse_uid_list(data: list[bytes | None] | None) -> list[int]:
+    if not data or not data[0]:
+        return []
+    return sorted({int(token) for token in data[0].split() if token.isdigit()})
+
+
+def _fetched_parts(data: list[object] | None) -> dict[int, bytes]:
+    """Map UID -> literal payload from an ``imaplib`` ``UID FETCH`` response.
+
+    Servers may send the ``UID`` item before or after the literal, so a literal without
+    a UID in its prefix is matched to the UID in the closing line that follows it.
+    """
+    out: dict[int, bytes] = {}
+    pending: bytes | None = None
+    for part in data or []:
+        if isinstance(part, tuple) and len(part) >= 2 and isinstance(part[1], (bytes, bytearray)):
+            match = _FETCH_UID_RE.search(part[0])
+            if match is not None:
+                out[int(match.group(1))] = bytes(part[1])
+                pending = None
+            else:
+                pending = bytes(part[1])
+        elif isinstance(part, (bytes, bytearray)) and pending is not None:
+            match = _FETCH_UID_RE.search(part)
+            if match is not None:
+                out[int(match.group(1))] = pending
+            pending = None
+    return out
+
+
+def _uid_set(uids: list[int]) -> str:
+    return ",".join(str(uid) for uid in uids)
+
+
 class BreakfastMailFetcher:
+    """Imports the daily breakfast PDF from an IMAP mailbox.
+
+    The fetcher remembers the highest UID it has examined per mailbox (reset when the
+    server's UIDVALIDITY changes), so each run only looks at new mail: it prefetches the
+    From/Subject headers of new messages and downloads full bodies only for matches.
+    The IMAP connection is kept open between runs and re-established when it drops.
+    """
+
     def __init__(self, settings: Settings):
         self.settings = settings
+        self._client: imaplib.IMAP4 | None = None
 
     def validate_configuration(self) -> list[str]:
         missing: list[str] = []
@@ -83,6 +133,13 @@ class BreakfastMailFetcher:
                 missing.append(field_name)
         return missing
 
+    @property
+    def mailbox_key(self) -> str:
+        return (
+            f"{self.settings.breakfast_imap_username}@{self.settings.breakfast_imap_host}"
+            f"/{self.settings.breakfast_imap_mailbox}"
+        )[:255]
+
     def _connect(self) -> imaplib.IMAP4:
         if self.settings.breakfast_imap_use_ssl:
             client = imaplib.IMAP4_SSL(
@@ -95,6 +152,37 @@ class BreakfastMailFetcher:
         client.login(self.settings.breakfast_imap_username, self.settings.breakfast_imap_password)
         return client
 
+    def _connection(self) -> imaplib.IMAP4:
+        client = self._client
+        if client is not None:
+            try:
+                typ, _ = client.noop()
+                if typ == "OK":
+                    return client
+            except (imaplib.IMAP4.error, OSError):
+                pass
+            self.close()
+        self._client = self._connect()
+        return self._client
+
+    def close(self) -> None:
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            client.logout()
+        except Exception:
+            pass
+
+    def _sync_state(self, db: Session) -> BreakfastMailSyncState:
+        state = db.scalar(
+            select(BreakfastMailSyncState).where(BreakfastMailSyncState.mailbox == self.mailbox_key)
+        )
+        if state is None:
+            state = BreakfastMailSyncState(mailbox=self.mailbox_key, last_seen_uid=0)
+            db.add(state)
+        return state
+
     def fetch_and_store_for_day(self, db: Session, day: date) -> bool:
         missing = self.validate_configuration()
         if missing:
@@ -105,7 +193,7 @@ class BreakfastMailFetcher:
             return False
 
         try:
-            client = self._connect()
+            client = self._connection()
         except imaplib.IMAP4.error:
             log.exception("Breakfast IMAP login failed for %s", day.isoformat())
             return False
@@ -114,72 +202,89 @@ class BreakfastMailFetcher:
             return False
 
         try:
-            typ, _ = client.select(self.settings.breakfast_imap_mailbox)
-            if typ != "OK":
-                log.warning("Breakfast IMAP mailbox select failed for %s", day.isoformat())
-                return False
-
-            since = _imap_date(day)
-            before = _imap_date(day + timedelta(days=1))
-            typ, data = client.search(None, "SINCE", since, "BEFORE", before)
-            if typ != "OK" or not data:
-                log.warning("Breakfast IMAP search failed for %s", day.isoformat())
-                return False
-            uids = data[0].split()
-            for uid in reversed(uids):
-                typ, parts = client.fetch(uid, "(RFC822)")
-                if typ != "OK" or not parts:
+            return self._fetch_new_messages(client, db, day)
+        except (imaplib.IMAP4.abort, OSError):
+            # The server dropped the session; reconnect on the next run.
+            self.close()
+            raise
+
+    def _fetch_new_messages(self, client: imaplib.IMAP4, db: Session, day: date) -> bool:
+        typ, _ = client.select(self.settings.breakfast_imap_mailbox, readonly=True)
+        if typ != "OK":
+            log.warning("Breakfast IMAP mailbox select failed for %s", day.isoformat())
+            return False
+
+        state = self._sync_state(db)
+        _, validity_data = client.response("UIDVALIDITY")
+        uid_validity = _parse_uid_list(validity_data)
+        uid_validity_value = uid_validity[0] if uid_validity else None
+        if state.uid_validity != uid_validity_value:
+            # UIDs from an older UIDVALIDITY epoch mean nothing any more.
+            state.uid_validity = uid_validity_value
+            state.last_seen_uid = 0
+        last_seen = int(state.last_seen_uid or 0)
+
+        since = _imap_date(day)
+        before = _imap_date(day + timedelta(days=1))
+        typ, data = client.uid("SEARCH", None, "UID", f"{last_seen + 1}:*", "SINCE", since, "BEFORE", before)
+        if typ != "OK" or not data:
+            log.warning("Breakfast IMAP search failed for %s", day.isoformat())
+            db.commit()
+            return False
+        # "n:*" always matches the newest message, even when it is older than n.
+        uids = [uid for uid in _parse_uid_list(data) if uid > last_seen]
+        if not uids:
+            db.commit()
+            return False
+
+        typ, header_data = client.uid("FETCH", _uid_set(uids), HEADER_PREFETCH)
+        if typ != "OK":
+            log.warning("Breakfast IMAP header fetch failed for %s", day.isoformat())
+            db.commit()
+            return False
+        header_parser = BytesHeaderParser()
+        headers = _fetched_parts(header_data)
+        candidates = [
+            uid
+            for uid in uids
+            if uid in headers
+            and _match_message(
+                header_parser.parsebytes(headers[uid]),
+                self.settings.breakfast_imap_from_contains,
+                self.settings.breakfast_imap_subject_contains,
+            )
+        ]
+
+        # Advance past every examined UID unless a body could not be downloaded, so a
+        # transient failure is retried on the next run.
+        high_water = uids[-1]
+        for uid in reversed(candidates):
+            typ, parts = client.uid("FETCH", str(uid), BODY_FETCH)
+            raw = _fetched_parts(parts).get(uid) if typ == "OK" else None
+            if not raw:
+                log.warning("Breakfast IMAP fetch failed for uid=%s", uid)
+                high_water = min(high_water, uid - 1)
+                continue
+            msg = email.message_from_bytes(raw)
+            for _, pdf_bytes in _iter_pdf_attachments(msg):
+                try:
+                    parsed_day, rows = parse_breakfast_pdf(pdf_bytes)
+                except ValueError:
                     log.warning(
-                        "Breakfast IMAP fetch failed for uid=%s",
-                        uid.decode("utf-8", "ignore"),
+                        "Breakfast IMAP attachment is not a valid breakfast PDF",
+                        extra={"context": {"day": day.isoformat()}},
                     )
                     continue
-                raw = parts[0][1] if isinstance(parts[0], tuple) else b""
-                if not raw:
+                if parsed_day != day:
                     continue
-                msg = email.message_from_bytes(raw)
-                if not _match_message(
-                    msg,
-                    self.settings.breakfast_imap_from_contains,
-                    self.settings.breakfast_imap_subject_contains,
-                ):
-                    continue
-                attachments = _iter_pdf_attachments(msg)
-                for _, pdf_bytes in attachments:
-                    try:
-                        parsed_day, rows = parse_breakfast_pdf(pdf_bytes)
-                    except ValueError:
-                        log.warning(
-                            "Breakfast IMAP attachment is not a valid breakfast PDF",
-                            extra={"context": {"day": day.isoformat()}},
-                        )
-                        continue
-                    if parsed_day != day:
-                        continue
-                    db.query(BreakfastOrder).filter(BreakfastOrder.service_date == parsed_day).delete(
-                        synchronize_session=False
-                    )
-                    for row in rows:
-                        db.add(
-                            BreakfastOrder(
-                                service_date=parsed_day,
-                                room_number=row.room,
-                                guest_name=row.guest_name or f"Pokoj {row.room}",
-                                guest_count=max(1, int(row.breakfast_count)),
-                                status=BreakfastStatus.PENDING.value,
-                                note="Import IMAP",
-                            )
-                        )
-                    archive_dir = Path(self.settings.media_root) / "breakfast" / "imports"
-                    os.makedirs(archive_dir, exist_ok=True)
-                    (archive_dir / f"{parsed_day.isoformat()}-imap.pdf").write_bytes(pdf_bytes)
-                    db.commit()
-                    log.info("Breakfast IMAP import completed for %s", parsed_day.isoformat())
-                    return True
-            log.info("Breakfast IMAP finished without matching PDF for %s", day.isoformat())
-            return False
-        finally:
-            try:
-                client.logout()
-            except Exception:
-                pass
+                archive_import_pdf(self.settings, pdf_bytes, f"{parsed_day.isoformat()}-imap.pdf")
+                # Older candidates are superseded by this newer export; mark them all seen
+                # in the same commit as the imported orders.
+                state.last_seen_uid = max(last_seen, uids[-1])
+                replace_breakfast_day(db, parsed_day, rows, note="Import IMAP")
+                log.info("Breakfast IMAP import completed for %s", parsed_day.isoformat())
+                return True
+        state.last_seen_uid = max(last_seen, high_water)
+        db.commit()
+        log.info("Breakfast IMAP finished without matching PDF for %s", day.isoformat())
+        return False
@@ -81,31 +81,34 @@ async def breakfast_scheduler_loop() -> None:
     retry_interval = max(5, int(settings.breakfast_scheduler_retry_seconds))
     max_retries = max(1, int(settings.breakfast_scheduler_max_retries))
 
-    while True:
-        try:
-            result = await asyncio.to_thread(
-                run_breakfast_scheduler_iteration,
-                fetcher=fetcher,
-                target_day=utc_today(),
-                attempt=1,
-            )
-            if not result.ok:
-                for attempt in range(2, max_retries + 1):
-                    log.warning(
-                        "Retrying breakfast scheduler iteration",
-                        extra={"context": {"attempt": attempt, "service_date": result.service_date}},
-                    )
-                    await asyncio.sleep(retry_interval)
-                    result = await asyncio.to_thread(
-                        run_breakfast_scheduler_iteration,
-                        fetcher=fetcher,
-                        target_day=utc_today(),
-                        attempt=attempt,
-                    )
-                    if result.ok:
-                        break
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            log.exception("Breakfast scheduler iteration failed")
-        await asyncio.sleep(interval)
+    try:
+        while True:
+            try:
+                result = await asyncio.to_thread(
+                    run_breakfast_scheduler_iteration,
+                    fetcher=fetcher,
+                    target_day=utc_today(),
+                    attempt=1,
+                )
+                if not result.ok:
+                    for attempt in range(2, max_retries + 1):
+                        log.warning(
+                            "Retrying breakfast scheduler iteration",
+                            extra={"context": {"attempt": attempt, "service_date": result.service_date}},
+                        )
+                        await asyncio.sleep(retry_interval)
+                        result = await asyncio.to_thread(
+                            run_breakfast_scheduler_iteration,
+                            fetcher=fetcher,
+                            target_day=utc_today(),
+                            attempt=attempt,
+                        )
+                        if result.ok:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Breakfast scheduler iteration failed")
+            await asyncio.sleep(interval)
+    finally:
+        await asyncio.to_thread(fetcher.close)
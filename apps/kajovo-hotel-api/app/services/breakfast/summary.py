@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.models import BreakfastOrder, BreakfastStatus
+
+
+@dataclass(frozen=True)
+class BreakfastSummaryCounts:
+    service_date: date
+    total_orders: int
+    total_guests: int
+    status_counts: dict[BreakfastStatus, int] = field(default_factory=dict)
+
+
+def compute_daily_summary(db: Session, service_date: date) -> BreakfastSummaryCounts:
+    rows = db.execute(
+        select(
+            BreakfastOrder.status,
+            func.count(BreakfastOrder.id),
+            func.coalesce(func.sum(BreakfastOrder.guest_count), 0),
+        )
+        .where(BreakfastOrder.service_date == service_date, BreakfastOrder.guest_count > 0)
+        .group_by(BreakfastOrder.status)
+    ).all()
+
+    counts = {status: 0 for status in BreakfastStatus}
+    total_orders = 0
+    total_guests = 0
+    for status_value, order_count, guest_sum in rows:
+        counts[BreakfastStatus(status_value)] += int(order_count)
+        total_orders += int(order_count)
+        total_guests += int(guest_sum)
+    return BreakfastSummaryCounts(
+        service_date=service_date,
+        total_orders=total_orders,
+        total_guests=total_guests,
+        status_counts=counts,
+    )
+
+
+class BreakfastSummaryCache:
+    """Per-process cache of daily summaries, dropped on every breakfast write.
+
+    Writes in this process invalidate immediately; other workers pick up changes
+    after ``ttl_seconds``. A TTL of 0 disables the cache.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._entries: dict[date, tuple[float, BreakfastSummaryCounts]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, service_date: date) -> BreakfastSummaryCounts:
+        if self.ttl_seconds <= 0:
+            return compute_daily_summary(db, service_date)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(service_date)
+            generation = self._generation
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        summary = compute_daily_summary(db, service_date)
+        with self._lock:
+            # An invalidation that raced the query means the result may be stale.
+            if generation == self._generation:
+                self._entries[service_date] = (now + self.ttl_seconds, summary)
+        return summary
+
+    def invalidate(self, *service_dates: date) -> None:
+        """Drop cached summaries for ``service_dates`` (all dates when none given).
+
+        Call after the write is committed so a concurrent read cannot re-cache old data.
+        """
+        with self._lock:
+            self._generation += 1
+            if not service_dates:
+                self._entries.clear()
+                return
+            for service_date in service_dates:
+                self._entries.pop(service_date, None)
+
+
+breakfast_summary_cache = BreakfastSummaryCache(get_settings().breakfast_summary_cache_ttl_seconds)
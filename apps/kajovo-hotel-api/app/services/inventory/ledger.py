@@ -0,0 +1,240 @@
+"""Point-in-time inventory stock from the movement ledger.
+
+``InventoryItem.current_stock`` is the running balance. Every ``InventoryMovement``
+changes it by ``+quantity`` (``in``) or ``-quantity`` (``out``/``adjust``), effective on
+its document date. Per-item stock snapshots bound how many movements a historical
+query or the drift check has to sum; write paths keep later snapshots in step with
+back-dated movements through ``shift_stock_snapshots``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import Date, and_, case, func, insert, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.db.models import (
+    InventoryItem,
+    InventoryMovement,
+    InventoryMovementType,
+    InventoryStockSnapshot,
+)
+
+SIGNED_QUANTITY = case(
+    (InventoryMovement.movement_type == InventoryMovementType.IN.value, InventoryMovement.quantity),
+    else_=-InventoryMovement.quantity,
+)
+# Legacy movements without a document date count from the day they were recorded.
+EFFECTIVE_DATE = func.coalesce(
+    InventoryMovement.document_date,
+    func.date(InventoryMovement.created_at, type_=Date),
+)
+
+
+@dataclass(frozen=True)
+class ItemStock:
+    item_id: int
+    name: str
+    unit: str
+    stock: int
+
+
+@dataclass(frozen=True)
+class StockDrift:
+    item_id: int
+    name: str
+    current_stock: int
+    ledger_stock: int
+    snapshot_date: date
+
+    @property
+    def drift(self) -> int:
+        return self.current_stock - self.ledger_stock
+
+
+def signed_quantity(movement_type: str, quantity: int) -> int:
+    return quantity if movement_type == InventoryMovementType.IN.value else -quantity
+
+
+def movement_effective_date(movement: InventoryMovement) -> date:
+    return movement.document_date or movement.created_at.date()
+
+
+def shift_stock_snapshots(db: Session, deltas: dict[int, int], effective_date: date) -> None:
+    """Apply stock ``deltas`` (item id -> change) to snapshots taken on or after ``effective_date``."""
+    deltas = {item_id: delta for item_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    db.execute(
+        update(InventoryStockSnapshot)
+        .where(
+            InventoryStockSnapshot.item_id.in_(deltas),
+            InventoryStockSnapshot.snapshot_date >= effective_date,
+        )
+        .values(
+            stock=InventoryStockSnapshot.stock
+            + case(deltas, value=InventoryStockSnapshot.item_id, else_=0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _anchor_dates(on: date, *, before: bool):
+    bound = InventoryStockSnapshot.snapshot_date
+    return (
+        select(
+            InventoryStockSnapshot.item_id,
+            (func.max(bound) if before else func.min(bound)).label("anchor_date"),
+        )
+        .where(bound <= on if before else bound > on)
+        .group_by(InventoryStockSnapshot.item_id)
+        .subquery()
+    )
+
+
+def stock_at(db: Session, on: date, item_ids: Sequence[int] | None = None) -> list[ItemStock]:
+    """Stock of each item at the end of ``on``.
+
+    Starts from the latest snapshot on or before ``on`` and adds the movements after
+    it; without one, walks back from the next snapshot (or from ``current_stock``).
+    """
+    before = _anchor_dates(on, before=True)
+    after = _anchor_dates(on, before=False)
+    before_snapshot = aliased(InventoryStockSnapshot)
+    after_snapshot = aliased(InventoryStockSnapshot)
+
+    items_query = (
+        select(
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.unit,
+            InventoryItem.current_stock,
+            before_snapshot.stock,
+            after_snapshot.stock,
+        )
+        .outerjoin(before, before.c.item_id == InventoryItem.id)
+        .outerjoin(
+            before_snapshot,
+            and_(
+                before_snapshot.item_id == InventoryItem.id,
+                before_snapshot.snapshot_date == before.c.anchor_date,
+            ),
+        )
+        .outerjoin(after, after.c.item_id == InventoryItem.id)
+        .outerjoin(
+            after_snapshot,
+            and_(
+                after_snapshot.item_id == InventoryItem.id,
+                after_snapshot.snapshot_date == after.c.anchor_date,
+            ),
+        )
+        .order_by(InventoryItem.name.asc(), InventoryItem.id.asc())
+    )
+
+    forward = and_(before.c.anchor_date.is_not(None), EFFECTIVE_DATE > before.c.anchor_date, EFFECTIVE_DATE <= on)
+    backward = and_(
+        before.c.anchor_date.is_(None),
+        EFFECTIVE_DATE > on,
+        or_(after.c.anchor_date.is_(None), EFFECTIVE_DATE <= after.c.anchor_date),
+    )
+    deltas_query = (
+        select(
+            InventoryMovement.item_id,
+            func.sum(case((forward, SIGNED_QUANTITY), else_=-SIGNED_QUANTITY)),
+        )
+        .outerjoin(before, before.c.item_id == InventoryMovement.item_id)
+        .outerjoin(after, after.c.item_id == InventoryMovement.item_id)
+        .where(or_(forward, backward))
+        .group_by(InventoryMovement.item_id)
+    )
+    if item_ids is not None:
+        items_query = items_query.where(InventoryItem.id.in_(item_ids))
+        deltas_query = deltas_query.where(InventoryMovement.item_id.in_(item_ids))
+
+    deltas = {item_id: int(total or 0) for item_id, total in db.execute(deltas_query)}
+    result: list[ItemStock] = []
+    for item_id, name, unit, current_stock, before_stock, after_stock in db.execute(items_query):
+        if before_stock is not None:
+            base = before_stock
+        elif after_stock is not None:
+            base = after_stock
+        else:
+            base = current_stock
+        result.append(ItemStock(item_id=item_id, name=name, unit=unit, stock=base + deltas.get(item_id, 0)))
+    return result
+
+
+def take_stock_snapshots(db: Session, snapshot_date: date) -> int:
+    """Record the stock of every item at the end of ``snapshot_date``; returns rows added."""
+    existing = set(
+        db.scalars(
+            select(InventoryStockSnapshot.item_id).where(InventoryStockSnapshot.snapshot_date == snapshot_date)
+        )
+    )
+    rows = [
+        {"item_id": row.item_id, "snapshot_date": snapshot_date, "stock": row.stock}
+        for row in stock_at(db, snapshot_date)
+        if row.item_id not in existing
+    ]
+    if rows:
+        db.execute(insert(InventoryStockSnapshot), rows)
+    db.commit()
+    return len(rows)
+
+
+def find_stock_drift(db: Session) -> list[StockDrift]:
+    """Items whose ``current_stock`` disagrees with latest snapshot + later movements.
+
+    Items without any snapshot have no ledger baseline yet and are not checked.
+    """
+    latest = (
+        select(
+            InventoryStockSnapshot.item_id,
+            func.max(InventoryStockSnapshot.snapshot_date).label("anchor_date"),
+        )
+        .group_by(InventoryStockSnapshot.item_id)
+        .subquery()
+    )
+    since_snapshot = dict(
+        db.execute(
+            select(InventoryMovement.item_id, func.sum(SIGNED_QUANTITY))
+            .join(latest, latest.c.item_id == InventoryMovement.item_id)
+            .where(EFFECTIVE_DATE > latest.c.anchor_date)
+            .group_by(InventoryMovement.item_id)
+        ).all()
+    )
+    rows = db.execute(
+        select(
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.current_stock,
+            InventoryStockSnapshot.snapshot_date,
+            InventoryStockSnapshot.stock,
+        )
+        .join(latest, latest.c.item_id == InventoryItem.id)
+        .join(
+            InventoryStockSnapshot,
+            and_(
+                InventoryStockSnapshot.item_id == InventoryItem.id,
+                InventoryStockSnapshot.snapshot_date == latest.c.anchor_date,
+            ),
+        )
+        .order_by(InventoryItem.id.asc())
+    )
+    drift: list[StockDrift] = []
+    for item_id, name, current_stock, snapshot_date, snapshot_stock in rows:
+        ledger_stock = snapshot_stock + int(since_snapshot.get(item_id) or 0)
+        if ledger_stock != current_stock:
+            drift.append(
+                StockDrift(
+                    item_id=item_id,
+                    name=name,
+                    current_stock=current_stock,
+                    ledger_stock=ledger_stock,
+                    snapshot_date=snapshot_date,
+                )
+            )
+    return drift
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.services.inventory.ledger import find_stock_drift, take_stock_snapshots
+from app.time_utils import utc_today
+
+log = logging.getLogger("kajovo.inventory.ledger")
+
+
+@dataclass(frozen=True)
+class InventoryLedgerResult:
+    snapshot_date: str
+    snapshots_created: int
+    drifted_items: int
+
+
+def previous_month_end(today: date) -> date:
+    return today.replace(day=1) - timedelta(days=1)
+
+
+def run_inventory_ledger_iteration(today: date | None = None) -> InventoryLedgerResult:
+    """Take the month-end stock snapshot (once) and check current stock against the ledger."""
+    snapshot_date = previous_month_end(today or utc_today())
+    with SessionLocal() as db:
+        created = take_stock_snapshots(db, snapshot_date)
+        drift = find_stock_drift(db)
+    for row in drift:
+        log.warning(
+            "inventory.stock_drift",
+            extra={
+                "context": {
+                    "item_id": row.item_id,
+                    "current_stock": row.current_stock,
+                    "ledger_stock": row.ledger_stock,
+                    "snapshot_date": row.snapshot_date.isoformat(),
+                }
+            },
+        )
+    result = InventoryLedgerResult(
+        snapshot_date=snapshot_date.isoformat(),
+        snapshots_created=created,
+        drifted_items=len(drift),
+    )
+    log.info("inventory.ledger_checked", extra={"context": {**result.__dict__}})
+    return result
+
+
+async def inventory_ledger_loop() -> None:
+    interval = max(60, int(get_settings().inventory_ledger_interval_seconds))
+    while True:
+        try:
+            await asyncio.to_thread(run_inventory_ledger_iteration)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("Inventory ledger iteration failed")
+        await asyncio.sleep(interval)
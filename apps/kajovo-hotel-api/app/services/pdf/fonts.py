@@ -0,0 +1,203 @@
+"""Fonts for generated PDFs.
+
+``TrueTypeFont`` embeds only the glyphs a document actually draws (a subset of the
+configured TrueType font) as a CID-keyed Type0 font, so Czech text renders as typed
+and stays searchable. ``StandardFont`` is the built-in Helvetica fallback for hosts
+without the font file; it can only show WinAnsi (cp1252) characters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+from app.config import get_settings
+from app.services.pdf.writer import PdfWriter
+
+log = logging.getLogger("kajovo.pdf")
+
+
+@dataclass(frozen=True)
+class FontFace:
+    """Metrics of a TrueType file, parsed once per process."""
+
+    path: Path
+    postscript_name: str
+    cmap: dict[int, int]
+    advances: tuple[int, ...]
+    ascent: int
+    descent: int
+    cap_height: int
+    bbox: tuple[int, int, int, int]
+    italic_angle: float
+
+
+@lru_cache(maxsize=4)
+def load_font_face(path: str) -> FontFace:
+    font = TTFont(path, lazy=True)
+    scale = 1000 / font["head"].unitsPerEm
+    glyph_order = font.getGlyphOrder()
+    glyph_ids = {name: gid for gid, name in enumerate(glyph_order)}
+    hmtx = font["hmtx"]
+    os2 = font["OS/2"] if "OS/2" in font else None
+    head = font["head"]
+    ascent = round(font["hhea"].ascent * scale)
+    return FontFace(
+        path=Path(path),
+        postscript_name="".join(ch for ch in (font["name"].getDebugName(6) or "Font") if ch.isalnum() or ch == "-"),
+        cmap={codepoint: glyph_ids[name] for codepoint, name in font.getBestCmap().items()},
+        advances=tuple(round(hmtx[name][0] * scale) for name in glyph_order),
+        ascent=ascent,
+        descent=round(font["hhea"].descent * scale),
+        cap_height=round((getattr(os2, "sCapHeight", 0) or 0) * scale) or round(ascent * 0.7),
+        bbox=(
+            round(head.xMin * scale),
+            round(head.yMin * scale),
+            round(head.xMax * scale),
+            round(head.yMax * scale),
+        ),
+        italic_angle=float(font["post"].italicAngle),
+    )
+
+
+@lru_cache(maxsize=32)
+def subset_font_program(path: str, gids: tuple[int, ...]) -> bytes:
+    """TrueType program keeping only ``gids``; repeated exports reuse the result."""
+    font = TTFont(path)
+    options = subset.Options()
+    # Keep glyph ids stable so page content can be written before subsetting.
+    options.retain_gids = True
+    options.notdef_outline = True
+    options.name_IDs = ["*"]
+    options.hinting = False
+    options.layout_features = []
+    options.drop_tables = [*options.drop_tables, "FFTM"]
+    subsetter = subset.Subsetter(options=options)
+    subsetter.populate(gids=list(gids))
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    font.save(buffer)
+    return buffer.getvalue()
+
+
+class TrueTypeFont:
+    """A per-document handle that records used glyphs and embeds their subset."""
+
+    def __init__(self, face: FontFace) -> None:
+        self.face = face
+        self._fallback_gid = face.cmap.get(ord("?"), 0)
+        self._used: dict[int, str] = {}
+
+    def _gid(self, char: str) -> int:
+        return self.face.cmap.get(ord(char), self._fallback_gid)
+
+    def width(self, text: str, size: float) -> float:
+        return sum(self.face.advances[self._gid(char)] for char in text) * size / 1000
+
+    def encode(self, text: str) -> str:
+        """Text operand (hex glyph ids) for ``Tj``."""
+        out: list[str] = []
+        for char in text:
+            gid = self._gid(char)
+            self._used.setdefault(gid, char)
+            out.append(f"{gid:04X}")
+        return "<" + "".join(out) + ">"
+
+    def _subset_program(self) -> bytes:
+        return subset_font_program(str(self.face.path), tuple(sorted(self._used)) or (0,))
+
+    def _to_unicode(self) -> bytes:
+        entries = [
+            f"<{gid:04X}> <{''.join(f'{unit:04X}' for unit in _utf16_units(char))}>"
+            for gid, char in sorted(self._used.items())
+        ]
+        blocks = [entries[start : start + 100] for start in range(0, len(entries), 100)]
+        body = "".join(f"{len(block)} beginbfchar\n" + "\n".join(block) + "\nendbfchar\n" for block in blocks)
+        return (
+            "/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+            "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+            "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+            f"{body}endcmap\nCMapName currentdict /CMap defineresource pop\nend\nend\n"
+        ).encode("ascii")
+
+    def write(self, writer: PdfWriter, font_id: int) -> Iterator[bytes]:
+        face = self.face
+        tag = "".join(
+            chr(ord("A") + byte % 26)
+            for byte in hashlib.sha1(repr(sorted(self._used)).encode("ascii")).digest()[:6]
+        )
+        base_font = f"{tag}+{face.postscript_name}"
+        cid_font_id, descriptor_id, file_id, to_unicode_id = (writer.reserve() for _ in range(4))
+        widths = " ".join(f"{gid} [{face.advances[gid]}]" for gid in sorted(self._used))
+        program = self._subset_program()
+
+        yield writer.write_object(
+            font_id,
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{base_font} /Encoding /Identity-H "
+            f"/DescendantFonts [{cid_font_id} 0 R] /ToUnicode {to_unicode_id} 0 R >>",
+        )
+        yield writer.write_object(
+            cid_font_id,
+            f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{base_font} "
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {descriptor_id} 0 R /DW 1000 /W [{widths}] /CIDToGIDMap /Identity >>",
+        )
+        yield writer.write_object(
+            descriptor_id,
+            f"<< /Type /FontDescriptor /FontName /{base_font} /Flags 32 "
+            f"/FontBBox [{' '.join(str(value) for value in face.bbox)}] /ItalicAngle {face.italic_angle:g} "
+            f"/Ascent {face.ascent} /Descent {face.descent} /CapHeight {face.cap_height} "
+            f"/StemV 80 /FontFile2 {file_id} 0 R >>",
+        )
+        yield writer.write_stream(file_id, program, f" /Length1 {len(program)}")
+        yield writer.write_stream(to_unicode_id, self._to_unicode())
+
+
+def _utf16_units(char: str) -> list[int]:
+    data = char.encode("utf-16-be")
+    return [int.from_bytes(data[index : index + 2], "big") for index in range(0, len(data), 2)]
+
+
+class StandardFont:
+    """Helvetica with WinAnsi encoding; characters outside cp1252 become ``?``."""
+
+    # Helvetica has no metrics table here; an average advance is close enough to fit columns.
+    AVERAGE_ADVANCE = 556
+
+    def width(self, text: str, size: float) -> float:
+        return len(text) * self.AVERAGE_ADVANCE * size / 1000
+
+    def encode(self, text: str) -> str:
+        data = text.encode("cp1252", errors="replace")
+        escaped = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        return "(" + escaped.decode("latin-1") + ")"
+
+    def write(self, writer: PdfWriter, font_id: int) -> Iterator[bytes]:
+        yield writer.write_object(
+            font_id, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+        )
+
+
+PdfFont = TrueTypeFont | StandardFont
+
+
+def default_font() -> PdfFont:
+    """A fresh font handle for one document, from ``KAJOVO_API_PDF_FONT_PATH``."""
+    path = get_settings().pdf_font_path.strip()
+    if path and Path(path).is_file():
+        try:
+            return TrueTypeFont(load_font_face(path))
+        except Exception:
+            log.exception("pdf.font_load_failed", extra={"context": {"path": path}})
+    else:
+        log.warning("pdf.font_missing", extra={"context": {"path": path}})
+    return StandardFont()
@@ -0,0 +1,132 @@
+"""Table documents rendered through ``PdfWriter``.
+
+A document is a sequence of ``TableSection`` objects; each section starts on a new A4
+page and its rows flow onto as many pages as needed. Every page repeats the section
+title, subtitle and column header and ends with a footer and page number. Pages are
+streamed as they fill up, and the single font object is shared by all of them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+
+from app.services.pdf.fonts import PdfFont, default_font
+from app.services.pdf.writer import PAGE_HEIGHT, PAGE_WIDTH, PdfWriter
+
+MARGIN = 50
+COLUMN_GAP = 10
+FONT_SIZE = 10
+TITLE_SIZE = 16
+FOOTER_SIZE = 8
+ROW_HEIGHT = 16
+ELLIPSIS = "…"
+
+
+@dataclass(frozen=True)
+class Column:
+    title: str
+    width: float
+    align_right: bool = False
+
+
+@dataclass(frozen=True)
+class TableSection:
+    title: str
+    columns: Sequence[Column]
+    rows: Iterable[Sequence[str]]
+    subtitle: str = ""
+    empty_text: str = "Žádné záznamy."
+
+
+class _Page:
+    def __init__(self, font: PdfFont) -> None:
+        self.font = font
+        self.ops: list[str] = []
+
+    def text(self, value: str, x: float, y: float, size: float = FONT_SIZE) -> None:
+        self.ops.append(f"BT /F1 {size:g} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm {self.font.encode(value)} Tj ET")
+
+    def rule(self, y: float) -> None:
+        self.ops.append(f"0.5 w {MARGIN} {y:.2f} m {PAGE_WIDTH - MARGIN} {y:.2f} l S")
+
+    def fit(self, value: str, width: float, size: float = FONT_SIZE) -> str:
+        if self.font.width(value, size) <= width:
+            return value
+        while value and self.font.width(value + ELLIPSIS, size) > width:
+            value = value[:-1]
+        return value + ELLIPSIS
+
+    def row(self, columns: Sequence[Column], cells: Sequence[str], y: float) -> None:
+        x = MARGIN
+        for column, cell in zip(columns, cells, strict=True):
+            value = self.fit(str(cell), column.width)
+            offset = column.width - self.font.width(value, FONT_SIZE) if column.align_right else 0
+            self.text(value, x + offset, y)
+            x += column.width + COLUMN_GAP
+
+    def content(self) -> bytes:
+        return "\n".join(self.ops).encode("latin-1")
+
+
+def iter_table_pdf(
+    sections: Iterable[TableSection],
+    *,
+    footer: str = "",
+    font: PdfFont | None = None,
+) -> Iterator[bytes]:
+    font = font or default_font()
+    writer = PdfWriter()
+    catalog_id, pages_id, font_id = writer.reserve(), writer.reserve(), writer.reserve()
+    resources = f"<< /Font << /F1 {font_id} 0 R >> >>"
+    page_ids: list[int] = []
+
+    def start_page(section: TableSection) -> tuple[_Page, float]:
+        page = _Page(font)
+        y = PAGE_HEIGHT - MARGIN - TITLE_SIZE
+        page.text(section.title, MARGIN, y, TITLE_SIZE)
+        y -= ROW_HEIGHT + 4
+        if section.subtitle:
+            page.text(section.subtitle, MARGIN, y)
+            y -= ROW_HEIGHT
+        y -= ROW_HEIGHT
+        page.row(section.columns, [column.title for column in section.columns], y)
+        page.rule(y - 5)
+        return page, y - ROW_HEIGHT - 2
+
+    def finish_page(page: _Page) -> Iterator[bytes]:
+        number = f"Strana {len(page_ids) + 1}"
+        if footer:
+            page.text(footer, MARGIN, MARGIN - 20, FOOTER_SIZE)
+        page.text(number, PAGE_WIDTH - MARGIN - font.width(number, FOOTER_SIZE), MARGIN - 20, FOOTER_SIZE)
+        content_id, page_id = writer.reserve(), writer.reserve()
+        yield writer.write_stream(content_id, page.content())
+        yield writer.write_object(
+            page_id,
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {resources} /Contents {content_id} 0 R >>",
+        )
+        page_ids.append(page_id)
+
+    yield writer.header()
+    for section in sections:
+        page, y = start_page(section)
+        empty = True
+        for cells in section.rows:
+            if y < MARGIN + ROW_HEIGHT:
+                yield from finish_page(page)
+                page, y = start_page(section)
+            page.row(section.columns, cells, y)
+            y -= ROW_HEIGHT
+            empty = False
+        if empty:
+            page.text(section.empty_text, MARGIN, y)
+        yield from finish_page(page)
+
+    if not page_ids:
+        raise ValueError("PDF document needs at least one section")
+    yield from font.write(writer, font_id)
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    yield writer.write_object(pages_id, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>")
+    yield writer.write_object(catalog_id, f"<< /Type /Catalog /Pages {pages_id} 0 R >>")
+    yield writer.trailer(catalog_id)
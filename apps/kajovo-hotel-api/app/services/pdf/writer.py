@@ -0,0 +1,61 @@
+"""Incremental PDF 1.4 writer.
+
+Objects are serialised as soon as they are written and returned as byte chunks, so a
+generator can stream a document to the client; only object offsets are kept for the
+cross-reference table. Object numbers can be reserved up front and written later,
+which lets pages refer to a font that is only emitted once all text is known.
+"""
+
+from __future__ import annotations
+
+import zlib
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+
+class PdfWriter:
+    def __init__(self) -> None:
+        self._offsets: dict[int, int] = {}
+        self._next_id = 1
+        self._position = 0
+
+    def reserve(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _emit(self, chunk: bytes) -> bytes:
+        self._position += len(chunk)
+        return chunk
+
+    def header(self) -> bytes:
+        # The binary comment marks the file as binary for transfer tools.
+        return self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def write_object(self, obj_id: int, body: bytes | str) -> bytes:
+        if isinstance(body, str):
+            body = body.encode("latin-1")
+        if obj_id in self._offsets:
+            raise ValueError(f"PDF object {obj_id} written twice")
+        self._offsets[obj_id] = self._position
+        return self._emit(b"%d 0 obj\n" % obj_id + body + b"\nendobj\n")
+
+    def write_stream(self, obj_id: int, data: bytes, entries: str = "", *, compress: bool = True) -> bytes:
+        if compress:
+            data = zlib.compress(data)
+            entries = f"{entries} /Filter /FlateDecode"
+        head = f"<< /Length {len(data)}{entries} >>\nstream\n".encode("latin-1")
+        return self.write_object(obj_id, head + data + b"\nendstream")
+
+    def trailer(self, root_id: int) -> bytes:
+        size = self._next_id
+        missing = [obj_id for obj_id in range(1, size) if obj_id not in self._offsets]
+        if missing:
+            raise ValueError(f"PDF objects reserved but never written: {missing}")
+        xref_offset = self._position
+        lines = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        lines.extend(b"%010d 00000 n \n" % self._offsets[obj_id] for obj_id in range(1, size))
+        lines.append(b"trailer\n<< /Size %d /Root %d 0 R >>\n" % (size, root_id))
+        lines.append(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+        return self._emit(b"".join(lines))
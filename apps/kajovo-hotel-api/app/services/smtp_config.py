@@ -0,0 +1,117 @@
+"""Process-level cache of the stored SMTP configuration.
+
+``portal_smtp_settings`` exists in several historical shapes, so its columns are
+reflected before it is queried. Migrations run before the API workers start, so the
+columns are reflected once per process and database and kept. The parsed
+configuration used to send mail is cached for ``KAJOVO_API_SMTP_CONFIG_CACHE_TTL_SECONDS``;
+``invalidate_smtp_config`` drops it in this process after the settings are saved, and
+other workers pick the change up once the TTL elapses.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Mapping
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.services.mail import StoredSmtpConfig
+
+logger = logging.getLogger("kajovo.api.smtp")
+
+SMTP_TABLE = "portal_smtp_settings"
+CONFIG_COLUMNS = ("from_email", "host", "port", "username", "password_encrypted", "use_tls", "use_ssl")
+
+
+def stored_smtp_config_from_row(row: Mapping[str, object]) -> StoredSmtpConfig:
+    return StoredSmtpConfig(
+        from_email=str(row.get("from_email") or "").strip().lower(),
+        host=str(row.get("host") or ""),
+        port=int(row.get("port") or 587),
+        username=str(row.get("username") or ""),
+        use_tls=bool(True if row.get("use_tls") is None else row.get("use_tls")),
+        use_ssl=bool(False if row.get("use_ssl") is None else row.get("use_ssl")),
+        password_encrypted=str(row.get("password_encrypted") or ""),
+    )
+
+
+class SmtpConfigCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._columns: dict[str, frozenset[str]] = {}
+        self._configs: dict[str, tuple[float, StoredSmtpConfig | None]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(db: Session) -> str:
+        return db.get_bind().engine.url.render_as_string(hide_password=True)
+
+    def columns(self, db: Session) -> frozenset[str]:
+        """Columns of the SMTP settings table; empty when it cannot be inspected."""
+        key = self._key(db)
+        with self._lock:
+            cached = self._columns.get(key)
+        if cached is not None:
+            return cached
+        try:
+            columns = frozenset(str(column["name"]) for column in inspect(db.get_bind()).get_columns(SMTP_TABLE))
+        except Exception:
+            logger.exception("smtp.settings.inspect_failed")
+            db.rollback()
+            return frozenset()
+        if columns:
+            with self._lock:
+                self._columns[key] = columns
+        return columns
+
+    def _load(self, db: Session) -> StoredSmtpConfig | None:
+        columns = self.columns(db)
+        selected_columns = [column for column in CONFIG_COLUMNS if column in columns]
+        if not selected_columns:
+            return None
+        row = db.execute(
+            text(f"SELECT {', '.join(selected_columns)} FROM {SMTP_TABLE} WHERE id = :id"),
+            {"id": 1},
+        ).mappings().first()
+        return stored_smtp_config_from_row(row) if row is not None else None
+
+    def stored_config(self, db: Session) -> StoredSmtpConfig | None:
+        key = self._key(db)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._configs.get(key)
+            generation = self._generation
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        config = self._load(db)
+        with self._lock:
+            # A save that invalidated the cache while this row was read wins.
+            if self.ttl_seconds > 0 and generation == self._generation:
+                self._configs[key] = (now + self.ttl_seconds, config)
+        return config
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._configs.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._columns.clear()
+            self._configs.clear()
+
+
+smtp_config_cache = SmtpConfigCache(get_settings().smtp_config_cache_ttl_seconds)
+
+
+def load_stored_smtp_config(db: Session) -> StoredSmtpConfig | None:
+    return smtp_config_cache.stored_config(db)
+
+
+def invalidate_smtp_config() -> None:
+    smtp_config_cache.invalidate()
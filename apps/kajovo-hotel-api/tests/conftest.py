@@ -131,6 +131,8 @@ def api_base_url(api_db_path: Path) -> Generator[str, None, None]:
     media_root = api_db_path.parent / "media"
     media_root.mkdir(parents=True, exist_ok=True)
     env["KAJOVO_API_MEDIA_ROOT"] = str(media_root)
+    env["KAJOVO_API_MEDIA_UPLOAD_MAX_FILE_BYTES"] = str(1024 * 1024)
+    env["KAJOVO_API_UPLOAD_MAX_REQUEST_BYTES"] = str(4 * 1024 * 1024)
     env["KAJOVO_API_SMTP_CAPTURE_PATH"] = str(api_db_path.parent / "smtp-capture.jsonl")
 
     api_app_dir = Path(__file__).resolve().parents[1]
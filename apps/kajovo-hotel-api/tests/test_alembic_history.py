@@ -18,7 +18,7 @@ def _alembic_config() -> Config:
 
 def test_alembic_has_single_head() -> None:
     script = ScriptDirectory.from_config(_alembic_config())
-    assert script.get_heads() == ["0025_add_smtp_from_email"]
+    assert script.get_heads() == ["0030_index_auth_unlock_tokens_used_at"]
 
 
 def test_alembic_upgrade_head_on_clean_sqlite(
@@ -43,8 +43,15 @@ def test_alembic_upgrade_head_on_clean_sqlite(
     assert "device_access_tokens" in tables
     assert "inventory_cards" in tables
     assert "inventory_card_items" in tables
+    assert "breakfast_mail_sync_state" in tables
+    assert "inventory_document_sequences" in tables
+    assert "inventory_stock_snapshots" in tables
+    assert "media_blobs" in tables
 
     smtp_columns = {column["name"] for column in inspector.get_columns("portal_smtp_settings")}
     assert "from_email" in smtp_columns
     assert "last_test_connected" in smtp_columns
     assert "last_test_send_attempted" in smtp_columns
+
+    unlock_token_indexes = {index["name"] for index in inspector.get_indexes("auth_unlock_tokens")}
+    assert "ix_auth_unlock_tokens_used_at" in unlock_token_indexes
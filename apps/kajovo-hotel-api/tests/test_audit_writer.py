@@ -0,0 +1,106 @@
+import asyncio
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.audit_writer import AuditTrailWriter
+from app.db.models import AuditTrail, Base
+
+
+def _audit_row(index: int) -> dict[str, object]:
+    return {
+        "request_id": f"req-{index}",
+        "actor": "admin@example.com",
+        "actor_id": "admin@example.com",
+        "actor_role": "admin",
+        "module": "reports",
+        "action": "POST",
+        "resource": "/api/v1/reports",
+        "status_code": 201,
+        "detail": None,
+    }
+
+
+def _session_factory(tmp_path) -> sessionmaker[Session]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit-writer.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, class_=Session)
+
+
+def _count_rows(factory: sessionmaker[Session]) -> int:
+    with factory() as db:
+        return int(db.scalar(select(func.count(AuditTrail.id))) or 0)
+
+
+def test_writer_batches_rows_and_flushes_on_stop(tmp_path) -> None:
+    factory = _session_factory(tmp_path)
+    writer = AuditTrailWriter(session_factory=factory, batch_size=50, flush_interval_seconds=30)
+
+    async def _scenario() -> None:
+        writer.start()
+        for index in range(120):
+            await writer.submit(_audit_row(index))
+        await asyncio.sleep(0.2)
+        await writer.stop()
+
+    asyncio.run(_scenario())
+
+    assert _count_rows(factory) == 120
+    stats = writer.stats()
+    assert stats["written"] == 120
+    assert stats["dropped"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["batches"] >= 3
+
+
+def test_writer_drops_rows_when_queue_is_full(tmp_path) -> None:
+    factory = _session_factory(tmp_path)
+    writer = AuditTrailWriter(session_factory=factory, max_queue_size=5, flush_interval_seconds=30)
+
+    async def _scenario() -> None:
+        writer.start()
+        for index in range(20):
+            await writer.submit(_audit_row(index))
+        await writer.stop()
+
+    asyncio.run(_scenario())
+
+    stats = writer.stats()
+    assert stats["dropped"] > 0
+    assert stats["written"] + stats["dropped"] == 20
+    assert _count_rows(factory) == stats["written"]
+
+
+def test_writer_writes_inline_when_not_started(tmp_path) -> None:
+    factory = _session_factory(tmp_path)
+    writer = AuditTrailWriter(session_factory=factory)
+
+    asyncio.run(writer.submit(_audit_row(1)))
+
+    assert _count_rows(factory) == 1
+
+
+def test_failed_batch_is_retried_row_by_row(tmp_path) -> None:
+    factory = _session_factory(tmp_path)
+    writer = AuditTrailWriter(session_factory=factory)
+    rows = [_audit_row(index) for index in range(5)]
+    rows[2]["actor"] = None
+
+    assert writer.write_batch(rows) == 4
+
+    assert _count_rows(factory) == 4
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"]) == (4, 1)
+
+
+def test_unreachable_database_fails_the_batch_once(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'audit-writer.db'}")
+    connect_attempts: list[object] = []
+    event.listen(engine, "do_connect", lambda *args: connect_attempts.append(args))
+    writer = AuditTrailWriter(session_factory=sessionmaker(bind=engine, class_=Session))
+
+    assert writer.write_batch([_audit_row(index) for index in range(5)]) == 0
+
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"]) == (0, 5)
+    assert len(connect_attempts) == 1
@@ -6,6 +6,8 @@ import urllib.request
 from http.cookiejar import CookieJar
 from pathlib import Path
 
+from tests.test_support import wait_for_audit_row
+
 
 def raw_request(
     opener: urllib.request.OpenerDirector,
@@ -166,17 +168,21 @@ def test_admin_can_issue_password_reset_link_and_user_can_finish_reset(
         assert token_row[0] == "password_reset"
         assert token_row[1] is not None
 
-        audit_row = connection.execute(
-            """
-            SELECT detail
-            FROM audit_trail
-            WHERE resource = '/api/auth/reset-password'
-              AND status_code = 200
-            ORDER BY id DESC
-            LIMIT 1
-            """
-        ).fetchone()
-        assert audit_row is not None
-        assert new_password not in audit_row[0]
-        assert '"password_action": "admin_link_reset"' in audit_row[0]
-        assert f'"user_id": {user_id}' in audit_row[0]
+
+    audit_row = wait_for_audit_row(
+        api_db_path,
+        """
+        SELECT detail
+        FROM audit_trail
+        WHERE resource = '/api/auth/reset-password'
+          AND status_code = 200
+          AND detail LIKE ?
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (f'%"user_id": {user_id}%',),
+    )
+    assert audit_row is not None
+    assert new_password not in audit_row[0]
+    assert '"password_action": "admin_link_reset"' in audit_row[0]
+    assert f'"user_id": {user_id}' in audit_row[0]
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.models import AuthSession, AuthUnlockToken, Base, DeviceAccessToken, DeviceChallenge
+from app.services.auth_reaper import AuthRowReaper
+from app.time_utils import utc_now
+
+
+def test_reaper_deletes_only_rows_spent_before_retention_in_batches(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'reaper.db'}")
+    Base.metadata.create_all(engine)
+    now = utc_now()
+    old = now - timedelta(days=10)
+    recent = now - timedelta(days=1)
+    future = now + timedelta(days=1)
+
+    with Session(engine) as db:
+        for index, (expires_at, consumed_at) in enumerate(
+            [(old, None), (old, old), (future, old), (recent, None), (future, recent), (future, None)]
+        ):
+            db.add(
+                DeviceChallenge(
+                    challenge_id=f"challenge-{index}",
+                    device_id="tablet-1",
+                    challenge=f"nonce-{index}",
+                    expires_at=expires_at,
+                    consumed_at=consumed_at,
+                )
+            )
+        for index, (expires_at, revoked_at) in enumerate([(old, None), (future, old), (future, recent), (future, None)]):
+            db.add(
+                DeviceAccessToken(
+                    device_id="tablet-1",
+                    token_hash=f"token-{index}",
+                    expires_at=expires_at,
+                    revoked_at=revoked_at,
+                )
+            )
+            db.add(
+                AuthSession(
+                    session_id=f"session-{index}",
+                    actor_type="admin",
+                    principal="admin@kajovohotel.local",
+                    role="admin",
+                    expires_at=expires_at,
+                    revoked_at=revoked_at,
+                )
+            )
+            db.add(
+                AuthUnlockToken(
+                    actor_type="portal",
+                    principal="user@example.com",
+                    token_hash=f"unlock-{index}",
+                    expires_at=expires_at,
+                    used_at=revoked_at,
+                )
+            )
+        db.commit()
+
+        reaper = AuthRowReaper(retention=timedelta(days=7), batch_size=2)
+        removed = reaper.reap(db, now=now)
+
+        assert removed == {
+            "device_challenges": 3,
+            "device_access_tokens": 2,
+            "auth_sessions": 2,
+            "auth_unlock_tokens": 2,
+        }
+        assert sorted(db.scalars(select(DeviceChallenge.challenge_id))) == [
+            "challenge-3",
+            "challenge-4",
+            "challenge-5",
+        ]
+        assert sorted(db.scalars(select(AuthSession.session_id))) == ["session-2", "session-3"]
+        assert sorted(db.scalars(select(DeviceAccessToken.token_hash))) == ["token-2", "token-3"]
+        assert sorted(db.scalars(select(AuthUnlockToken.token_hash))) == ["unlock-2", "unlock-3"]
+
+        assert reaper.reap(db, now=now) == dict.fromkeys(removed, 0)
+        stats = reaper.stats()
+        assert stats["runs"] == 2
+        assert stats["removed_total"] == removed
+        assert stats["last_removed"] == dict.fromkeys(removed, 0)
@@ -1,4 +1,5 @@
 import json
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -6,9 +7,14 @@ import uuid
 from collections.abc import Callable
 from datetime import date
 from http.cookiejar import CookieJar
+from io import BytesIO
 from pathlib import Path
+from types import SimpleNamespace
+
+from pypdf import PdfReader
 
 from app.services.breakfast.parser import parse_breakfast_pdf, parse_breakfast_text
+from app.services.pdf.breakfast import iter_breakfast_schedules_pdf
 
 ResponseData = dict[str, object] | list[dict[str, object]] | None
 ApiRequest = Callable[..., tuple[int, ResponseData]]
@@ -168,6 +174,95 @@ def test_breakfast_list_filter_and_daily_summary(api_request: ApiRequest) -> Non
     assert summary["status_counts"]["served"] == 1
 
 
+def test_breakfast_daily_summary_reflects_writes_immediately(api_request: ApiRequest) -> None:
+    order = create_order(api_request, service_date="2026-04-18", room_number="301", guest_count=2)
+
+    _, before = api_request("/api/v1/breakfast/daily-summary", params={"service_date": "2026-04-18"})
+    assert isinstance(before, dict)
+    assert before["total_guests"] == 2
+    assert before["status_counts"]["pending"] == 1
+
+    update_status, _ = api_request(
+        f"/api/v1/breakfast/{order['id']}",
+        method="PUT",
+        payload={"status": "served", "guest_count": 4},
+    )
+    assert update_status == 200
+
+    _, after = api_request("/api/v1/breakfast/daily-summary", params={"service_date": "2026-04-18"})
+    assert isinstance(after, dict)
+    assert after["total_orders"] == 1
+    assert after["total_guests"] == 4
+    assert after["status_counts"]["pending"] == 0
+    assert after["status_counts"]["served"] == 1
+
+
+def read_sse_event(response) -> tuple[str, dict[str, object]]:
+    event = ""
+    data = ""
+    while True:
+        line = response.readline().decode("utf-8")
+        assert line, "stream closed"
+        line = line.rstrip("\n")
+        if line.startswith(":"):
+            continue
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = line[len("data: "):]
+        elif not line and event:
+            return event, json.loads(data)
+
+
+def test_breakfast_stream_pushes_status_deltas(api_request: ApiRequest, api_base_url: str) -> None:
+    order = create_order(api_request, service_date="2026-04-19", room_number="401", guest_count=2)
+
+    opener = api_request.opener  # type: ignore[attr-defined]
+    url = f"{api_base_url}/api/v1/breakfast/stream?service_date=2026-04-19"
+    with opener.open(url, timeout=10) as stream:
+        assert stream.headers.get("Content-Type", "").startswith("text/event-stream")
+        event, snapshot = read_sse_event(stream)
+        assert event == "snapshot"
+        assert [item["id"] for item in snapshot["orders"]] == [order["id"]]
+
+        update_status, _ = api_request(
+            f"/api/v1/breakfast/{order['id']}",
+            method="PUT",
+            payload={"status": "served"},
+        )
+        assert update_status == 200
+
+        event, delta = read_sse_event(stream)
+        assert event == "order.updated"
+        assert delta["service_date"] == "2026-04-19"
+        assert delta["orders"][0]["id"] == order["id"]
+        assert delta["orders"][0]["status"] == "served"
+        assert delta["summary"]["status_counts"]["served"] == 1
+
+        reactivate_status, _ = api_request(
+            "/api/v1/breakfast/reactivate-all",
+            method="POST",
+            params={"service_date": "2026-04-19"},
+        )
+        assert reactivate_status == 204
+
+        event, delta = read_sse_event(stream)
+        assert event == "orders.reactivated"
+        assert delta["orders"][0]["status"] == "pending"
+
+        delete_status, _ = api_request(
+            "/api/v1/breakfast/day/delete",
+            method="DELETE",
+            params={"service_date": "2026-04-19"},
+        )
+        assert delete_status == 204
+
+        event, delta = read_sse_event(stream)
+        assert event == "day.replaced"
+        assert delta["orders"] == []
+        assert delta["summary"]["total_orders"] == 0
+
+
 def test_breakfast_daily_list_is_sorted_by_room(api_request: ApiRequest) -> None:
     create_order(
         api_request,
@@ -401,6 +496,52 @@ def test_import_breakfast_pdf_preview_does_not_mutate_existing_orders(
     assert any(item["room_number"] == "111" for item in listed)
 
 
+def test_import_breakfast_pdf_job_parses_in_background(
+    api_request: ApiRequest, api_base_url: str
+) -> None:
+    opener = api_request.opener  # type: ignore[attr-defined]
+    jar = api_request.jar  # type: ignore[attr-defined]
+    payload, content_type = build_multipart(
+        {"save": "true"},
+        [("file", "breakfast-sample.pdf", SAMPLE_PDF_PATH.read_bytes(), "application/pdf")],
+    )
+    request = urllib.request.Request(
+        url=f"{api_base_url}/api/v1/breakfast/import/jobs",
+        data=payload,
+        headers={"Content-Type": content_type, **csrf_header(jar)},
+        method="POST",
+    )
+    with opener.open(request, timeout=10) as response:
+        assert response.status == 202
+        job = json.loads(response.read().decode("utf-8"))
+    assert job["status"] in {"queued", "parsing", "saving", "completed"}
+    assert job["filename"] == "breakfast-sample.pdf"
+
+    deadline = time.monotonic() + 30
+    while job["status"] not in {"completed", "failed"} and time.monotonic() < deadline:
+        time.sleep(0.2)
+        status, polled = api_request(f"/api/v1/breakfast/import/{job['job_id']}")
+        assert status == 200
+        assert isinstance(polled, dict)
+        job = polled
+
+    assert job["status"] == "completed", job
+    assert job["progress"] == 100
+    assert job["saved"] is True
+    assert job["date"] == "2026-03-05"
+    assert len(job["items"]) == 3
+
+    status, listed = api_request("/api/v1/breakfast", params={"service_date": "2026-03-05"})
+    assert status == 200
+    assert isinstance(listed, list)
+    assert len(listed) == 3
+
+    missing_status, missing = api_request("/api/v1/breakfast/import/unknown-job")
+    assert missing_status == 404
+    assert isinstance(missing, dict)
+    assert missing["detail"] == "Breakfast import job not found"
+
+
 def test_breakfast_export_pdf(api_request: ApiRequest, api_base_url: str) -> None:
     target_date = "2026-03-09"
     create_order(
@@ -423,7 +564,9 @@ def test_breakfast_export_pdf(api_request: ApiRequest, api_base_url: str) -> Non
             assert response.headers.get("content-type") == "application/pdf"
             content = response.read()
             assert content.startswith(b"%PDF-")
-            assert b"Datum: 2026-03-09" in content
+            text = PdfReader(BytesIO(content)).pages[0].extract_text()
+            assert "Datum: 2026-03-09" in text
+            assert "Export Test" in text
     except urllib.error.HTTPError as exc:
         detail = exc.read().decode("utf-8", errors="ignore")
         raise AssertionError(f"Export request failed: {exc.code} {exc.reason} {detail}") from exc
@@ -458,6 +601,78 @@ def test_breakfast_reactivation_rbac(api_base_url: str, api_request: ApiRequest)
     assert data["status"] == "pending"
 
 
+def test_breakfast_bulk_status_update(api_base_url: str, api_request: ApiRequest) -> None:
+    first = create_order(api_request, service_date="2026-04-20", room_number="501")
+    second = create_order(api_request, service_date="2026-04-20", room_number="502")
+    already_served = create_order(api_request, service_date="2026-04-20", room_number="503", status="served")
+
+    snidane_request = portal_request(api_base_url, "snidane@example.com", "snidane-pass")
+    status, data = snidane_request(
+        "/api/v1/breakfast/bulk",
+        method="PATCH",
+        payload={"items": [{"id": first["id"], "status": "pending"}]},
+    )
+    assert status == 403
+    assert isinstance(data, dict)
+    assert data["detail"] == "Breakfast role can only mark orders as served"
+
+    status, data = snidane_request(
+        "/api/v1/breakfast/bulk",
+        method="PATCH",
+        payload={
+            "items": [
+                {"id": first["id"], "status": "served"},
+                {"id": second["id"], "status": "served"},
+                {"id": already_served["id"], "status": "served"},
+                {"id": 999999, "status": "served"},
+            ]
+        },
+    )
+    assert status == 200
+    assert isinstance(data, list)
+    assert sorted(int(item["id"]) for item in data) == sorted([int(first["id"]), int(second["id"])])
+    assert {item["status"] for item in data} == {"served"}
+
+    _, summary = api_request("/api/v1/breakfast/daily-summary", params={"service_date": "2026-04-20"})
+    assert isinstance(summary, dict)
+    assert summary["status_counts"]["served"] == 3
+
+    status, data = api_request(
+        "/api/v1/breakfast/bulk",
+        method="PATCH",
+        payload={
+            "items": [
+                {"id": first["id"], "status": "pending"},
+                {"id": first["id"], "status": "cancelled"},
+            ]
+        },
+    )
+    assert status == 200
+    assert isinstance(data, list)
+    assert [(item["id"], item["status"]) for item in data] == [(first["id"], "cancelled")]
+
+
+def test_breakfast_schedules_pdf_puts_each_day_on_its_own_pages() -> None:
+    days = [
+        (
+            date(2026, 5, day),
+            [
+                SimpleNamespace(room_number=str(100 + room), guest_name=f"Host Řehoř {room}", guest_count=2, status="pending")
+                for room in range(room_count)
+            ],
+        )
+        for day, room_count in ((1, 3), (2, 0), (3, 60))
+    ]
+
+    reader = PdfReader(BytesIO(b"".join(iter_breakfast_schedules_pdf(days))), strict=True)
+    texts = [page.extract_text() for page in reader.pages]
+    assert len(texts) == 4
+    assert ["Datum: 2026-05-01" in texts[0], "Datum: 2026-05-02" in texts[1]] == [True, True]
+    assert "Žádné záznamy." in texts[1]
+    assert all("Datum: 2026-05-03" in text for text in texts[2:])
+    assert "Strana 4" in texts[3]
+
+
 def test_breakfast_role_cannot_import_or_export_pdf(api_base_url: str) -> None:
     snidane_request = portal_request(api_base_url, "snidane@example.com", "snidane-pass")
     status, data = snidane_request(
@@ -0,0 +1,108 @@
+from datetime import date
+from email.message import EmailMessage
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.models import Base, BreakfastMailSyncState, BreakfastOrder
+from app.services.breakfast.mail_fetcher import BreakfastMailFetcher
+from tests.test_breakfast import SAMPLE_PDF_PATH
+
+SAMPLE_DAY = date(2026, 3, 5)
+
+
+def _message(sender: str, subject: str, pdf: bytes | None = None) -> bytes:
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["Subject"] = subject
+    msg.set_content("Prehled stravy")
+    if pdf is not None:
+        msg.add_attachment(pdf, maintype="application", subtype="pdf", filename="prehled.pdf")
+    return msg.as_bytes()
+
+
+class FakeImap:
+    def __init__(self, messages: dict[int, bytes], uid_validity: int = 7) -> None:
+        self.messages = messages
+        self.uid_validity = uid_validity
+        self.body_fetches: list[int] = []
+        self.header_fetches: list[str] = []
+        self.logged_out = False
+
+    def noop(self):
+        return "OK", [b""]
+
+    def select(self, mailbox, readonly=False):
+        return "OK", [str(len(self.messages)).encode()]
+
+    def response(self, code):
+        return code, [str(self.uid_validity).encode()]
+
+    def uid(self, command, *args):
+        if command == "SEARCH":
+            low = int(args[2].split(":")[0])
+            found = [uid for uid in self.messages if uid >= low] or [max(self.messages)]
+            return "OK", [" ".join(str(uid) for uid in sorted(found)).encode()]
+        uids = [int(value) for value in args[0].split(",")]
+        if "HEADER.FIELDS" in args[1]:
+            self.header_fetches.append(args[0])
+            data = []
+            for uid in uids:
+                header = self.messages[uid].split(b"\n\n", 1)[0] + b"\n\n"
+                # Send the UID after the literal, as some servers do.
+                data.extend([(b"%d (BODY[HEADER.FIELDS (FROM SUBJECT)] {%d}" % (uid, len(header)), header), b" UID %d)" % uid])
+            return "OK", data
+        self.body_fetches.extend(uids)
+        return "OK", [(b"%d (UID %d BODY[] {%d}" % (uid, uid, len(self.messages[uid])), self.messages[uid]) for uid in uids]
+
+    def logout(self):
+        self.logged_out = True
+        return "BYE", [b""]
+
+
+def _fetcher(tmp_path, client: FakeImap) -> BreakfastMailFetcher:
+    settings = get_settings().model_copy(
+        update={
+            "media_root": str(tmp_path / "media"),
+            "breakfast_imap_host": "imap.local",
+            "breakfast_imap_username": "breakfast",
+            "breakfast_imap_password": "secret",
+        }
+    )
+    fetcher = BreakfastMailFetcher(settings)
+    fetcher._connect = lambda: client
+    return fetcher
+
+
+def test_mail_fetcher_only_downloads_new_matching_messages(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'mail.db'}")
+    Base.metadata.create_all(bind=engine)
+    pdf = SAMPLE_PDF_PATH.read_bytes()
+    client = FakeImap(
+        {
+            3: _message("news@example.com", "Newsletter"),
+            4: _message("reports@better-hotel.com", "Prehled stravy", pdf),
+        }
+    )
+    fetcher = _fetcher(tmp_path, client)
+
+    with Session(engine) as db:
+        assert fetcher.fetch_and_store_for_day(db, SAMPLE_DAY) is True
+        assert client.body_fetches == [4]
+        assert db.scalar(select(func.count(BreakfastOrder.id))) > 0
+        state = db.scalar(select(BreakfastMailSyncState))
+        assert (state.uid_validity, state.last_seen_uid) == (7, 4)
+
+        # Nothing new: the same messages are neither re-downloaded nor re-imported.
+        assert fetcher.fetch_and_store_for_day(db, SAMPLE_DAY) is False
+        assert client.body_fetches == [4]
+        assert client.header_fetches == ["3,4"]
+
+        # A new UIDVALIDITY epoch invalidates the stored high-water mark.
+        client.uid_validity = 8
+        assert fetcher.fetch_and_store_for_day(db, SAMPLE_DAY) is True
+        assert client.body_fetches == [4, 4]
+
+    fetcher.close()
+    assert client.logged_out is True
@@ -95,6 +95,23 @@ def test_device_register_challenge_verify_status(api_base_url: str) -> None:
     assert bearer_status_payload["device_id"] == "housekeeping-01"
     assert bearer_status_payload["token_expires_at"] is not None
 
+    # Status polls are served from the token cache; re-registering revokes the token.
+    with urllib.request.urlopen(bearer_req, timeout=45) as response:
+        assert response.status == 200
+    status, _ = _json_request(
+        api_base_url=api_base_url,
+        path="/api/v1/device/register",
+        payload={"device_id": "housekeeping-01", "bootstrap_key": "test-device-bootstrap-key"},
+    )
+    assert status == 200
+    status, _ = _json_request(
+        api_base_url=api_base_url,
+        path="/api/v1/device/status",
+        method="GET",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert status == 401
+
 
 def test_device_verify_rejects_bad_signature(api_base_url: str) -> None:
     status, registered = _json_request(
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from app.security.device_tokens import DeviceTokenCache, DeviceTokenGrant
+from app.time_utils import utc_now
+
+
+def _grant(token_hash: str, *, device_id: str = "tablet-01", token_expires_at=None) -> DeviceTokenGrant:
+    now = utc_now()
+    return DeviceTokenGrant(
+        token_hash=token_hash,
+        device_id=device_id,
+        display_name="Tablet",
+        status="active",
+        registered_at=now,
+        last_seen_at=now,
+        token_expires_at=token_expires_at or now + timedelta(hours=1),
+    )
+
+
+def test_device_token_cache_expires_with_ttl_and_token_expiry() -> None:
+    cache = DeviceTokenCache(ttl_seconds=30)
+    now = utc_now()
+    cache.put(_grant("a" * 64), now=now)
+    cache.put(_grant("b" * 64, token_expires_at=now + timedelta(seconds=5)), now=now)
+
+    assert cache.get("a" * 64, now + timedelta(seconds=10)) is not None
+    assert cache.get("a" * 64, now + timedelta(seconds=31)) is None
+    assert cache.get("b" * 64, now + timedelta(seconds=6)) is None
+
+
+def test_device_token_cache_invalidation_blocks_recaching_revoked_tokens() -> None:
+    cache = DeviceTokenCache(ttl_seconds=30)
+    now = utc_now()
+    cache.put(_grant("a" * 64), now=now)
+    cache.put(_grant("c" * 64, device_id="tablet-02"), now=now)
+
+    cache.invalidate_device("tablet-01")
+    assert cache.get("a" * 64, now) is None
+    assert cache.get("c" * 64, now) is not None
+
+    cache.put(_grant("a" * 64), now=now)
+    assert cache.get("a" * 64, now) is None
+
+
+def test_device_token_cache_records_last_seen() -> None:
+    cache = DeviceTokenCache(ttl_seconds=30)
+    now = utc_now()
+    cache.put(_grant("a" * 64), now=now)
+    later = now + timedelta(seconds=90)
+    cache.mark_seen("a" * 64, later)
+
+    cached = cache.get("a" * 64, now)
+    assert cached is not None
+    assert cached.last_seen_at == later
+
+
+def test_device_token_cache_evicts_expired_entries_on_put() -> None:
+    cache = DeviceTokenCache(ttl_seconds=30)
+    now = utc_now()
+    for index in range(5):
+        cache.put(_grant(f"{index:064d}", device_id=f"tablet-{index}"), now=now)
+
+    cache.put(_grant("f" * 64), now=now + timedelta(seconds=31))
+
+    assert list(cache._entries) == ["f" * 64]
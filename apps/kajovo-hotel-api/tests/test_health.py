@@ -1,8 +1,7 @@
-import sqlite3
 from collections.abc import Callable
 from pathlib import Path
 
-from tests.test_support import admin_email
+from tests.test_support import admin_email, wait_for_audit_row
 
 ResponseData = dict[str, object] | list[dict[str, object]] | None
 ApiRequest = Callable[..., tuple[int, ResponseData]]
@@ -36,14 +35,22 @@ def test_write_requests_are_audited(
     delete_status, _ = api_request(f"/api/v1/reports/{created['id']}", method="DELETE")
     assert delete_status == 204
 
-    conn = sqlite3.connect(str(api_db_path))
-    try:
-        row = conn.execute(
-            "SELECT actor, module, action, resource, status_code "
-            "FROM audit_trail WHERE action = 'POST' "
-            "ORDER BY id DESC LIMIT 1"
-        ).fetchone()
-    finally:
-        conn.close()
+    row = wait_for_audit_row(
+        api_db_path,
+        "SELECT actor, module, action, resource, status_code "
+        "FROM audit_trail WHERE action = 'POST' AND resource = '/api/v1/reports' "
+        "AND detail LIKE '%Leak in room 201%' "
+        "ORDER BY id DESC LIMIT 1",
+    )
 
     assert row == (admin_email(), "reports", "POST", "/api/v1/reports", 201)
+
+
+def test_ready_pool_reports_pool_statistics(api_request: ApiRequest) -> None:
+    status, payload = api_request("/ready/pool")
+    assert status == 200
+    assert isinstance(payload, dict)
+    pool = payload.get("pool")
+    assert isinstance(pool, dict)
+    assert pool.get("pool_class")
+    assert {"size", "checked_in", "checked_out", "overflow"} <= set(pool)
@@ -1,8 +1,26 @@
+import json
 import urllib.error
+import urllib.parse
 import urllib.request
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from http.cookiejar import CookieJar
+from io import BytesIO
 from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi import Response
+from pypdf import PdfReader
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.api.pagination import NEXT_CURSOR_HEADER, PageRequest, paginate
+from app.api.routes.inventory import ITEM_SORT, MOVEMENT_SORT
+from app.db.models import Base, InventoryItem, InventoryMovement
+from app.services.inventory.ledger import take_stock_snapshots
+from app.services.pdf.fonts import TrueTypeFont, default_font
+from app.services.pdf.inventory import iter_inventory_stocktake_pdf
 
 ResponseData = dict[str, object] | list[dict[str, object]] | None
 ApiRequest = Callable[..., tuple[int, ResponseData]]
@@ -291,3 +309,259 @@ def test_inventory_item_management_matches_sklad_scope(
         assert False, "Expected 403 for portal stocktake export"
     except urllib.error.HTTPError as exc:
         assert exc.code == 403
+
+
+def test_inventory_movements_keyset_pagination(api_request: ApiRequest, api_base_url: str) -> None:
+    item = create_item(api_request, name="Strankovani", min_stock=0, current_stock=100)
+    for day in (1, 2, 2, 3, 4):
+        status, _ = api_request(
+            f"/api/v1/inventory/{item['id']}/movements",
+            method="POST",
+            payload={"movement_type": "out", "quantity": 1, "document_date": f"2026-04-0{day}"},
+        )
+        assert status == 200
+
+    opener = api_request.opener  # type: ignore[attr-defined]
+    all_status, everything = api_request("/api/v1/inventory/movements", params={"item_id": str(item["id"])})
+    assert all_status == 200
+    assert isinstance(everything, list)
+    assert len(everything) == 5
+
+    collected: list[int] = []
+    cursor: str | None = None
+    pages = 0
+    for _ in range(10):
+        params = {"item_id": str(item["id"]), "limit": "2"}
+        if cursor:
+            params["cursor"] = cursor
+        url = f"{api_base_url}/api/v1/inventory/movements?{urllib.parse.urlencode(params)}"
+        with opener.open(url, timeout=10) as response:
+            page = json.loads(response.read().decode("utf-8"))
+            cursor = response.headers.get("X-Next-Cursor")
+        pages += 1
+        assert len(page) <= 2
+        collected.extend(int(row["id"]) for row in page)
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert collected == [int(row["id"]) for row in everything]
+
+    bad_status, bad = api_request("/api/v1/inventory/movements", params={"limit": "2", "cursor": "not-a-cursor"})
+    assert bad_status == 400
+    assert isinstance(bad, dict)
+    assert bad["detail"] == "Invalid cursor"
+
+
+def _page(db: Session, query, keys, cursor: str | None) -> tuple[list, str | None]:
+    response = Response()
+    rows = paginate(db, query, keys, PageRequest(limit=2, cursor=cursor), response)
+    return rows, response.headers.get(NEXT_CURSOR_HEADER)
+
+
+def test_keyset_cursor_survives_renamed_or_deleted_anchor_rows(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'paging.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        items = [InventoryItem(name=name, unit="ks") for name in "ABCDEF"]
+        db.add_all(items)
+        db.flush()
+        start = datetime(2026, 4, 1, 8, 0, 0, 123456)
+        for index, document_date in enumerate([date(2026, 4, 3), date(2026, 4, 2), date(2026, 4, 2), None, None]):
+            db.add(
+                InventoryMovement(
+                    item_id=items[0].id,
+                    movement_type="out",
+                    quantity=1,
+                    document_date=document_date,
+                    created_at=start - timedelta(minutes=index),
+                )
+            )
+        db.commit()
+
+        first, cursor = _page(db, select(InventoryItem), ITEM_SORT, None)
+        assert [item.name for item in first] == ["A", "B"]
+        # Renaming the anchor must not move the next page to its new position.
+        first[-1].name = "Z"
+        db.commit()
+        second, cursor = _page(db, select(InventoryItem), ITEM_SORT, cursor)
+        assert [item.name for item in second] == ["C", "D"]
+        # Deleting the anchor must not invalidate the cursor.
+        db.delete(second[-1])
+        db.commit()
+        third, cursor = _page(db, select(InventoryItem), ITEM_SORT, cursor)
+        assert [item.name for item in third] == ["E", "F"]
+
+        # Date, timestamp (with microseconds) and NULL anchors, each deleted after reading.
+        movements = select(InventoryMovement)
+        expected = [row.id for row in paginate(db, movements, MOVEMENT_SORT, PageRequest(), Response())]
+        collected: list[int] = []
+        cursor = None
+        for _ in range(5):
+            page, cursor = _page(db, movements, MOVEMENT_SORT, cursor)
+            collected.extend(row.id for row in page)
+            db.delete(page[-1])
+            db.commit()
+            if not cursor:
+                break
+        assert len(expected) == 5
+        assert collected == expected
+
+
+def test_inventory_document_numbers_are_gapless_under_concurrent_cards(api_request: ApiRequest) -> None:
+    created = create_item(api_request, name="Ovesne vlocky", unit="g", current_stock=100)
+    card_payload = {
+        "card_type": "in",
+        "card_date": "2031-01-15",
+        "reference": "DL-2031-0001",
+        "items": [{"ingredient_id": created["id"], "quantity_base": 5, "quantity_pieces": 0}],
+    }
+
+    def _create_card(_: int) -> tuple[int, ResponseData]:
+        return api_request("/api/v1/inventory/cards", method="POST", payload=card_payload)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_create_card, range(4)))
+    assert [status for status, _ in results] == [201] * 4
+
+    status, data = api_request(
+        f"/api/v1/inventory/{created['id']}/movements",
+        method="POST",
+        payload={
+            "movement_type": "in",
+            "quantity": 1,
+            "document_date": "2031-02-01",
+            "document_reference": "DL-2031-0002",
+        },
+    )
+    assert status == 200
+    assert isinstance(data, dict)
+    numbers = {str(card["number"]) for _, card in results if isinstance(card, dict)}
+    numbers |= {str(movement["document_number"]) for movement in data["movements"]}
+    assert numbers == {f"PR-2031-{value:04d}" for value in range(1, 6)}
+
+
+def test_inventory_card_lines_update_stock_and_match_detail(api_request: ApiRequest) -> None:
+    flour = create_item(api_request, name="Mouka hladka", unit="g", current_stock=1000)
+    sugar = create_item(api_request, name="Cukr krystal", unit="g", current_stock=300)
+
+    status, card = api_request(
+        "/api/v1/inventory/cards",
+        method="POST",
+        payload={
+            "card_type": "out",
+            "card_date": "2032-05-02",
+            "note": "Snidane",
+            "items": [
+                {"ingredient_id": flour["id"], "quantity_base": 200},
+                {"ingredient_id": sugar["id"], "quantity_base": 100, "note": "Buchty"},
+                {"ingredient_id": flour["id"], "quantity_base": 300},
+            ],
+        },
+    )
+    assert status == 201
+    assert isinstance(card, dict)
+    assert card["number"] == "VY-2032-0001"
+    assert [(line["ingredient_name"], line["quantity_base"]) for line in card["items"]] == [
+        ("Mouka hladka", 200),
+        ("Cukr krystal", 100),
+        ("Mouka hladka", 300),
+    ]
+    assert api_request(f"/api/v1/inventory/cards/{card['id']}")[1] == card
+
+    status, flour_detail = api_request(f"/api/v1/inventory/{flour['id']}")
+    assert status == 200
+    assert isinstance(flour_detail, dict)
+    assert flour_detail["current_stock"] == 500
+    assert sorted(movement["quantity"] for movement in flour_detail["movements"]) == [200, 300]
+    assert {movement["note"] for movement in flour_detail["movements"]} == {"Snidane"}
+
+    # Lines for the same ingredient are checked against stock together.
+    status, _ = api_request(
+        "/api/v1/inventory/cards",
+        method="POST",
+        payload={
+            "card_type": "out",
+            "card_date": "2032-05-03",
+            "items": [
+                {"ingredient_id": sugar["id"], "quantity_base": 150},
+                {"ingredient_id": sugar["id"], "quantity_base": 150},
+            ],
+        },
+    )
+    assert status == 400
+    assert api_request(f"/api/v1/inventory/{sugar['id']}")[1]["current_stock"] == 200
+
+
+def test_inventory_stock_at_uses_snapshots_and_reports_drift(api_request: ApiRequest, api_db_path: Path) -> None:
+    honey = create_item(api_request, name="Med lesni", unit="g", current_stock=10)
+
+    def _move(movement_type: str, quantity: int, document_date: str) -> None:
+        status, _ = api_request(
+            f"/api/v1/inventory/{honey['id']}/movements",
+            method="POST",
+            payload={
+                "movement_type": movement_type,
+                "quantity": quantity,
+                "document_date": document_date,
+                "document_reference": "DL-LEDGER",
+            },
+        )
+        assert status == 200
+
+    def _stock_at(on: str) -> int:
+        status, data = api_request(
+            "/api/v1/inventory/stock-at", params={"date": on, "item_id": str(honey["id"])}
+        )
+        assert status == 200
+        assert isinstance(data, list) and len(data) == 1
+        assert data[0]["stock_date"] == on
+        return int(data[0]["stock"])
+
+    _move("in", 5, "2030-01-10")
+    _move("out", 3, "2030-02-10")
+    _move("in", 4, "2030-03-10")
+    assert [_stock_at(on) for on in ("2029-12-31", "2030-01-31", "2030-02-28", "2030-03-31")] == [10, 15, 12, 16]
+
+    engine = create_engine(f"sqlite:///{api_db_path}")
+    with Session(engine) as db:
+        assert take_stock_snapshots(db, date(2030, 1, 31)) > 0
+        assert take_stock_snapshots(db, date(2030, 1, 31)) == 0
+
+    # A back-dated movement shifts the later snapshot, so both directions stay exact.
+    _move("out", 2, "2030-01-20")
+    assert [_stock_at(on) for on in ("2030-01-15", "2030-01-31", "2030-02-28")] == [15, 13, 10]
+
+    status, drift = api_request("/api/v1/inventory/stock-drift")
+    assert status == 200
+    assert isinstance(drift, list)
+    assert all(row["item_id"] != honey["id"] for row in drift)
+
+    with engine.begin() as connection:
+        connection.execute(
+            text("UPDATE inventory_items SET current_stock = current_stock + 7 WHERE id = :id"),
+            {"id": honey["id"]},
+        )
+    status, drift = api_request("/api/v1/inventory/stock-drift")
+    assert status == 200
+    assert isinstance(drift, list)
+    row = next(row for row in drift if row["item_id"] == honey["id"])
+    assert (row["current_stock"], row["ledger_stock"], row["drift"]) == (21, 14, 7)
+    engine.dispose()
+
+
+def test_inventory_stocktake_pdf_paginates_all_items_with_czech_text() -> None:
+    items = [
+        SimpleNamespace(name=f"Žluťoučký čaj {index:03d}", unit="g", current_stock=index, amount_per_piece_base=50)
+        for index in range(230)
+    ]
+    font = default_font()
+    content = b"".join(iter_inventory_stocktake_pdf(items, stock_date=date(2026, 3, 5), font=font))
+
+    reader = PdfReader(BytesIO(content), strict=True)
+    assert len(reader.pages) > 1
+    text = "\n".join(page.extract_text() for page in reader.pages)
+    if isinstance(font, TrueTypeFont):
+        assert all(f"Žluťoučký čaj {index:03d}" in text for index in range(230))
+    else:
+        assert all(f"{index:03d}" in text for index in range(230))
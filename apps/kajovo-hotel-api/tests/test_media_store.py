@@ -0,0 +1,192 @@
+import io
+from datetime import timedelta
+
+from PIL import Image
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from app.api.media import media_file_response
+from app.config import get_settings
+from app.db.models import Base, MediaBlob, Report, ReportPhoto
+from app.media.blobs import collect_media_garbage, release_blobs, retain_blob
+from app.media.storage import MediaStorage
+from app.media.thumbnails import ThumbnailPipeline
+from app.time_utils import utc_now
+
+
+def _png(color: tuple[int, int, int]) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_identical_uploads_share_one_blob_until_garbage_collected(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'media.db'}")
+    Base.metadata.create_all(engine)
+    pipeline = ThumbnailPipeline(workers=1)
+    storage = MediaStorage(str(tmp_path / "media"), thumbnails=pipeline)
+    photo = _png((10, 120, 200))
+
+    with Session(engine) as db:
+        report = Report(title="Okno", description="Pokoj 12", status="open")
+        db.add(report)
+        db.flush()
+        stored = []
+        for sort_order in range(2):
+            item = storage.store_image(src_file=io.BytesIO(photo))
+            retain_blob(db, item, storage)
+            db.add(
+                ReportPhoto(
+                    report_id=report.id,
+                    sort_order=sort_order,
+                    file_path=item.original_relpath,
+                    thumb_path=item.thumb_relpath,
+                    size_bytes=item.bytes,
+                )
+            )
+            stored.append(item)
+        db.commit()
+        pipeline.shutdown()
+
+        first, second = stored
+        assert first == second
+        assert first.original_relpath == f"blobs/{first.sha256[:2]}/{first.sha256[2:4]}/{first.sha256}.png"
+        blob_dir = storage.resolve(first.original_relpath).parent
+        assert sorted(path.name for path in blob_dir.iterdir()) == sorted(
+            [f"{first.sha256}.png", f"{first.sha256}_list.webp", f"{first.sha256}_detail.webp", f"{first.sha256}_full.webp"]
+        )
+        blob = db.get(MediaBlob, first.sha256)
+        assert blob is not None
+        assert (blob.ref_count, blob.size_bytes, blob.released_at) == (2, len(photo), None)
+
+        # An upload whose transaction never committed leaves a file no row knows about.
+        orphan = storage.store_image(src_file=io.BytesIO(_png((250, 0, 0))))
+        retain_blob(db, orphan, storage)
+        db.rollback()
+        pipeline.shutdown()
+
+        later = utc_now() + timedelta(days=2)
+        kept = collect_media_garbage(db, storage, grace=timedelta(days=1))
+        assert (kept.deleted_blobs, kept.deleted_files) == (0, 0)
+
+        release_blobs(db, [row.file_path for row in report.photos])
+        db.delete(report)
+        db.commit()
+        db.refresh(blob)
+        assert blob.ref_count == 0
+        assert blob.released_at is not None
+
+        # Released blobs survive the grace period, so a retried upload can still reuse them.
+        assert collect_media_garbage(db, storage, grace=timedelta(days=1)).deleted_blobs == 0
+
+        result = collect_media_garbage(db, storage, grace=timedelta(days=1), now=later)
+        assert result.deleted_blobs == 1
+        assert result.deleted_files == 8
+        assert db.scalars(select(MediaBlob)).all() == []
+        assert not storage.resolve(first.original_relpath).exists()
+        assert not storage.resolve(orphan.original_relpath).exists()
+
+
+def test_garbage_collector_recounts_references_before_deleting(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'media.db'}")
+    Base.metadata.create_all(engine)
+    pipeline = ThumbnailPipeline(workers=1)
+    storage = MediaStorage(str(tmp_path / "media"), thumbnails=pipeline)
+
+    with Session(engine) as db:
+        report = Report(title="Dveře", description="Pokoj 3", status="open")
+        db.add(report)
+        db.flush()
+        stored = storage.store_image(src_file=io.BytesIO(_png((0, 90, 0))))
+        retain_blob(db, stored, storage)
+        db.add(
+            ReportPhoto(
+                report_id=report.id,
+                file_path=stored.original_relpath,
+                thumb_path=stored.thumb_relpath,
+                size_bytes=stored.bytes,
+            )
+        )
+        db.commit()
+        pipeline.shutdown()
+        # A release for a row that still exists (a bug) must not lose the file.
+        release_blobs(db, [stored.original_relpath])
+        db.commit()
+
+        result = collect_media_garbage(db, storage, grace=timedelta(0), now=utc_now() + timedelta(days=2))
+        assert result.recounted_blobs == 1
+        assert result.deleted_blobs == 0
+        assert db.get(MediaBlob, stored.sha256).ref_count == 1
+        assert storage.resolve(stored.original_relpath).exists()
+
+
+def test_upload_staged_while_blob_is_collected_writes_the_file_back(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'media.db'}")
+    Base.metadata.create_all(engine)
+    pipeline = ThumbnailPipeline(workers=1)
+    storage = MediaStorage(str(tmp_path / "media"), thumbnails=pipeline)
+    photo = _png((200, 200, 0))
+
+    with Session(engine) as db:
+        first = storage.store_image(src_file=io.BytesIO(photo))
+        retain_blob(db, first, storage)
+        db.commit()
+        release_blobs(db, [first.original_relpath])
+        db.get(MediaBlob, first.sha256).released_at = utc_now() - timedelta(days=2)
+        db.commit()
+        pipeline.shutdown()
+
+        # The same content is staged before the collector runs and retained after it.
+        again = storage.store_image(src_file=io.BytesIO(photo))
+        result = collect_media_garbage(db, storage, grace=timedelta(days=1))
+        assert result.deleted_blobs == 1
+        assert again.staged_path is not None and again.staged_path.exists()
+        assert not storage.resolve(first.original_relpath).exists()
+
+        retain_blob(db, again, storage)
+        db.commit()
+        pipeline.shutdown()
+
+        assert storage.resolve(again.original_relpath).read_bytes() == photo
+        assert storage.resolve(again.thumb_relpath).exists()
+        assert db.get(MediaBlob, again.sha256).ref_count == 1
+
+
+def test_media_response_hands_file_to_nginx_when_accel_redirect_is_enabled(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("KAJOVO_API_MEDIA_ROOT", str(tmp_path / "media"))
+    monkeypatch.setenv("KAJOVO_API_MEDIA_ACCEL_REDIRECT_PREFIX", "/_media/")
+    get_settings.cache_clear()
+    try:
+        pipeline = ThumbnailPipeline(workers=1)
+        storage = MediaStorage(str(tmp_path / "media"), thumbnails=pipeline)
+        stored = storage.store_image(src_file=io.BytesIO(_png((40, 40, 40))))
+        storage.publish(stored)
+        pipeline.shutdown()
+
+        request = Request({"type": "http", "method": "GET", "headers": []})
+        response = media_file_response(
+            request,
+            original_relpath=stored.original_relpath,
+            thumb_relpath=stored.thumb_relpath,
+            kind="detail",
+            immutable=True,
+        )
+        assert response.body == b""
+        assert response.headers["x-accel-redirect"] == f"/_media/{stored.original_relpath.rsplit('.', 1)[0]}_detail.webp"
+        assert response.headers["content-type"] == "image/webp"
+        assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+
+        path = tmp_path / "media" / stored.original_relpath
+        nginx_etag = f'"{int(path.stat().st_mtime):x}-{path.stat().st_size:x}"'
+        request = Request({"type": "http", "method": "GET", "headers": [(b"if-none-match", nginx_etag.encode())]})
+        response = media_file_response(
+            request,
+            original_relpath=stored.original_relpath,
+            thumb_relpath=stored.thumb_relpath,
+            kind="original",
+        )
+        assert response.status_code == 304
+        assert "x-accel-redirect" not in response.headers
+    finally:
+        get_settings.cache_clear()
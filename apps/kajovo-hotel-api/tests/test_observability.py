@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+from app.observability import RequestContextMiddleware, _audit_body, _BodyTee
+
+
+def _receive_from(chunks: list[bytes]):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    return receive
+
+
+def test_body_tee_keeps_only_prefix_and_passes_all_chunks() -> None:
+    tee = _BodyTee(_receive_from([b"a" * 6, b"b" * 6, b"c" * 6]), limit=8)
+
+    async def _consume() -> bytes:
+        received = b""
+        more = True
+        while more:
+            message = await tee()
+            received += message["body"]
+            more = message["more_body"]
+        return received
+
+    assert asyncio.run(_consume()) == b"a" * 6 + b"b" * 6 + b"c" * 6
+    assert tee.body == b"a" * 6 + b"bb"
+    assert tee.truncated is True
+
+
+def test_audit_body_sanitizes_json_and_skips_truncated_documents() -> None:
+    detail = _audit_body(json.dumps({"email": "a@example.com", "password": "secret"}).encode(), truncated=False)
+    assert detail is not None
+    assert json.loads(detail) == {"email": "a@example.com", "password": "***"}
+    assert _audit_body(b'{"email": "a@example.com", "passw', truncated=True) is None
+    assert _audit_body(b"", truncated=False) is None
+
+
+def test_middleware_streams_multipart_without_capture_and_sets_request_id() -> None:
+    seen_receive = []
+    sent: list[dict] = []
+
+    async def app(scope, receive, send):
+        seen_receive.append(receive)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def send(message):
+        sent.append(message)
+
+    original_receive = _receive_from([b"--boundary\r\n"])
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/health-probe",
+        "raw_path": b"/health-probe",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=boundary"),
+            (b"x-request-id", b"req-multipart"),
+        ],
+    }
+    middleware = RequestContextMiddleware(app, max_body_capture_bytes=1024)
+    asyncio.run(middleware(scope, original_receive, send))
+
+    assert seen_receive == [original_receive]
+    assert (b"x-request-id", b"req-multipart") in sent[0]["headers"]
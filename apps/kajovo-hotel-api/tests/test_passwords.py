@@ -0,0 +1,121 @@
+import hashlib
+import secrets
+import sqlite3
+import threading
+import urllib.request
+from http.cookiejar import CookieJar
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes import auth as auth_routes
+from app.security.passwords import PasswordHasher, ScryptParams
+from tests.test_auth_role_selection import raw_request
+
+
+def _legacy_hash(password: str) -> str:
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=2**14, r=8, p=1)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+
+def test_hash_encodes_cost_and_legacy_hashes_still_verify() -> None:
+    hasher = PasswordHasher(params=ScryptParams(n=2**12, r=8, p=1), workers=1)
+    try:
+        stored = hasher.hash("correct horse")
+        assert stored.startswith("scrypt$4096$8$1$")
+        assert hasher.verify("correct horse", stored) is True
+        assert hasher.verify("wrong horse", stored) is False
+        assert hasher.needs_rehash(stored) is False
+
+        legacy = _legacy_hash("correct horse")
+        assert hasher.verify("correct horse", legacy) is True
+        assert hasher.needs_rehash(legacy) is True
+        assert hasher.verify("correct horse", "bcrypt$nope") is False
+        assert hasher.stats()["completed"] == 4
+    finally:
+        hasher.shutdown()
+
+
+def test_saturated_pool_refuses_new_password_work() -> None:
+    hasher = PasswordHasher(params=ScryptParams(n=2**12, r=8, p=1), workers=1, max_pending=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking() -> None:
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=hasher._run, args=(blocking,))
+    worker.start()
+    try:
+        assert started.wait(5)
+        with pytest.raises(HTTPException) as exc_info:
+            hasher.hash("one more")
+        assert exc_info.value.status_code == 503
+        assert hasher.stats()["rejected"] == 1
+        assert hasher.stats()["pending"] == 1
+    finally:
+        release.set()
+        worker.join()
+        hasher.shutdown()
+
+
+def test_portal_login_rehashes_legacy_password(api_base_url: str, api_request, api_db_path: Path) -> None:
+    email = "legacy.hash@example.com"
+    status, created = api_request(
+        "/api/v1/users",
+        method="POST",
+        payload={
+            "first_name": "Legacy",
+            "last_name": "Hash",
+            "email": email,
+            "password": "legacy-hash-pass",
+            "roles": ["recepce"],
+        },
+    )
+    assert status == 201
+    with sqlite3.connect(api_db_path) as connection:
+        connection.execute(
+            "UPDATE portal_users SET password_hash = ? WHERE email = ?",
+            (_legacy_hash("legacy-hash-pass"), email),
+        )
+
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+    status, _ = raw_request(
+        opener,
+        api_base_url,
+        "/api/auth/login",
+        method="POST",
+        payload={"email": email, "password": "legacy-hash-pass"},
+    )
+    assert status == 200
+
+    with sqlite3.connect(api_db_path) as connection:
+        (stored,) = connection.execute("SELECT password_hash FROM portal_users WHERE email = ?", (email,)).fetchone()
+    assert stored.startswith("scrypt$16384$8$1$")
+
+    status, _ = raw_request(
+        opener,
+        api_base_url,
+        "/api/auth/login",
+        method="POST",
+        payload={"email": email, "password": "legacy-hash-pass"},
+    )
+    assert status == 200
+
+    status, stats = api_request("/ready/passwords")
+    assert status == 200
+    assert isinstance(stats, dict)
+    assert {"workers", "pending", "max_pending", "completed", "rejected"} <= set(stats["passwords"])
+
+
+def test_rehash_on_login_is_skipped_when_pool_is_saturated(monkeypatch) -> None:
+    def saturated(_password: str) -> str:
+        raise HTTPException(status_code=503, detail="Too many concurrent password checks")
+
+    legacy = _legacy_hash("still valid")
+    monkeypatch.setattr(auth_routes, "hash_password", saturated)
+
+    assert auth_routes._rehash_on_login(legacy, "still valid", principal="busy@example.com") is None
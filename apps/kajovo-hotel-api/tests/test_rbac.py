@@ -1,10 +1,23 @@
 import json
-import sqlite3
 import urllib.error
 import urllib.request
 from http.cookiejar import CookieJar
 from pathlib import Path
 
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.security.auth import SESSION_STATE_KEY
+from app.security.rbac import (
+    ROLE_PERMISSIONS,
+    has_permission,
+    module_access_dependency,
+    parse_role,
+    resolve_identity,
+)
+from tests.test_support import wait_for_audit_row
+
 
 def api_request(
     opener: urllib.request.OpenerDirector,
@@ -153,18 +166,17 @@ def test_rbac_write_denied_is_audited_with_actor_identity(
     assert status == 403
     assert isinstance(data, dict)
 
-    db_path = api_db_path
-    with sqlite3.connect(db_path) as connection:
-        row = connection.execute(
-            """
-            SELECT actor, actor_id, actor_role, action, resource, status_code
-            FROM audit_trail
-            WHERE actor_id = ?
-            ORDER BY id DESC
-            LIMIT 1
-            """,
-            ("udrzba@example.com",),
-        ).fetchone()
+    row = wait_for_audit_row(
+        api_db_path,
+        """
+        SELECT actor, actor_id, actor_role, action, resource, status_code
+        FROM audit_trail
+        WHERE actor_id = ? AND resource = '/api/v1/reports' AND status_code = 403
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        ("udrzba@example.com",),
+    )
 
     assert row is not None
     assert row[0] == "udrzba@example.com"
@@ -173,3 +185,37 @@ def test_rbac_write_denied_is_audited_with_actor_identity(
     assert row[3] == "POST"
     assert row[4] == "/api/v1/reports"
     assert row[5] == 403
+
+
+def test_role_permission_masks_match_permission_sets() -> None:
+    permissions = set().union(*ROLE_PERMISSIONS.values())
+    for role, granted in ROLE_PERMISSIONS.items():
+        for permission in permissions:
+            assert has_permission(role, permission) is (permission in granted)
+    assert has_permission("sklad", "unknown:read") is False
+    assert has_permission("unknown", "inventory:read") is False
+    assert parse_role(" Housekeeping ") == "pokojská"
+    assert parse_role("pokojsk\u0103\u02c7") == "pokojská"
+
+
+def test_identity_is_resolved_once_per_request() -> None:
+    request = Request({"type": "http", "method": "POST", "headers": [], "state": {}})
+    setattr(
+        request.state,
+        SESSION_STATE_KEY,
+        {"email": "sklad@example.com", "role": "warehouse", "active_role": "warehouse", "actor_type": "portal"},
+    )
+
+    identity = resolve_identity(request)
+    assert (identity.actor_id, identity.role) == ("sklad@example.com", "sklad")
+    assert identity.can("inventory:write") and not identity.can("users:read")
+    assert request.state.actor_role == "sklad"
+
+    # Later checks read the stored identity instead of the session.
+    delattr(request.state, SESSION_STATE_KEY)
+    assert resolve_identity(request) is identity
+    module_access_dependency("inventory")(request)
+    with pytest.raises(HTTPException) as denied:
+        module_access_dependency("breakfast")(request)
+    assert denied.value.status_code == 403
+    assert denied.value.detail == "Missing permission: breakfast:write"
@@ -1,10 +1,17 @@
+import hashlib
+import http.client
+import io
 import json
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
 import uuid
 from collections.abc import Callable
 from http.cookiejar import CookieJar
 
+from PIL import Image
+
 ResponseData = dict[str, object] | list[dict[str, object]] | None
 ApiRequest = Callable[..., tuple[int, ResponseData]]
 
@@ -126,3 +133,142 @@ def test_report_photo_pipeline(api_request: ApiRequest, api_base_url: str) -> No
     )
     with opener.open(thumb_request, timeout=10) as response:
         assert response.status == 200
+
+
+def test_report_photo_renditions_are_rendered_in_background(
+    api_request: ApiRequest, api_base_url: str
+) -> None:
+    created = create_report(api_request, title="Rendition report")
+    opener = getattr(api_request, "opener", urllib.request.build_opener())
+    jar = getattr(api_request, "jar", CookieJar())
+
+    # A landscape JPEG whose EXIF orientation (6) says it must be shown rotated to portrait.
+    image = Image.new("RGB", (1600, 1200), (200, 40, 40))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+
+    upload_status, uploaded = upload_photos(
+        opener,
+        f"{api_base_url}/api/v1/reports/{created['id']}/photos",
+        jar,
+        [("photos", "portrait.jpg", buffer.getvalue())],
+    )
+    assert upload_status == 200
+    assert isinstance(uploaded, list)
+    photo = uploaded[0]
+    assert str(photo["thumb_path"]).endswith("_list.webp")
+
+    def fetch(kind: str) -> tuple[str, bytes]:
+        request = urllib.request.Request(
+            url=f"{api_base_url}/api/v1/reports/{created['id']}/photos/{photo['id']}/{kind}",
+            method="GET",
+        )
+        with opener.open(request, timeout=10) as response:
+            return response.headers.get_content_type(), response.read()
+
+    expected = {"thumb": (240, 320), "detail": (768, 1024), "full": (1200, 1600)}
+    deadline = time.monotonic() + 10
+    sizes: dict[str, tuple[int, int]] = {}
+    while time.monotonic() < deadline and len(sizes) < len(expected):
+        for kind in expected:
+            content_type, content = fetch(kind)
+            if content_type == "image/webp":
+                with Image.open(io.BytesIO(content)) as rendered:
+                    sizes[kind] = rendered.size
+        time.sleep(0.05)
+    assert sizes == expected
+
+    content_type, content = fetch("original")
+    assert content_type == "image/jpeg"
+    assert content == buffer.getvalue()
+
+    try:
+        fetch("poster")
+    except urllib.error.HTTPError as exc:
+        assert exc.code == 400
+    else:
+        raise AssertionError("unknown rendition kind must be rejected")
+
+
+def test_report_photo_caching_headers(api_request: ApiRequest, api_base_url: str) -> None:
+    created = create_report(api_request, title="Cached report")
+    opener = getattr(api_request, "opener", urllib.request.build_opener())
+    jar = getattr(api_request, "jar", CookieJar())
+    content = b"cached-photo-" + uuid.uuid4().hex.encode()
+    _, uploaded = upload_photos(
+        opener,
+        f"{api_base_url}/api/v1/reports/{created['id']}/photos",
+        jar,
+        [("photos", "cached.jpg", content)],
+    )
+    assert isinstance(uploaded, list)
+    url = f"{api_base_url}/api/v1/reports/{created['id']}/photos/{uploaded[0]['id']}/original"
+
+    with opener.open(urllib.request.Request(url=url, method="GET"), timeout=10) as response:
+        assert response.status == 200
+        assert response.read() == content
+        etag = response.headers["ETag"]
+        assert etag == '"' + hashlib.sha256(content).hexdigest() + '"'
+        assert response.headers["Cache-Control"] == "private, max-age=31536000, immutable"
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["Last-Modified"]
+
+    try:
+        opener.open(urllib.request.Request(url=url, headers={"If-None-Match": etag}, method="GET"), timeout=10)
+    except urllib.error.HTTPError as exc:
+        assert exc.code == 304
+        assert exc.headers["ETag"] == etag
+        assert exc.read() == b""
+    else:
+        raise AssertionError("matching If-None-Match must return 304")
+
+    ranged = urllib.request.Request(url=url, headers={"Range": "bytes=0-5", "If-Range": etag}, method="GET")
+    with opener.open(ranged, timeout=10) as response:
+        assert response.status == 206
+        assert response.headers["Content-Range"] == f"bytes 0-5/{len(content)}"
+        assert response.read() == content[:6]
+
+    # Corrupt photo bytes have no renditions; the fallback original must stay revalidated.
+    with opener.open(urllib.request.Request(url=url.replace("/original", "/thumb"), method="GET"), timeout=10) as response:
+        assert response.read() == content
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_report_photo_upload_enforces_size_limits(api_request: ApiRequest, api_base_url: str) -> None:
+    created = create_report(api_request, title="Oversized report")
+    opener = getattr(api_request, "opener", urllib.request.build_opener())
+    jar = getattr(api_request, "jar", CookieJar())
+    url = f"{api_base_url}/api/v1/reports/{created['id']}/photos"
+
+    # The test server allows 1 MiB per file and 4 MiB per request.
+    status, payload = upload_photos(
+        opener,
+        url,
+        jar,
+        [("photos", "small.jpg", b"small-" + uuid.uuid4().hex.encode()), ("photos", "big.jpg", b"x" * (1024 * 1024 + 1))],
+    )
+    assert status == 413
+    assert payload == {"detail": "File too large"}
+
+    # A declared oversized body is refused before any of it is read.
+    parsed = urllib.parse.urlsplit(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    try:
+        connection.putrequest("POST", parsed.path)
+        connection.putheader("Content-Type", "multipart/form-data; boundary=kajovo")
+        connection.putheader("Content-Length", str(4 * 1024 * 1024 + 1))
+        connection.putheader("Cookie", "; ".join(f"{cookie.name}={cookie.value}" for cookie in jar))
+        for name, value in csrf_header(jar).items():
+            connection.putheader(name, value)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 413
+        assert json.loads(response.read()) == {"detail": "Request body too large"}
+    finally:
+        connection.close()
+
+    list_status, listed = api_request(f"/api/v1/reports/{created['id']}/photos")
+    assert list_status == 200
+    assert listed == []
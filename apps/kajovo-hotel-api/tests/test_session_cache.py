@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from app.security.auth import SessionCache
+from app.time_utils import utc_now
+
+
+def _session(session_id: str, portal_user_id: int | None = 7) -> dict:
+    return {
+        "session_id": session_id,
+        "email": "user@example.com",
+        "role": "recepce",
+        "roles": ["recepce"],
+        "active_role": "recepce",
+        "actor_type": "portal",
+        "portal_user_id": portal_user_id,
+    }
+
+
+def test_session_cache_expires_entries_after_ttl() -> None:
+    cache = SessionCache(ttl_seconds=30)
+    now = utc_now()
+    cache.put(_session("s" * 20), expires_at=now + timedelta(hours=1), last_seen_at=now, now=now)
+
+    assert cache.get("s" * 20, now + timedelta(seconds=10)) is not None
+    assert cache.get("s" * 20, now + timedelta(seconds=31)) is None
+
+
+def test_session_cache_never_outlives_session_expiry() -> None:
+    cache = SessionCache(ttl_seconds=30)
+    now = utc_now()
+    cache.put(_session("s" * 20), expires_at=now + timedelta(seconds=5), last_seen_at=now, now=now)
+
+    assert cache.get("s" * 20, now + timedelta(seconds=6)) is None
+
+
+def test_session_cache_invalidation_blocks_recaching_stale_rows() -> None:
+    cache = SessionCache(ttl_seconds=30)
+    now = utc_now()
+    expires_at = now + timedelta(hours=1)
+    cache.put(_session("a" * 20), expires_at=expires_at, last_seen_at=now, now=now)
+    cache.put(_session("b" * 20, portal_user_id=8), expires_at=expires_at, last_seen_at=now, now=now)
+
+    cache.invalidate_portal_user(7)
+    assert cache.get("a" * 20, now) is None
+    assert cache.get("b" * 20, now) is not None
+
+    cache.put(_session("a" * 20), expires_at=expires_at, last_seen_at=now, now=now)
+    assert cache.get("a" * 20, now) is None
+
+
+def test_session_cache_disabled_with_zero_ttl() -> None:
+    cache = SessionCache(ttl_seconds=0)
+    now = utc_now()
+    cache.put(_session("s" * 20), expires_at=now + timedelta(hours=1), last_seen_at=now, now=now)
+
+    assert cache.get("s" * 20, now) is None
@@ -3,7 +3,7 @@ import ssl
 from types import SimpleNamespace
 
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import Session
 
 from app.api.routes.auth import HintRequest, admin_hint, hash_password
@@ -26,6 +26,7 @@ from app.services.mail import (
     StoredSmtpConfig,
     build_email_service,
 )
+from app.services.smtp_config import load_stored_smtp_config
 
 
 def test_hint_test_email_and_onboarding_use_single_email_service(monkeypatch, tmp_path):
@@ -179,6 +180,40 @@ def test_put_smtp_settings_preserves_existing_password_when_blank(tmp_path):
     assert stored is not None
 
 
+def test_stored_smtp_config_is_cached_and_refreshed_by_put(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'smtp-cache.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def upsert(host: str) -> None:
+        put_smtp_settings(
+            SmtpSettingsUpsert(
+                from_email="noreply@example.com",
+                host=host,
+                port=587,
+                username="mailer",
+                password="CachedSecret123",
+                use_tls=True,
+                use_ssl=False,
+            ),
+            db=db,
+        )
+
+    with Session(engine) as db:
+        upsert("smtp.first.local")
+        assert any(statement.startswith("PRAGMA") for statement in statements)
+        assert load_stored_smtp_config(db).host == "smtp.first.local"
+
+        statements.clear()
+        assert load_stored_smtp_config(db).host == "smtp.first.local"
+        assert statements == []
+
+        upsert("smtp.second.local")
+        assert load_stored_smtp_config(db).host == "smtp.second.local"
+        assert not any(statement.startswith("PRAGMA") for statement in statements)
+
+
 def test_compat_smtp_settings_read_tolerates_malformed_legacy_record():
     record = SimpleNamespace(
         host=None,
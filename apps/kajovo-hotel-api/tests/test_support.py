@@ -1,4 +1,7 @@
 import os
+import sqlite3
+import time
+from pathlib import Path
 
 
 def _in_ci() -> bool:
@@ -32,3 +35,19 @@ def admin_login_payload() -> dict[str, str]:
         "email": admin_email(),
         "password": admin_password(),
     }
+
+
+def wait_for_audit_row(
+    db_path: Path,
+    query: str,
+    params: tuple[object, ...] = (),
+    timeout_seconds: float = 5.0,
+) -> tuple[object, ...] | None:
+    """Poll the audit trail: rows are written by a background batch writer."""
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        with sqlite3.connect(db_path) as connection:
+            row = connection.execute(query, params).fetchone()
+        if row is not None or time.monotonic() >= deadline:
+            return row
+        time.sleep(0.1)
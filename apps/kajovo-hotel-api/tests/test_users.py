@@ -7,7 +7,12 @@ from http.cookiejar import CookieJar
 from pathlib import Path
 
 from app.security.passwords import hash_password
-from tests.test_support import admin_email, admin_login_payload, admin_password
+from tests.test_support import (
+    admin_email,
+    admin_login_payload,
+    admin_password,
+    wait_for_audit_row,
+)
 
 REQUEST_TIMEOUT_SECONDS = 30
 ADMIN_EMAIL = admin_email()
@@ -727,18 +732,17 @@ def test_password_not_logged_in_audit_detail(
     )
     assert status == 200
 
-    db_path = api_db_path
-    with sqlite3.connect(db_path) as connection:
-        row = connection.execute(
-            """
-            SELECT detail
-            FROM audit_trail
-            WHERE resource = ?
-            ORDER BY id DESC
-            LIMIT 1
-            """,
-            (f"/api/v1/users/{user_id}/unlock",),
-        ).fetchone()
+    row = wait_for_audit_row(
+        api_db_path,
+        """
+        SELECT detail
+        FROM audit_trail
+        WHERE resource = ?
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (f"/api/v1/users/{user_id}/unlock",),
+    )
 
     assert row is not None
     assert '"lockout_action": "unlock"' in row[0]
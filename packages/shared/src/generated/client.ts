@@ -46,6 +46,11 @@ export type AuthProfileUpdate = {
   "note"?: string | null;
   "phone"?: string | null;
 };
+export type Body_create_breakfast_import_job_api_v1_breakfast_import_jobs_post = {
+  "file": string;
+  "overrides"?: string | null;
+  "save"?: boolean;
+};
 export type Body_import_breakfast_pdf_api_v1_breakfast_import_post = {
   "file": string;
   "overrides"?: string | null;
@@ -63,6 +68,13 @@ export type Body_upload_lost_found_photos_api_v1_lost_found__item_id__photos_pos
 export type Body_upload_report_photos_api_v1_reports__report_id__photos_post = {
   "photos": Array<string>;
 };
+export type BreakfastBulkStatusItem = {
+  "id": number;
+  "status": BreakfastStatus;
+};
+export type BreakfastBulkStatusUpdate = {
+  "items": Array<BreakfastBulkStatusItem>;
+};
 export type BreakfastDailySummary = {
   "service_date": string;
   "status_counts": Record<string, unknown>;
@@ -77,6 +89,20 @@ export type BreakfastImportItem = {
   "guest_name"?: string | null;
   "room": number;
 };
+export type BreakfastImportJobRead = {
+  "created_at": string;
+  "date": string | null;
+  "error"?: string | null;
+  "filename": string | null;
+  "items"?: Array<BreakfastImportItem>;
+  "job_id": string;
+  "progress": number;
+  "save": boolean;
+  "saved"?: boolean;
+  "status": BreakfastImportJobStatus;
+  "updated_at": string;
+};
+export type BreakfastImportJobStatus = "queued" | "parsing" | "saving" | "completed" | "failed";
 export type BreakfastImportResponse = {
   "date": string;
   "items": Array<BreakfastImportItem>;
@@ -307,6 +333,21 @@ export type InventoryMovementRead = {
   "unit"?: string | null;
 };
 export type InventoryMovementType = "in" | "out" | "adjust";
+export type InventoryStockAtRead = {
+  "item_id": number;
+  "name": string;
+  "stock": number;
+  "stock_date": string;
+  "unit": string;
+};
+export type InventoryStockDriftRead = {
+  "current_stock": number;
+  "drift": number;
+  "item_id": number;
+  "ledger_stock": number;
+  "name": string;
+  "snapshot_date": string;
+};
 export type IssueCreate = {
   "assignee"?: string | null;
   "description"?: string | null;
@@ -637,12 +678,15 @@ export const apiClient = {
   async testSmtpEmailApiV1AdminSettingsSmtpTestEmailPost(body: SmtpTestEmailRequest): Promise<SmtpTestEmailResponse> {
     return request<SmtpTestEmailResponse>('POST', `/api/v1/admin/settings/smtp/test-email`, undefined, body);
   },
-  async listBreakfastOrdersApiV1BreakfastGet(query: { "service_date"?: string | null; "status"?: BreakfastStatus | null; }): Promise<Array<BreakfastOrderRead>> {
+  async listBreakfastOrdersApiV1BreakfastGet(query: { "service_date"?: string | null; "status"?: BreakfastStatus | null; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<BreakfastOrderRead>> {
     return request<Array<BreakfastOrderRead>>('GET', `/api/v1/breakfast`, query, undefined);
   },
   async createBreakfastOrderApiV1BreakfastPost(body: BreakfastOrderCreate): Promise<BreakfastOrderRead> {
     return request<BreakfastOrderRead>('POST', `/api/v1/breakfast`, undefined, body);
   },
+  async bulkUpdateBreakfastStatusApiV1BreakfastBulkPatch(body: BreakfastBulkStatusUpdate): Promise<Array<BreakfastOrderRead>> {
+    return request<Array<BreakfastOrderRead>>('PATCH', `/api/v1/breakfast/bulk`, undefined, body);
+  },
   async getDailySummaryApiV1BreakfastDailySummaryGet(query: { "service_date": string; }): Promise<BreakfastDailySummary> {
     return request<BreakfastDailySummary>('GET', `/api/v1/breakfast/daily-summary`, query, undefined);
   },
@@ -655,12 +699,21 @@ export const apiClient = {
   async importBreakfastPdfApiV1BreakfastImportPost(): Promise<BreakfastImportResponse> {
     return request<BreakfastImportResponse>('POST', `/api/v1/breakfast/import`, undefined, undefined);
   },
+  async createBreakfastImportJobApiV1BreakfastImportJobsPost(): Promise<void> {
+    return request<void>('POST', `/api/v1/breakfast/import/jobs`, undefined, undefined);
+  },
+  async getBreakfastImportJobApiV1BreakfastImportJobIdGet(job_id: string): Promise<BreakfastImportJobRead> {
+    return request<BreakfastImportJobRead>('GET', `/api/v1/breakfast/import/${job_id}`, undefined, undefined);
+  },
   async deleteBreakfastOrdersForPeriodApiV1BreakfastPeriodDeleteDelete(query: { "date_from": string; "date_to": string; }): Promise<void> {
     return request<void>('DELETE', `/api/v1/breakfast/period/delete`, query, undefined);
   },
   async reactivateAllBreakfastOrdersApiV1BreakfastReactivateAllPost(query: { "service_date": string; }): Promise<void> {
     return request<void>('POST', `/api/v1/breakfast/reactivate-all`, query, undefined);
   },
+  async streamBreakfastBoardApiV1BreakfastStreamGet(query: { "service_date": string; }): Promise<unknown> {
+    return request<unknown>('GET', `/api/v1/breakfast/stream`, query, undefined);
+  },
   async deleteBreakfastOrderApiV1BreakfastOrderIdDelete(order_id: number): Promise<void> {
     return request<void>('DELETE', `/api/v1/breakfast/${order_id}`, undefined, undefined);
   },
@@ -682,14 +735,14 @@ export const apiClient = {
   async verifyChallengeApiV1DeviceVerifyPost(body: DeviceVerifyRequest): Promise<DeviceVerifyResponse> {
     return request<DeviceVerifyResponse>('POST', `/api/v1/device/verify`, undefined, body);
   },
-  async listItemsApiV1InventoryGet(query: { "low_stock"?: boolean; }): Promise<Array<InventoryItemRead>> {
+  async listItemsApiV1InventoryGet(query: { "low_stock"?: boolean; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<InventoryItemRead>> {
     return request<Array<InventoryItemRead>>('GET', `/api/v1/inventory`, query, undefined);
   },
   async createItemApiV1InventoryPost(body: InventoryItemCreate): Promise<InventoryItemRead> {
     return request<InventoryItemRead>('POST', `/api/v1/inventory`, undefined, body);
   },
-  async listCardsApiV1InventoryCardsGet(): Promise<Array<InventoryCardRead>> {
-    return request<Array<InventoryCardRead>>('GET', `/api/v1/inventory/cards`, undefined, undefined);
+  async listCardsApiV1InventoryCardsGet(query: { "card_type"?: InventoryCardType | null; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<InventoryCardRead>> {
+    return request<Array<InventoryCardRead>>('GET', `/api/v1/inventory/cards`, query, undefined);
   },
   async createCardApiV1InventoryCardsPost(body: InventoryCardCreate): Promise<InventoryCardDetailRead> {
     return request<InventoryCardDetailRead>('POST', `/api/v1/inventory/cards`, undefined, body);
@@ -700,11 +753,17 @@ export const apiClient = {
   async getCardApiV1InventoryCardsCardIdGet(card_id: number): Promise<InventoryCardDetailRead> {
     return request<InventoryCardDetailRead>('GET', `/api/v1/inventory/cards/${card_id}`, undefined, undefined);
   },
-  async listItemsApiV1InventoryIngredientsGet(query: { "low_stock"?: boolean; }): Promise<Array<InventoryItemRead>> {
+  async listItemsApiV1InventoryIngredientsGet(query: { "low_stock"?: boolean; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<InventoryItemRead>> {
     return request<Array<InventoryItemRead>>('GET', `/api/v1/inventory/ingredients`, query, undefined);
   },
-  async listMovementsApiV1InventoryMovementsGet(): Promise<Array<InventoryMovementRead>> {
-    return request<Array<InventoryMovementRead>>('GET', `/api/v1/inventory/movements`, undefined, undefined);
+  async listMovementsApiV1InventoryMovementsGet(query: { "item_id"?: number | null; "movement_type"?: InventoryMovementType | null; "date_from"?: string | null; "date_to"?: string | null; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<InventoryMovementRead>> {
+    return request<Array<InventoryMovementRead>>('GET', `/api/v1/inventory/movements`, query, undefined);
+  },
+  async getStockAtApiV1InventoryStockAtGet(query: { "date": string; "item_id"?: number | null; }): Promise<Array<InventoryStockAtRead>> {
+    return request<Array<InventoryStockAtRead>>('GET', `/api/v1/inventory/stock-at`, query, undefined);
+  },
+  async getStockDriftApiV1InventoryStockDriftGet(): Promise<Array<InventoryStockDriftRead>> {
+    return request<Array<InventoryStockDriftRead>>('GET', `/api/v1/inventory/stock-drift`, undefined, undefined);
   },
   async exportStocktakePdfApiV1InventoryStocktakePdfGet(): Promise<unknown> {
     return request<unknown>('GET', `/api/v1/inventory/stocktake/pdf`, undefined, undefined);
@@ -730,7 +789,7 @@ export const apiClient = {
   async getItemPictogramApiV1InventoryItemIdPictogramKindGet(item_id: number, kind: string): Promise<unknown> {
     return request<unknown>('GET', `/api/v1/inventory/${item_id}/pictogram/${kind}`, undefined, undefined);
   },
-  async listIssuesApiV1IssuesGet(query: { "priority"?: IssuePriority | null; "status"?: IssueStatus | null; "location"?: string | null; "room_number"?: string | null; }): Promise<Array<IssueRead>> {
+  async listIssuesApiV1IssuesGet(query: { "priority"?: IssuePriority | null; "status"?: IssueStatus | null; "location"?: string | null; "room_number"?: string | null; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<IssueRead>> {
     return request<Array<IssueRead>>('GET', `/api/v1/issues`, query, undefined);
   },
   async createIssueApiV1IssuesPost(body: IssueCreate): Promise<IssueRead> {
@@ -754,7 +813,7 @@ export const apiClient = {
   async getIssuePhotoApiV1IssuesIssueIdPhotosPhotoIdKindGet(issue_id: number, photo_id: number, kind: string): Promise<unknown> {
     return request<unknown>('GET', `/api/v1/issues/${issue_id}/photos/${photo_id}/${kind}`, undefined, undefined);
   },
-  async listLostFoundItemsApiV1LostFoundGet(query: { "type"?: LostFoundItemType | null; "status"?: LostFoundStatus | null; "category"?: string | null; }): Promise<Array<LostFoundItemRead>> {
+  async listLostFoundItemsApiV1LostFoundGet(query: { "type"?: LostFoundItemType | null; "status"?: LostFoundStatus | null; "category"?: string | null; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<LostFoundItemRead>> {
     return request<Array<LostFoundItemRead>>('GET', `/api/v1/lost-found`, query, undefined);
   },
   async createLostFoundItemApiV1LostFoundPost(body: LostFoundItemCreate): Promise<LostFoundItemRead> {
@@ -778,7 +837,7 @@ export const apiClient = {
   async getLostFoundPhotoApiV1LostFoundItemIdPhotosPhotoIdKindGet(item_id: number, photo_id: number, kind: string): Promise<unknown> {
     return request<unknown>('GET', `/api/v1/lost-found/${item_id}/photos/${photo_id}/${kind}`, undefined, undefined);
   },
-  async listReportsApiV1ReportsGet(query: { "status"?: string | null; }): Promise<Array<ReportRead>> {
+  async listReportsApiV1ReportsGet(query: { "status"?: string | null; "limit"?: number | null; "cursor"?: string | null; }): Promise<Array<ReportRead>> {
     return request<Array<ReportRead>>('GET', `/api/v1/reports`, query, undefined);
   },
   async createReportApiV1ReportsPost(body: ReportCreate): Promise<ReportRead> {
@@ -832,4 +891,16 @@ export const apiClient = {
   async readyReadyGet(): Promise<Record<string, unknown>> {
     return request<Record<string, unknown>>('GET', `/ready`, undefined, undefined);
   },
+  async readyAuditReadyAuditGet(): Promise<Record<string, unknown>> {
+    return request<Record<string, unknown>>('GET', `/ready/audit`, undefined, undefined);
+  },
+  async readyPasswordsReadyPasswordsGet(): Promise<Record<string, unknown>> {
+    return request<Record<string, unknown>>('GET', `/ready/passwords`, undefined, undefined);
+  },
+  async readyPoolReadyPoolGet(): Promise<Record<string, unknown>> {
+    return request<Record<string, unknown>>('GET', `/ready/pool`, undefined, undefined);
+  },
+  async readyReaperReadyReaperGet(): Promise<Record<string, unknown>> {
+    return request<Record<string, unknown>>('GET', `/ready/reaper`, undefined, undefined);
+  },
 };